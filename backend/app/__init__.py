@@ -0,0 +1,4 @@
+import time
+
+# Taken before anything else is imported so per-worker cold start can be reported
+IMPORT_STARTED = time.perf_counter()
@@ -0,0 +1,95 @@
+"""One-time database setup: apply migrations, seed roles, backfill rollups.
+
+Run it once per deploy, before starting the API workers:
+
+    python -m app.bootstrap
+
+Workers no longer touch the schema on start-up. Set ``DB_AUTO_INIT=1`` to run
+this from the application lifespan instead (convenient for local SQLite).
+Every step is idempotent. Role seeding tolerates concurrent runs, but run the
+migrations from a single process.
+"""
+import logging
+import time
+from pathlib import Path
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401  (register every mapper)
+from app.core import rollups
+from app.database import engine
+from app.models.role import Role
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = Path(__file__).resolve().parents[1] / "alembic.ini"
+
+DEFAULT_ROLES = [
+    (1, "team_member", "Regular team member"),
+    (2, "team_lead", "Team lead with approval rights"),
+]
+
+
+def _alembic_config():
+    from alembic.config import Config
+
+    return Config(str(ALEMBIC_INI))
+
+
+def head_revision() -> str:
+    from alembic.script import ScriptDirectory
+
+    return ScriptDirectory.from_config(_alembic_config()).get_current_head()
+
+
+def migrate(revision: str = "head") -> None:
+    """Apply the Alembic migrations in backend/migrations up to `revision`."""
+    from alembic import command
+
+    config = _alembic_config()
+    # Keep the application's logging setup when called from the lifespan
+    config.attributes["configure_logger"] = False
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, revision)
+
+
+def seed_roles() -> None:
+    """Ensure default roles exist so registration with role_id 1/2 works.
+
+    id=1 → team_member
+    id=2 → team_lead
+    """
+    for role_id, role_name, description in DEFAULT_ROLES:
+        with Session(engine) as session:
+            if session.get(Role, role_id) is not None:
+                continue
+            session.add(Role(id=role_id, role_name=role_name, description=description))
+            try:
+                session.commit()
+            except IntegrityError:
+                # Another process seeded it between our check and insert
+                session.rollback()
+
+
+def init_rollups() -> None:
+    """Backfill the metrics rollups for databases created before they existed."""
+    with Session(engine) as session:
+        rollups.ensure_initialized(session)
+
+
+def run() -> dict[str, float]:
+    """Run every step; returns the seconds each one took."""
+    timings = {}
+    for name, step in (("migrations", migrate), ("roles", seed_roles), ("rollups", init_rollups)):
+        started = time.perf_counter()
+        step()
+        timings[name] = round(time.perf_counter() - started, 3)
+    logger.info("Database bootstrap finished: %s", timings)
+    return timings
+
+
+if __name__ == "__main__":
+    for step, seconds in run().items():
+        print(f"{step}: {seconds:.3f}s")
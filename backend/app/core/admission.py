@@ -0,0 +1,332 @@
+"""Admission control: token-bucket rate limits and load shedding.
+
+``AdmissionMiddleware`` decides before a request is routed, from its path:
+
+- Load shedding. Pressure is this worker's in-flight requests against
+  ``SHED_MAX_IN_FLIGHT``, or its recent pool checkout wait against
+  ``SHED_POOL_WAIT_SECONDS``, whichever is higher. Expensive routes (the
+  team-wide lists, export, search, bulk writes and metrics) are refused with
+  503 once pressure reaches ``SHED_EXPENSIVE_AT``; everything else only at
+  full pressure, so cheap reads keep working while the pool is congested.
+- Rate limits. Every caller has a token bucket (the user from the bearer
+  token, else the client address), expensive routes have a tighter bucket per
+  caller and route, and login/register are limited per client address. An
+  empty bucket answers 429 with ``Retry-After``.
+
+Buckets live in a counter backend: ``LocalBackend`` (per process) or
+``RedisBackend`` (``RATE_LIMIT_BACKEND=redis``), which keeps them in Redis so
+the limits hold across workers. Shedding always uses this worker's own load.
+Health, metrics and the ``/events`` stream are never limited.
+"""
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from app.config import settings
+from app.core.metrics import ADMISSION_REJECTED
+from app.core.responses import dumps
+from app.core.security import verify_token
+
+logger = logging.getLogger(__name__)
+
+EXPENSIVE_ROUTES = {
+    "/ideas/all",
+    "/ideas/export",
+    "/ideas/search",
+    "/ideas/bulk",
+    "/ideas/status",
+    "/ideas/metrics/summary",
+    "/ideas/metrics/cycle-time",
+    "/ideas/metrics/forecast",
+}
+AUTH_ROUTES = {"/auth/login", "/auth/register"}
+# Load balancer probes; the other /health routes need a team lead and are limited as usual
+HEALTH_PROBES = {"/health", "/health/live", "/health/ready"}
+EXEMPT_PREFIXES = ("/metrics", "/events")
+SHED_RETRY_AFTER_SECONDS = 1
+# Recent pool waits count for less the older they are
+POOL_WAIT_HALF_LIFE_SECONDS = 5.0
+POOL_WAIT_SMOOTHING = 0.2
+LOCAL_MAX_KEYS = 100_000
+
+EXEMPT, AUTH, CHEAP, EXPENSIVE = "exempt", "auth", "cheap", "expensive"
+
+
+class LocalBackend:
+    """Token buckets in this process, the least recently used dropped past `max_keys`."""
+
+    def __init__(self, max_keys: int = LOCAL_MAX_KEYS) -> None:
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        """Take a token from `key`; returns 0 or the seconds until one is available."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def stats(self) -> dict:
+        return {"keys": len(self._buckets)}
+
+
+# Refill and take in one step on the server's clock; idle buckets expire once full
+_TAKE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'at')
+local tokens = tonumber(state[1]) or burst
+local at = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - at) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'at', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisBackend:
+    """Token buckets shared by every worker (needs the optional ``redis`` package)."""
+
+    def __init__(self, url: str, prefix: str = "ideaflow:ratelimit:") -> None:
+        import redis.asyncio as redis
+
+        self._redis = redis.Redis.from_url(url)
+        self._take = self._redis.register_script(_TAKE_SCRIPT)
+        self._prefix = prefix
+        self.errors = 0
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        try:
+            return float(await self._take(keys=[self._prefix + key], args=[rate, burst]))
+        except Exception:
+            # Fail open: an unreachable Redis must not take the API down with it
+            self.errors += 1
+            if self.errors == 1 or self.errors % 1000 == 0:
+                logger.exception("Rate limit backend unavailable; admitting requests")
+            return 0.0
+
+    def stats(self) -> dict:
+        return {"errors": self.errors}
+
+
+class LoadMonitor:
+    """This worker's in-flight requests and smoothed pool checkout wait."""
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self._pool_wait = 0.0
+        self._observed_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def watch_pool(self, engine) -> None:
+        """Time connection checkouts of `engine`'s pool."""
+        pool = engine.pool
+        connect = pool.connect
+
+        def timed_connect():
+            started = time.perf_counter()
+            try:
+                return connect()
+            finally:
+                self.observe_pool_wait(time.perf_counter() - started)
+
+        pool.connect = timed_connect
+
+    def observe_pool_wait(self, seconds: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            current = self._decayed(now)
+            self._pool_wait = current + (seconds - current) * POOL_WAIT_SMOOTHING
+            self._observed_at = now
+
+    def _decayed(self, now: float) -> float:
+        # Without checkouts (e.g. while shedding) the wait fades instead of sticking
+        return self._pool_wait * 0.5 ** ((now - self._observed_at) / POOL_WAIT_HALF_LIFE_SECONDS)
+
+    @property
+    def pool_wait(self) -> float:
+        return self._decayed(time.monotonic())
+
+    def pressure(self) -> float:
+        """Highest of in-flight/max and pool wait/limit; 1.0 means at a limit."""
+        pressure = 0.0
+        if settings.shed_max_in_flight > 0:
+            pressure = self.in_flight / settings.shed_max_in_flight
+        if settings.shed_pool_wait_seconds > 0:
+            pressure = max(pressure, self.pool_wait / settings.shed_pool_wait_seconds)
+        return pressure
+
+
+def _make_backend():
+    if settings.rate_limit_backend == "redis":
+        return RedisBackend(settings.rate_limit_redis_url)
+    return LocalBackend()
+
+
+class AdmissionController:
+    def __init__(self, backend, monitor: LoadMonitor) -> None:
+        self.backend = backend
+        self.monitor = monitor
+        self._classes: dict[str, str] = {}
+        self._rejected = {"rate_limited": 0, "shed": 0}
+
+    def classify(self, route: str) -> str:
+        kind = self._classes.get(route)
+        if kind is None:
+            if route in HEALTH_PROBES or route.startswith(EXEMPT_PREFIXES):
+                kind = EXEMPT
+            elif route in AUTH_ROUTES:
+                kind = AUTH
+            elif route in EXPENSIVE_ROUTES:
+                kind = EXPENSIVE
+            else:
+                kind = CHEAP
+            self._classes[route] = kind
+        return kind
+
+    async def admit(self, scope, route: str, kind: str) -> tuple[int, int] | None:
+        """None to admit, else the (status, Retry-After seconds) to answer with."""
+        threshold = settings.shed_expensive_at if kind == EXPENSIVE else 1.0
+        if self.monitor.pressure() >= threshold:
+            return self._rejected_with("shed", route, 503, SHED_RETRY_AFTER_SECONDS)
+        wait = await self._take_tokens(scope, route, kind)
+        if wait > 0:
+            return self._rejected_with("rate_limited", route, 429, math.ceil(wait))
+        return None
+
+    async def _take_tokens(self, scope, route: str, kind: str) -> float:
+        if kind == AUTH:
+            return await self.backend.take(
+                f"auth:{_client(scope)}",
+                settings.rate_limit_login_per_minute / 60,
+                settings.rate_limit_login_burst,
+            )
+        caller = _caller(scope)
+        if kind == EXPENSIVE:
+            wait = await self.backend.take(
+                f"route:{route}:{caller}",
+                settings.rate_limit_expensive_per_minute / 60,
+                settings.rate_limit_expensive_burst,
+            )
+            if wait > 0:
+                return wait
+        return await self.backend.take(
+            f"caller:{caller}", settings.rate_limit_per_second, settings.rate_limit_burst
+        )
+
+    def _rejected_with(self, reason: str, route: str, status_code: int, retry_after: int):
+        self._rejected[reason] += 1
+        ADMISSION_REJECTED.labels(reason, route).inc()
+        return status_code, retry_after
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            **self.backend.stats(),
+            "in_flight": self.monitor.in_flight,
+            "pool_wait_seconds": round(self.monitor.pool_wait, 4),
+            "pressure": round(self.monitor.pressure(), 3),
+            "rejected": dict(self._rejected),
+        }
+
+
+class AdmissionMiddleware:
+    """Pure ASGI middleware so streaming responses are not buffered."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        route = _route(scope)
+        kind = admission.classify(route)
+        if kind == EXEMPT:
+            await self.app(scope, receive, send)
+            return
+        refused = await admission.admit(scope, route, kind)
+        if refused is not None:
+            await _refuse(send, *refused)
+            return
+
+        monitor = admission.monitor
+        monitor.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            monitor.in_flight -= 1
+
+
+def _route(scope) -> str:
+    # Every route singled out above has a fixed path, so no routing is needed here;
+    # the rest share one label to keep ids out of metric labels and bucket keys
+    path = scope["path"]
+    if (
+        path in EXPENSIVE_ROUTES
+        or path in AUTH_ROUTES
+        or path in HEALTH_PROBES
+        or path.startswith(EXEMPT_PREFIXES)
+    ):
+        return path
+    return "other"
+
+
+async def _refuse(send, status_code: int, retry_after: int) -> None:
+    detail = "Too many requests" if status_code == 429 else "Server is busy, try again shortly"
+    body = dumps({"detail": detail})
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(retry_after).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+def _client(scope) -> str:
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def _caller(scope) -> str:
+    # The signed user id when the token is valid; the route itself still authenticates
+    token = None
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, credentials = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer":
+                token = credentials.strip()
+            break
+    payload = verify_token(token) if token else None
+    if payload and payload.get("user_id") is not None:
+        return f"user:{payload['user_id']}"
+    return f"ip:{_client(scope)}"
+
+
+admission = AdmissionController(_make_backend(), LoadMonitor())
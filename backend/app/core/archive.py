@@ -0,0 +1,301 @@
+"""Archival of finalized ideas out of the hot tables.
+
+Approved and Rejected ideas are read-only, but while they stay in ``ideas``,
+``comments`` and ``idea_status_history`` every list, search rebuild and scan
+over those tables pays for them. ``archive_finalized`` moves the ones whose
+last status change is older than ``ARCHIVE_AFTER_DAYS`` to the archive
+tables, ``ARCHIVE_BATCH_SIZE`` ideas per transaction:
+
+- ``archived_ideas`` keeps the idea's columns under the same id, with its
+  comments as one zlib-compressed JSON array (they are only read whole);
+- ``archived_idea_status_history`` keeps the history rows, which the rollup
+  verification replays in SQL.
+
+Ideas with attachments stay where they are, since downloads and blob
+references go through the ``attachments`` table. The metrics rollups are left
+untouched: an archived idea still counts, and ``app.core.rollups`` verifies
+against the hot and archive tables together. ``GET /ideas/{id}`` still
+serves an archived idea's fields and ``GET /ideas/{id}/comments`` its
+comments, the export includes it with its history, and the similarity index
+keeps it so new submissions are still flagged as its duplicates; the list,
+search and write routes no longer see it.
+
+    python -m app.core.archive                       # archive everything due now
+    python -m app.core.archive --older-than-days 90
+    python -m app.core.archive --enqueue             # hand it to the job workers
+"""
+import json
+import logging
+import time
+import zlib
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.http_cache import IDEAS_SCOPE, comments_scope, owner_scope, touch
+from app.core.jobs import enqueue
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.search import search_service
+from app.database import SessionLocal
+from app.models.attachment import Attachment
+from app.models.comment import Comment
+from app.models.idea import Idea
+from app.models.idea_archive import ArchivedIdea, ArchivedStatusHistory
+from app.models.idea_status_history import IdeaStatusHistory
+
+logger = logging.getLogger(__name__)
+
+FINAL_STATUSES = ("Approved", "Rejected")
+JOB_KIND = "ideas.archive"
+HISTORY_COLUMNS = ("id", "idea_id", "old_status", "new_status", "changed_by", "changed_at")
+
+
+def _iso(value) -> str | None:
+    return value.isoformat() if value else None
+
+
+def pack_comments(comments: list[dict]) -> bytes:
+    return zlib.compress(json.dumps(comments, separators=(",", ":"), ensure_ascii=False).encode())
+
+
+def unpack_comments(data: bytes) -> list[dict]:
+    return json.loads(zlib.decompress(data))
+
+
+def _decided_at():
+    # Ideas made final without a history row (imports) count from their creation
+    return func.coalesce(func.max(IdeaStatusHistory.changed_at), Idea.created_at)
+
+
+def due_ideas(db: Session, cutoff: datetime, after_id: int, limit: int) -> list[int]:
+    """Ids above `after_id` of final ideas without attachments, decided before `cutoff`."""
+    return [
+        idea_id
+        for (idea_id,) in db.query(Idea.id)
+        .outerjoin(IdeaStatusHistory, IdeaStatusHistory.idea_id == Idea.id)
+        .filter(
+            Idea.status.in_(FINAL_STATUSES),
+            Idea.id > after_id,
+            ~Idea.attachments.any(),
+        )
+        .group_by(Idea.id, Idea.created_at)
+        .having(_decided_at() < cutoff)
+        .order_by(Idea.id)
+        .limit(limit)
+    ]
+
+
+def archive_ideas(db: Session, idea_ids: list[int]) -> list[int]:
+    """Move the given ideas to the archive in the caller's transaction; returns those moved.
+
+    The rows are locked first, so a comment or status change racing the move
+    either lands before it (and is archived too) or finds the idea gone.
+    Ideas that are no longer final or have gained an attachment are skipped.
+    """
+    rows = (
+        db.query(
+            Idea.id,
+            Idea.title,
+            Idea.description,
+            Idea.status,
+            Idea.user_id,
+            Idea.created_at,
+            Idea.comment_count,
+            Idea.last_comment_id,
+            Idea.last_comment_at,
+            Idea.last_comment_by,
+            Idea.last_comment_preview,
+        )
+        .filter(
+            Idea.id.in_(idea_ids),
+            Idea.status.in_(FINAL_STATUSES),
+            ~Idea.attachments.any(),
+        )
+        .order_by(Idea.id)
+        .with_for_update()
+        .all()
+    )
+    if not rows:
+        return []
+    ids = [r.id for r in rows]
+
+    decided = dict(
+        db.query(IdeaStatusHistory.idea_id, func.max(IdeaStatusHistory.changed_at))
+        .filter(IdeaStatusHistory.idea_id.in_(ids))
+        .group_by(IdeaStatusHistory.idea_id)
+    )
+    comments: dict[int, list[dict]] = {}
+    for c in (
+        db.query(Comment.id, Comment.idea_id, Comment.comment_text, Comment.commented_by, Comment.created_at)
+        .filter(Comment.idea_id.in_(ids))
+        .order_by(Comment.idea_id, Comment.created_at, Comment.id)
+    ):
+        comments.setdefault(c.idea_id, []).append(
+            {
+                "id": c.id,
+                "comment_text": c.comment_text,
+                "commented_by": c.commented_by,
+                "created_at": _iso(c.created_at),
+            }
+        )
+
+    now = datetime.utcnow()
+    db.execute(
+        insert(ArchivedIdea),
+        [
+            {
+                **r._asdict(),
+                "decided_at": decided.get(r.id) or r.created_at or now,
+                "archived_at": now,
+                "comments": pack_comments(comments.get(r.id, [])),
+            }
+            for r in rows
+        ],
+    )
+    history = IdeaStatusHistory.__table__
+    db.execute(
+        insert(ArchivedStatusHistory).from_select(
+            HISTORY_COLUMNS,
+            select(*(history.c[name] for name in HISTORY_COLUMNS)).where(history.c.idea_id.in_(ids)),
+        )
+    )
+    # Children first; bulk deletes skip the ORM cascades
+    for stmt in (
+        delete(Comment).where(Comment.idea_id.in_(ids)),
+        delete(IdeaStatusHistory).where(IdeaStatusHistory.idea_id.in_(ids)),
+        delete(Idea).where(Idea.id.in_(ids)),
+    ):
+        db.execute(stmt.execution_options(synchronize_session=False))
+
+    # The rollups keep counting archived ideas, so only the cached lists change
+    owners = {r.user_id for r in rows}
+    touch(db, IDEAS_SCOPE, *map(owner_scope, owners), *map(comments_scope, ids))
+    return ids
+
+
+def archive_finalized(
+    older_than_days: int | None = None,
+    batch_size: int | None = None,
+    time_limit: float | None = None,
+) -> tuple[int, bool]:
+    """Archive every final idea decided more than `older_than_days` ago.
+
+    Returns (ideas archived, whether more may be due); the second is true only
+    when `time_limit` seconds ran out first.
+    """
+    days = settings.archive_after_days if older_than_days is None else older_than_days
+    size = batch_size or settings.archive_batch_size
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    started = time.monotonic()
+    archived = 0
+    after_id = 0
+    while True:
+        with SessionLocal() as db:
+            batch = due_ideas(db, cutoff, after_id, size)
+            moved = archive_ideas(db, batch) if batch else []
+            db.commit()
+        # This process's search index; other workers drop them on their next rebuild.
+        # The similarity index keeps archived ideas (SimilarityService.load)
+        for idea_id in moved:
+            search_service.remove_idea(idea_id)
+        archived += len(moved)
+        if len(batch) < size:
+            return archived, False
+        after_id = batch[-1]
+        if time_limit is not None and time.monotonic() - started >= time_limit:
+            return archived, True
+
+
+def archive_job(payload: dict) -> None:
+    # Stay well inside the job lease; the rest runs as a follow-up job
+    archived, more = archive_finalized(
+        payload.get("older_than_days"), time_limit=settings.jobs_lease_seconds / 2
+    )
+    if archived:
+        logger.info("Archived %d finalized idea(s)", archived)
+    if more:
+        with SessionLocal() as db:
+            enqueue(db, JOB_KIND, payload)
+            db.commit()
+
+
+def load_archived(db: Session, idea_id: int) -> dict | None:
+    """An archived idea with the same fields ``GET /ideas/{id}`` returns for a hot one."""
+    idea = db.query(ArchivedIdea).filter(ArchivedIdea.id == idea_id).first()
+    if idea is None:
+        return None
+    return {
+        "id": idea.id,
+        "title": idea.title,
+        "description": idea.description,
+        "status": idea.status,
+        "user_id": idea.user_id,
+        "created_at": idea.created_at,
+        "comment_count": idea.comment_count,
+        "last_comment_id": idea.last_comment_id,
+        "last_comment_at": idea.last_comment_at,
+        "last_comment_by": idea.last_comment_by,
+        "last_comment_preview": idea.last_comment_preview,
+    }
+
+
+def archived_comment_page(
+    db: Session, idea_id: int, cursor: str | None, limit: int, current_user
+) -> dict | None:
+    """A page of an archived idea's comments, oldest first, or None if it is not archived.
+
+    Same rules and cursor as the comments router: the owner or a team lead.
+    """
+    idea = db.query(ArchivedIdea.user_id, ArchivedIdea.comments).filter(ArchivedIdea.id == idea_id).first()
+    if idea is None:
+        return None
+    if idea.user_id != current_user.id and current_user.role_name != "team_lead":
+        raise HTTPException(status_code=403, detail="Not allowed")
+
+    def key(created_at, row_id):
+        # (created_at, id) ascending with missing times first, as keyset_after pages
+        return (created_at is not None, created_at or datetime.min, row_id)
+
+    comments = [
+        {
+            **c,
+            "idea_id": idea_id,
+            "created_at": datetime.fromisoformat(c["created_at"]) if c["created_at"] else None,
+        }
+        for c in unpack_comments(idea.comments)
+    ]
+    comments.sort(key=lambda c: key(c["created_at"], c["id"]))
+    if cursor:
+        after = key(*decode_cursor(cursor))
+        comments = [c for c in comments if key(c["created_at"], c["id"]) > after]
+    page = comments[:limit]
+    next_cursor = (
+        encode_cursor(page[-1]["created_at"], page[-1]["id"]) if len(comments) > limit else None
+    )
+    return {"items": page, "next_cursor": next_cursor}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    import app.models  # noqa: F401  (register every mapper)
+
+    parser = argparse.ArgumentParser(description="Move finalized ideas to the archive tables.")
+    parser.add_argument("--older-than-days", type=int, default=None, help="default ARCHIVE_AFTER_DAYS")
+    parser.add_argument("--batch-size", type=int, default=None, help="default ARCHIVE_BATCH_SIZE")
+    parser.add_argument("--enqueue", action="store_true", help="queue a job instead of running here")
+    args = parser.parse_args()
+
+    if args.enqueue:
+        payload = {} if args.older_than_days is None else {"older_than_days": args.older_than_days}
+        with SessionLocal() as session:
+            # One run a day however many hosts schedule it
+            enqueue(session, JOB_KIND, payload, dedupe_key=f"{JOB_KIND}:{datetime.utcnow().date()}")
+            session.commit()
+        print("archival job queued")
+    else:
+        count, _ = archive_finalized(args.older_than_days, args.batch_size)
+        print(f"archived {count} idea(s)")
@@ -0,0 +1,336 @@
+"""Idea attachments: streamed uploads into content-addressed blob storage.
+
+An upload body is hashed with SHA-256 while it streams to a temporary file,
+so memory stays at about one write buffer whatever the file size. The finished
+file is then renamed to a path derived from its digest. Uploading the same
+bytes again, to any idea, reuses the stored blob. Attachment rows reference
+blobs by digest, and a blob that no row references is an orphan.
+
+Deleting an attachment or its idea queues a background job (app.core.jobs),
+in the same transaction, that removes the blobs nothing references any more.
+``python -m app.core.attachments`` sweeps the whole store for orphans missed
+that way (a failed insert after the blob was stored) and for temporary files
+of abandoned uploads.
+
+``LocalBlobStore`` keeps blobs under ``ATTACHMENTS_DIR``; a different backend
+needs the same methods, and downloads are served from ``path()``.
+"""
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable
+
+from fastapi import HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.http_cache import attachments_scope, touch
+from app.core.jobs import enqueue
+from app.database import SessionLocal
+from app.models.attachment import Attachment
+from app.models.idea import Idea
+
+logger = logging.getLogger(__name__)
+
+FINAL_STATUSES = {"Approved", "Rejected"}
+DEFAULT_CONTENT_TYPE = "application/octet-stream"
+CONTENT_TYPE_MAX_LENGTH = Attachment.__table__.c.content_type.type.length
+WRITE_BUFFER_BYTES = 1 << 20
+# A blob stored or re-uploaded this recently may belong to a row not yet committed
+ORPHAN_GRACE_SECONDS = 60
+STALE_UPLOAD_SECONDS = 3600
+SWEEP_BATCH = 500
+_CONTROL_CHARS = re.compile(r"[\x00-\x1f\x7f]")
+
+ATTACHMENT_COLUMNS = (
+    Attachment.id,
+    Attachment.idea_id,
+    Attachment.file_name,
+    Attachment.content_type,
+    Attachment.size,
+    Attachment.sha256,
+    Attachment.uploaded_by,
+    Attachment.uploaded_at,
+)
+
+
+class BlobTooLarge(Exception):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class StoredBlob:
+    digest: str
+    size: int
+    key: str
+    # False when the same bytes were already stored
+    created: bool
+
+
+class LocalBlobStore:
+    """Blobs at ``<root>/<d[:2]>/<d[2:4]>/<digest>``; uploads staged in ``<root>/tmp``."""
+
+    def __init__(self, root: str) -> None:
+        self.root = Path(root)
+        self.staging = self.root / "tmp"
+
+    @staticmethod
+    def key(digest: str) -> str:
+        return f"{digest[:2]}/{digest[2:4]}/{digest}"
+
+    def path(self, digest: str) -> Path:
+        return self.root / self.key(digest)
+
+    async def write(self, chunks: AsyncIterator[bytes], max_bytes: int) -> StoredBlob:
+        """Stream `chunks` into the store; raises BlobTooLarge past `max_bytes`."""
+        self.staging.mkdir(parents=True, exist_ok=True)
+        fd, staged = tempfile.mkstemp(dir=self.staging, prefix="upload-")
+        hasher = hashlib.sha256()
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as file:
+                pending: list[bytes] = []
+                pending_bytes = 0
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise BlobTooLarge(max_bytes)
+                    pending.append(chunk)
+                    pending_bytes += len(chunk)
+                    # Hash and write off the event loop, a buffer at a time
+                    if pending_bytes >= WRITE_BUFFER_BYTES:
+                        await run_in_threadpool(_write, file, hasher, pending)
+                        pending, pending_bytes = [], 0
+                await run_in_threadpool(_write, file, hasher, pending, True)
+            return await run_in_threadpool(self._store, staged, hasher.hexdigest(), size)
+        except BaseException:
+            # Too large, client gone or disk error: drop the partial upload
+            Path(staged).unlink(missing_ok=True)
+            raise
+
+    def _store(self, staged: str, digest: str, size: int) -> StoredBlob:
+        target = self.path(digest)
+        if target.exists():
+            os.unlink(staged)
+            # Restart the orphan grace period for the blob we are about to reference
+            os.utime(target)
+            return StoredBlob(digest, size, self.key(digest), created=False)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(staged, target)
+        return StoredBlob(digest, size, self.key(digest), created=True)
+
+    def remove(self, digest: str, unless_newer_than: float) -> bool:
+        path = self.path(digest)
+        try:
+            if path.stat().st_mtime > unless_newer_than:
+                return False
+            path.unlink()
+        except FileNotFoundError:
+            return False
+        return True
+
+    def digests(self):
+        for path in self.root.glob("??/??/*"):
+            if len(path.name) == 64:
+                yield path.name
+
+    def remove_stale_uploads(self, older_than: float) -> int:
+        removed = 0
+        for path in self.staging.glob("upload-*"):
+            try:
+                if path.stat().st_mtime < older_than:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+
+def _write(file, hasher, chunks: list[bytes], final: bool = False) -> None:
+    for chunk in chunks:
+        hasher.update(chunk)
+    file.writelines(chunks)
+    if final:
+        file.flush()
+        os.fsync(file.fileno())
+
+
+attachment_store = LocalBlobStore(settings.attachments_dir)
+
+
+def clean_filename(name: str) -> str:
+    # Keep only the last path component, without control characters
+    name = _CONTROL_CHARS.sub("", name.replace("\\", "/").rsplit("/", 1)[-1]).strip()
+    if not name or name in {".", ".."}:
+        raise HTTPException(status_code=400, detail="Invalid file name")
+    return name[:255]
+
+
+def serialize_attachment(row) -> dict:
+    return {
+        "id": row.id,
+        "idea_id": row.idea_id,
+        "file_name": row.file_name,
+        "content_type": row.content_type,
+        "size": row.size,
+        "sha256": row.sha256,
+        "uploaded_by": row.uploaded_by,
+        "uploaded_at": row.uploaded_at,
+    }
+
+
+def idea_for_read(db: Session, idea_id: int, current_user) -> Idea:
+    idea = db.query(Idea).filter(Idea.id == idea_id).first()
+    if not idea:
+        raise HTTPException(status_code=404, detail="Idea not found")
+    # Same rule as comments: the owner or a team lead
+    if idea.user_id != current_user.id and current_user.role_name != "team_lead":
+        raise HTTPException(status_code=403, detail="Not allowed")
+    return idea
+
+
+def idea_for_write(db: Session, idea_id: int, current_user, lock: bool = False) -> Idea:
+    query = db.query(Idea).filter(Idea.id == idea_id)
+    idea = (query.with_for_update() if lock else query).first()
+    if not idea:
+        raise HTTPException(status_code=404, detail="Idea not found")
+    if idea.user_id != current_user.id and current_user.role_name != "team_lead":
+        raise HTTPException(status_code=403, detail="Not allowed")
+    if idea.status in FINAL_STATUSES:
+        raise HTTPException(status_code=400, detail="Cannot change attachments after final decision")
+    return idea
+
+
+def _used_bytes(db: Session, idea_id: int) -> int:
+    return db.query(func.coalesce(func.sum(Attachment.size), 0)).filter(
+        Attachment.idea_id == idea_id
+    ).scalar()
+
+
+def _too_large(limit: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"Attachment exceeds the {limit} bytes left for this idea",
+    )
+
+
+def _upload_allowance(db: Session, idea_id: int, current_user) -> int:
+    idea_for_write(db, idea_id, current_user)
+    remaining = settings.attachment_idea_quota_bytes - _used_bytes(db, idea_id)
+    # Don't hold a pooled connection while the body streams in
+    db.rollback()
+    return max(0, min(settings.attachment_max_bytes, remaining))
+
+
+def _record_upload(
+    db: Session, idea_id: int, file_name: str, content_type: str, blob: StoredBlob, current_user
+) -> dict:
+    # Lock the idea so concurrent uploads cannot overrun the quota together
+    idea_for_write(db, idea_id, current_user, lock=True)
+    remaining = settings.attachment_idea_quota_bytes - _used_bytes(db, idea_id)
+    if blob.size > remaining:
+        db.rollback()
+        raise _too_large(max(0, remaining))
+    attachment = Attachment(
+        idea_id=idea_id,
+        file_name=file_name,
+        file_path=blob.key,
+        sha256=blob.digest,
+        size=blob.size,
+        content_type=content_type,
+        uploaded_by=current_user.id,
+    )
+    db.add(attachment)
+    touch(db, attachments_scope(idea_id))
+    db.commit()
+    db.refresh(attachment)
+    return {**serialize_attachment(attachment), "deduplicated": not blob.created}
+
+
+async def upload_attachment(
+    request: Request,
+    idea_id: int,
+    filename: str,
+    current_user,
+    run: Callable[[Callable[[Session], dict | int]], Awaitable],
+) -> dict:
+    """Stream the request body into the store; ``run`` executes against a sync session."""
+    file_name = clean_filename(filename)
+    content_type = (request.headers.get("content-type") or DEFAULT_CONTENT_TYPE).strip()
+    limit = await run(lambda s: _upload_allowance(s, idea_id, current_user))
+
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > limit:
+        raise _too_large(limit)
+    try:
+        blob = await attachment_store.write(request.stream(), limit)
+    except BlobTooLarge:
+        raise _too_large(limit)
+    # If the insert fails, a newly stored blob is left for the sweep
+    return await run(
+        lambda s: _record_upload(
+            s, idea_id, file_name, content_type[:CONTENT_TYPE_MAX_LENGTH], blob, current_user
+        )
+    )
+
+
+def remove_orphans(digests) -> int:
+    """Delete the blobs among `digests` that no attachment references."""
+    digests = set(digests)
+    if not digests:
+        return 0
+    with SessionLocal() as db:
+        live = {
+            digest
+            for (digest,) in db.query(Attachment.sha256)
+            .filter(Attachment.sha256.in_(digests))
+            .distinct()
+        }
+    cutoff = time.time() - ORPHAN_GRACE_SECONDS
+    return sum(attachment_store.remove(digest, cutoff) for digest in digests - live)
+
+
+def remove_orphans_job(payload: dict) -> None:
+    removed = remove_orphans(payload["digests"])
+    if removed:
+        logger.info("Removed %d orphaned attachment blob(s)", removed)
+
+
+def enqueue_orphan_cleanup(db: Session, digests) -> None:
+    """Queue removal of blobs that may be unreferenced once the caller commits."""
+    if digests:
+        # Due after the grace period, so the blobs' mtime check no longer skips them
+        enqueue(
+            db,
+            "attachments.remove_orphans",
+            {"digests": sorted(digests)},
+            delay_seconds=ORPHAN_GRACE_SECONDS,
+        )
+
+
+def sweep() -> dict[str, int]:
+    """Remove every orphaned blob and abandoned upload in the store."""
+    removed = 0
+    batch: list[str] = []
+    for digest in attachment_store.digests():
+        batch.append(digest)
+        if len(batch) >= SWEEP_BATCH:
+            removed += remove_orphans(batch)
+            batch = []
+    removed += remove_orphans(batch)
+    stale = attachment_store.remove_stale_uploads(time.time() - STALE_UPLOAD_SECONDS)
+    return {"orphaned_blobs": removed, "stale_uploads": stale}
+
+
+if __name__ == "__main__":
+    import app.models  # noqa: F401  (register every mapper)
+
+    for name, count in sweep().items():
+        print(f"{name}: {count}")
@@ -0,0 +1,86 @@
+"""Shared plumbing for in-memory indexes rebuilt from the database off the request path."""
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundIndexService:
+    """Owns a live index and swaps in a freshly built one from a background thread.
+
+    Subclasses implement ``new_index`` and ``load``. Mutations go through
+    ``apply`` as ``(method_name, *args)`` tuples; ones that arrive while a
+    rebuild is running are replayed onto the new index before it goes live,
+    so they must be idempotent.
+    """
+
+    name = "index"
+
+    def __init__(self, rebuild_seconds: float = 0.0) -> None:
+        self.index = self.new_index()
+        self.ready = False
+        self.built_at = 0.0
+        self.rebuild_seconds = rebuild_seconds
+        self._building = False
+        self._lock = threading.Lock()
+        self._pending: list[tuple] | None = None
+
+    def new_index(self):
+        raise NotImplementedError
+
+    def load(self, index, db) -> None:
+        raise NotImplementedError
+
+    def apply(self, op: tuple) -> None:
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(op)
+            getattr(self.index, op[0])(*op[1:])
+
+    def build(self, session_factory) -> None:
+        with self._lock:
+            if self._building:
+                return
+            self._building = True
+            self._pending = []
+        started = time.perf_counter()
+        try:
+            fresh = self.new_index()
+            with session_factory() as db:
+                self.load(fresh, db)
+            with self._lock:
+                for op in self._pending:
+                    getattr(fresh, op[0])(*op[1:])
+                self.index = fresh
+                self.ready = True
+                self.built_at = time.monotonic()
+            logger.info(
+                "%s built: %d ideas in %.2fs", self.name, len(fresh), time.perf_counter() - started
+            )
+        except Exception:
+            logger.exception("%s build failed", self.name)
+        finally:
+            with self._lock:
+                self._pending = None
+                self._building = False
+
+    def start_background_build(self, session_factory) -> threading.Thread:
+        thread = threading.Thread(
+            target=self.build, args=(session_factory,), name=self.name, daemon=True
+        )
+        thread.start()
+        return thread
+
+    def maybe_refresh(self, session_factory) -> None:
+        """Kick off a periodic rebuild so writes from other workers are picked up."""
+        if (
+            self.rebuild_seconds > 0
+            and self.ready
+            and time.monotonic() - self.built_at > self.rebuild_seconds
+        ):
+            self.built_at = time.monotonic()
+            self.start_background_build(session_factory)
+
+    def stats(self) -> dict:
+        return {"ready": self.ready, **self.index.stats()}
@@ -0,0 +1,248 @@
+"""Bulk idea import from a JSON array, NDJSON or CSV request body.
+
+NDJSON and CSV bodies are parsed as they stream in, so memory is bounded by
+the chunk size rather than the upload. Valid rows are inserted with one
+``executemany`` per chunk and one transaction per chunk; if a chunk is
+rejected by the database its rows are retried one at a time so a single bad
+row only fails itself.
+"""
+import csv
+import json
+import time
+from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable
+
+from fastapi import HTTPException, Request, status
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core import rollups
+from app.core.http_cache import SUBMISSIONS_SCOPE, touch, touch_idea
+from app.core.search import search_service
+from app.core.similarity import similarity_service
+from app.models.idea import Idea
+from app.schemas.idea import IdeaCreate
+
+NDJSON_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+MAX_LINE_BYTES = 1 << 20
+MAX_REPORTED_ERRORS = 1000
+TITLE_MAX_LENGTH = Idea.__table__.c.title.type.length
+
+
+class RowError(Exception):
+    def __init__(self, message: str, field: str | None = None) -> None:
+        super().__init__(message)
+        self.detail = [{"field": field, "message": message}]
+
+
+async def _lines(request: Request) -> AsyncIterator[bytes]:
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        if b"\n" not in buffer:
+            if len(buffer) > MAX_LINE_BYTES:
+                raise HTTPException(status_code=400, detail="Line too long")
+            continue
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+
+async def _json_rows(request: Request):
+    try:
+        rows = json.loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body is not valid JSON")
+    if not isinstance(rows, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array of ideas")
+    for row in rows:
+        yield row
+
+
+async def _ndjson_rows(request: Request):
+    async for line in _lines(request):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield RowError("Line is not valid JSON")
+
+
+async def _csv_rows(request: Request):
+    header: list[str] | None = None
+    record = ""
+    async for line in _lines(request):
+        text = line.decode("utf-8-sig" if header is None and not record else "utf-8", "replace")
+        record = f"{record}\n{text}" if record else text
+        # A quoted field may span lines; wait until the quotes balance
+        if record.count('"') % 2:
+            continue
+        values = next(csv.reader([record.rstrip("\r")]), [])
+        record = ""
+        if header is None:
+            header = [name.strip().lower() for name in values]
+            missing = {"title", "description"} - set(header)
+            if missing:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"CSV header is missing: {', '.join(sorted(missing))}",
+                )
+            continue
+        if not any(v.strip() for v in values):
+            continue
+        yield dict(zip(header, values))
+    if record:
+        yield RowError("Unterminated quoted field")
+
+
+def iter_rows(request: Request):
+    """Raw rows from the request body, picked by its Content-Type."""
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type == "application/json":
+        return _json_rows(request)
+    if content_type in NDJSON_TYPES:
+        return _ndjson_rows(request)
+    if content_type == "text/csv":
+        return _csv_rows(request)
+    raise HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail="Use application/json, application/x-ndjson or text/csv",
+    )
+
+
+def validate_row(raw) -> IdeaCreate:
+    if isinstance(raw, RowError):
+        raise raw
+    if not isinstance(raw, dict):
+        raise RowError("Expected an object with title and description")
+    try:
+        data = IdeaCreate.model_validate(raw)
+    except ValidationError as exc:
+        error = RowError("Invalid row")
+        error.detail = [
+            {"field": ".".join(str(p) for p in err["loc"]) or None, "message": err["msg"]}
+            for err in exc.errors()
+        ]
+        raise error
+    if not data.title.strip():
+        raise RowError("Title must not be empty", "title")
+    if len(data.title) > TITLE_MAX_LENGTH:
+        raise RowError(f"Title is longer than {TITLE_MAX_LENGTH} characters", "title")
+    return data
+
+
+def _insert(db: Session, user_id: int, rows: list[IdeaCreate]) -> datetime:
+    # MySQL DATETIME drops microseconds; truncate so the read-back below matches
+    created_at = datetime.utcnow().replace(microsecond=0)
+    db.execute(
+        insert(Idea),
+        [
+            {
+                "title": row.title,
+                "description": row.description,
+                "status": rollups.DEFAULT_STATUS,
+                "user_id": user_id,
+                "created_at": created_at,
+            }
+            for row in rows
+        ],
+    )
+    rollups.record_bulk_created(db, user_id, created_at, len(rows))
+    touch_idea(db, user_id)
+    touch(db, SUBMISSIONS_SCOPE)
+    db.commit()
+    return created_at
+
+
+def insert_chunk(
+    db: Session, user_id: int, chunk: list[tuple[int, IdeaCreate]]
+) -> tuple[int, list[dict]]:
+    """Insert one chunk; returns (rows inserted, per-row errors)."""
+    inserted = 0
+    errors: list[dict] = []
+    stamps: set[datetime] = set()
+    try:
+        stamps.add(_insert(db, user_id, [data for _, data in chunk]))
+        inserted = len(chunk)
+    except SQLAlchemyError:
+        db.rollback()
+        for row_number, data in chunk:
+            try:
+                stamps.add(_insert(db, user_id, [data]))
+                inserted += 1
+            except SQLAlchemyError as exc:
+                db.rollback()
+                errors.append(
+                    {
+                        "row": row_number,
+                        "errors": [{"field": None, "message": str(getattr(exc, "orig", None) or exc)[:200]}],
+                    }
+                )
+    if stamps:
+        ideas = db.query(Idea.id, Idea.user_id, Idea.title, Idea.description).filter(
+            Idea.user_id == user_id, Idea.created_at.in_(stamps)
+        )
+        for idea in ideas:
+            search_service.index_idea(idea)
+            similarity_service.index_idea(idea)
+    return inserted, errors
+
+
+async def import_ideas(
+    request: Request,
+    user_id: int,
+    run: Callable[[Callable[[Session], tuple[int, list[dict]]]], Awaitable],
+) -> dict:
+    """Stream, validate and insert rows; ``run`` executes a chunk against a sync session."""
+    chunk_size = max(1, settings.bulk_import_chunk_size)
+    started = time.perf_counter()
+    received = inserted = chunks = 0
+    errors: list[dict] = []
+    failed = 0
+    chunk: list[tuple[int, IdeaCreate]] = []
+
+    async def flush() -> None:
+        nonlocal inserted, failed, chunks
+        batch = list(chunk)
+        chunk.clear()
+        count, chunk_errors = await run(lambda s: insert_chunk(s, user_id, batch))
+        inserted += count
+        failed += len(chunk_errors)
+        chunks += 1
+        errors.extend(chunk_errors)
+
+    limited = False
+    async for raw in iter_rows(request):
+        if received >= settings.bulk_import_max_rows:
+            limited = True
+            break
+        received += 1
+        try:
+            chunk.append((received, validate_row(raw)))
+        except RowError as exc:
+            failed += 1
+            errors.append({"row": received, "errors": exc.detail})
+        if len(chunk) >= chunk_size:
+            await flush()
+    if chunk:
+        await flush()
+
+    elapsed = time.perf_counter() - started
+    errors.sort(key=lambda e: e["row"])
+    return {
+        "received": received,
+        "inserted": inserted,
+        "failed": failed,
+        "chunks": chunks,
+        "row_limit_reached": limited,
+        "errors": errors[:MAX_REPORTED_ERRORS],
+        "errors_truncated": len(errors) > MAX_REPORTED_ERRORS,
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(inserted / elapsed, 1) if elapsed > 0 else None,
+    }
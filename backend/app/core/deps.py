@@ -2,7 +2,8 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import SessionLocal, get_async_db, get_db
+from app.core.principal_cache import Principal, principal_cache
 from app.core.security import verify_token
 from app.models.user import User
 
@@ -16,33 +17,72 @@ def _get_role_name(db: Session, user: User) -> str | None:
     role = db.query(Role).filter(Role.id == user.role_id).first()
     return role.role_name if role else None
 
+
+def _claimed_role_name(payload: dict, user: User) -> str | None:
+    # The token carries the role name; trust it only while the user's role_id still matches.
+    if "role" in payload and payload.get("role_id") == user.role_id:
+        return payload["role"]
+    return None
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-):
+
+def _verified_payload(token: str) -> dict:
     payload = verify_token(token)
     if not payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token"
         )
+    return payload
 
-    user = db.query(User).filter(User.id == payload.get("user_id")).first()
+
+def _load_principal(db: Session, payload: dict) -> Principal:
+    user_id = payload.get("user_id")
+    version = principal_cache.version
+    user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
 
-    return user
+    role_name = _claimed_role_name(payload, user) or _get_role_name(db, user)
+    principal = Principal.from_user(user, role_name)
+    principal_cache.put(principal, version)
+    return principal
+
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> Principal:
+    payload = _verified_payload(token)
+    principal = principal_cache.get(payload.get("user_id"))
+    if principal:
+        return principal
+    return _load_principal(db, payload)
+
+
+def principal_for_token(token: str | None) -> Principal:
+    """Resolve a token outside dependency injection, e.g. for long-lived streams.
+
+    A session is opened only on a cache miss and closed straight away, so the
+    connection is not held for the lifetime of the stream.
+    """
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated"
+        )
+    payload = _verified_payload(token)
+    principal = principal_cache.get(payload.get("user_id"))
+    if principal:
+        return principal
+    with SessionLocal() as db:
+        return _load_principal(db, payload)
 
 
 def require_role(required_role: str):
-    def _checker(
-        current_user: User = Depends(get_current_user),
-        db: Session = Depends(get_db),
-    ) -> User:
-        role_name = _get_role_name(db, current_user)
-        if role_name != required_role:
+    def _checker(current_user: Principal = Depends(get_current_user)) -> Principal:
+        if current_user.role_name != required_role:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Requires role: {required_role}",
@@ -54,3 +94,51 @@ def require_role(required_role: str):
 
 require_team_lead = require_role("team_lead")
 require_team_member = require_role("team_member")
+
+
+# Async counterparts used by the app.routers.*_async routers (ASYNC_DB=1).
+# `db` is an AsyncSession; it is left unannotated so importing this module
+# does not require the asyncio extras.
+async def _get_role_name_async(db, user: User) -> str | None:
+    from app.models.role import Role
+
+    role = await db.get(Role, user.role_id)
+    return role.role_name if role else None
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db=Depends(get_async_db),
+) -> Principal:
+    payload = _verified_payload(token)
+    user_id = payload.get("user_id")
+
+    principal = principal_cache.get(user_id)
+    if principal:
+        return principal
+
+    version = principal_cache.version
+    user = await db.get(User, user_id)
+    if not user:
+        raise HTTPException(status_code=401, detail="User not found")
+
+    role_name = _claimed_role_name(payload, user) or await _get_role_name_async(db, user)
+    principal = Principal.from_user(user, role_name)
+    principal_cache.put(principal, version)
+    return principal
+
+
+def require_role_async(required_role: str):
+    async def _checker(current_user: Principal = Depends(get_current_user_async)) -> Principal:
+        if current_user.role_name != required_role:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Requires role: {required_role}",
+            )
+        return current_user
+
+    return _checker
+
+
+require_team_lead_async = require_role_async("team_lead")
+require_team_member_async = require_role_async("team_member")
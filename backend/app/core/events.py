@@ -0,0 +1,292 @@
+"""Pub/sub of idea events for the ``/events`` server-sent-events stream.
+
+Write routes call ``event_broker.publish`` after commit, from request threads
+or the event loop. The backend assigns the event id and hands the event back
+to every worker's broker, in id order. ``LocalBackend`` does this in-process.
+``RedisBackend`` (``EVENTS_BACKEND=redis``) takes ids that are global across
+workers from ``INCR`` and fans out over a pub/sub channel, both in one Lua
+script so no worker can publish a later id before an earlier one. Its blocking
+client runs on a sender thread of its own, never on the event loop (the async
+routers publish from ``run_sync`` on the loop thread).
+
+Each broker keeps the last ``EVENTS_BUFFER_SIZE`` events so a client that
+reconnects with ``Last-Event-ID`` gets what it missed. Every subscriber has a
+bounded queue; a consumer that falls ``EVENTS_QUEUE_SIZE`` events behind is
+dropped and expected to reconnect and resume.
+"""
+import asyncio
+import itertools
+import json
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+
+from app.config import settings
+from app.core.responses import dumps
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class Event:
+    id: int
+    type: str
+    owner_id: int
+    data: dict
+
+    def visible_to(self, user_id: int, is_lead: bool) -> bool:
+        # Same rule as the comment/idea routes: the idea's owner and team leads
+        return is_lead or self.owner_id == user_id
+
+
+class LocalBackend:
+    """Single-process backend: ids from a counter, delivered straight back."""
+
+    def __init__(self) -> None:
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._deliver = None
+
+    def start(self, deliver) -> None:
+        self._deliver = deliver
+
+    def publish(self, type_: str, owner_id: int, data: dict) -> None:
+        # Delivered under the lock too, so concurrent publishers cannot swap their ids
+        with self._lock:
+            self._deliver(Event(next(self._ids), type_, owner_id, data))
+
+    def stop(self) -> None:
+        self._deliver = None
+
+
+# Next id and publish in one step: messages reach subscribers in id order
+_PUBLISH_SCRIPT = """
+local id = redis.call('INCR', KEYS[1])
+redis.call('PUBLISH', ARGV[1], id .. ':' .. ARGV[2])
+return id
+"""
+
+
+class RedisBackend:
+    """Multi-worker backend on Redis pub/sub (needs the optional ``redis`` package).
+
+    Messages are ``<id>:<JSON of type, owner_id and data>``.
+    """
+
+    def __init__(self, url: str, channel: str = "ideaflow:events") -> None:
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+        self._publish = self._redis.register_script(_PUBLISH_SCRIPT)
+        self._channel = channel
+        self._id_key = f"{channel}:last_id"
+        self._thread: threading.Thread | None = None
+        self._pubsub = None
+        # One thread, so this worker's events also leave in the order they were published
+        self._sender = ThreadPoolExecutor(max_workers=1, thread_name_prefix="events-publish")
+
+    def start(self, deliver) -> None:
+        self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(self._channel)
+
+        def listen() -> None:
+            for message in self._pubsub.listen():
+                try:
+                    event_id, _, body = message["data"].partition(b":")
+                    payload = json.loads(body)
+                    deliver(Event(int(event_id), payload["type"], payload["owner_id"], payload["data"]))
+                except Exception:
+                    logger.exception("Dropping malformed event from %s", self._channel)
+
+        self._thread = threading.Thread(target=listen, name="events-redis", daemon=True)
+        self._thread.start()
+
+    def publish(self, type_: str, owner_id: int, data: dict) -> None:
+        body = dumps({"type": type_, "owner_id": owner_id, "data": data})
+        self._sender.submit(self._send, type_, body)
+
+    def _send(self, type_: str, body: bytes) -> None:
+        try:
+            self._publish(keys=[self._id_key], args=[self._channel, body])
+        except Exception:
+            # Notifications are best effort, as in EventBroker.publish
+            logger.exception("Could not publish %s event", type_)
+
+    def stop(self) -> None:
+        self._sender.shutdown(wait=False)
+        if self._pubsub is not None:
+            self._pubsub.close()
+
+
+class Subscription:
+    def __init__(self, user_id: int, is_lead: bool, max_pending: int) -> None:
+        self.user_id = user_id
+        self.is_lead = is_lead
+        self.max_pending = max_pending
+        self.dropped = False
+        self._loop = asyncio.get_running_loop()
+        self._pending: deque[Event] = deque()
+        self._wakeup = asyncio.Event()
+
+    def offer(self, event: Event) -> None:
+        # Called from any thread; queue mutation happens on the subscriber's loop
+        if event.visible_to(self.user_id, self.is_lead):
+            try:
+                self._loop.call_soon_threadsafe(self._push, event)
+            except RuntimeError:
+                # Loop already closed (shutdown); the stream is gone anyway
+                pass
+
+    def _push(self, event: Event) -> None:
+        if self.dropped:
+            return
+        if len(self._pending) >= self.max_pending:
+            self.dropped = True
+            self._pending.clear()
+        else:
+            self._pending.append(event)
+        self._wakeup.set()
+
+    async def next_batch(self, timeout: float) -> list[Event]:
+        """Pending events, or [] after `timeout` seconds without any."""
+        if not self._pending and not self.dropped:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except TimeoutError:
+                return []
+        self._wakeup.clear()
+        batch = list(self._pending)
+        self._pending.clear()
+        return batch
+
+
+class EventBroker:
+    def __init__(self, backend, buffer_size: int, queue_size: int) -> None:
+        self.backend = backend
+        self.queue_size = queue_size
+        self._history: deque[Event] = deque(maxlen=buffer_size)
+        self._subscribers: set[Subscription] = set()
+        self._lock = threading.Lock()
+        self._started = False
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    def _ensure_started(self) -> None:
+        if not self._started:
+            with self._lock:
+                if not self._started:
+                    self.backend.start(self._deliver)
+                    self._started = True
+
+    def publish(self, type_: str, owner_id: int, data: dict) -> None:
+        """Publish an event about an idea owned by `owner_id` (call after commit)."""
+        self._ensure_started()
+        try:
+            self.backend.publish(type_, owner_id, data)
+            self.published += 1
+        except Exception:
+            # Notifications are best effort; never fail the write that triggered them
+            logger.exception("Could not publish %s event", type_)
+
+    def _deliver(self, event: Event) -> None:
+        with self._lock:
+            self._history.append(event)
+            subscribers = list(self._subscribers)
+            self.delivered += 1
+        for subscription in subscribers:
+            subscription.offer(event)
+
+    def subscribe(self, user_id: int, is_lead: bool) -> Subscription:
+        self._ensure_started()
+        subscription = Subscription(user_id, is_lead, self.queue_size)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+            if subscription.dropped:
+                self.dropped += 1
+
+    def replay(self, subscription: Subscription, last_id: int) -> tuple[list[Event], bool, int]:
+        """Buffered events after `last_id` visible to the subscriber.
+
+        Also returns whether events were lost (the gap is older than the buffer,
+        or the ids restarted) and the newest buffered id: queued events up to it
+        were replayed here, those above it were not. The buffer is in id order,
+        since the backends deliver in that order.
+        """
+        with self._lock:
+            history = list(self._history)
+        if not history:
+            return [], False, 0
+        high = history[-1].id
+        lost = history[0].id > last_id + 1 or last_id > high
+        missed = [
+            e
+            for e in history
+            if e.id > last_id and e.visible_to(subscription.user_id, subscription.is_lead)
+        ]
+        return missed, lost, high
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": type(self.backend).__name__,
+                "subscribers": len(self._subscribers),
+                "buffered": len(self._history),
+                "last_id": self._history[-1].id if self._history else None,
+                "published": self.published,
+                "delivered": self.delivered,
+                "dropped_subscribers": self.dropped,
+            }
+
+
+def format_sse(event: Event) -> bytes:
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (
+        event.id,
+        event.type.encode(),
+        dumps(event.data),
+    )
+
+
+def _make_backend():
+    if settings.events_backend == "redis":
+        return RedisBackend(settings.events_redis_url)
+    return LocalBackend()
+
+
+event_broker = EventBroker(
+    _make_backend(),
+    buffer_size=settings.events_buffer_size,
+    queue_size=settings.events_queue_size,
+)
+
+
+def idea_status_event(idea, old_status: str | None, changed_by: int) -> dict:
+    return {
+        "idea_id": idea.id,
+        "title": idea.title,
+        "old_status": old_status,
+        "status": idea.status,
+        "changed_by": changed_by,
+        "changed_at": datetime.utcnow(),
+    }
+
+
+def comment_event(comment) -> dict:
+    return {
+        "idea_id": comment.idea_id,
+        "comment": {
+            "id": comment.id,
+            "comment_text": comment.comment_text,
+            "idea_id": comment.idea_id,
+            "commented_by": comment.commented_by,
+            "created_at": comment.created_at,
+        },
+    }
@@ -0,0 +1,199 @@
+"""Streaming export of ideas with owner, comments and status history.
+
+Rows are read through a server-side cursor (``yield_per``) on one session
+while a second session looks up owners, comments and history one batch at a
+time, so memory stays flat however large the table is. Archived ideas
+(app.core.archive) are streamed the same way from the archive tables and
+merged in, in the same order. Every record carries the keyset cursor of its
+idea; passing the last one received as ``cursor`` resumes an interrupted
+download.
+"""
+import csv
+import heapq
+import io
+import json
+import zlib
+from datetime import datetime
+from itertools import islice
+from operator import itemgetter
+from typing import Callable, Iterable, Iterator
+
+from sqlalchemy.orm import Session
+
+from app.core.archive import unpack_comments
+from app.core.pagination import encode_cursor
+from app.database import read_session
+from app.models.comment import Comment
+from app.models.idea import Idea
+from app.models.idea_archive import ArchivedIdea, ArchivedStatusHistory
+from app.models.idea_status_history import IdeaStatusHistory
+from app.models.user import User
+
+EXPORT_BATCH_SIZE = 500
+CSV_COLUMNS = [
+    "id",
+    "title",
+    "description",
+    "status",
+    "user_id",
+    "owner_name",
+    "owner_email",
+    "created_at",
+    "comments",
+    "status_history",
+    "cursor",
+]
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _iso(value) -> str | None:
+    return value.isoformat() if value else None
+
+
+def _enrich(db: Session, rows: list, archived: bool = False) -> Iterator[dict]:
+    idea_ids = [r.id for r in rows]
+    owner_ids = {r.user_id for r in rows}
+    owners = {
+        u.id: u
+        for u in db.query(User.id, User.name, User.email).filter(User.id.in_(owner_ids))
+    }
+    comments: dict[int, list[dict]] = {}
+    if archived:
+        comments = {r.id: unpack_comments(r.comments) for r in rows}
+    else:
+        for c in (
+            db.query(Comment.id, Comment.idea_id, Comment.comment_text, Comment.commented_by, Comment.created_at)
+            .filter(Comment.idea_id.in_(idea_ids))
+            .order_by(Comment.idea_id, Comment.created_at.asc())
+        ):
+            comments.setdefault(c.idea_id, []).append(
+                {
+                    "id": c.id,
+                    "comment_text": c.comment_text,
+                    "commented_by": c.commented_by,
+                    "created_at": _iso(c.created_at),
+                }
+            )
+    history_model = ArchivedStatusHistory if archived else IdeaStatusHistory
+    history: dict[int, list[dict]] = {}
+    for h in (
+        db.query(
+            history_model.idea_id,
+            history_model.old_status,
+            history_model.new_status,
+            history_model.changed_by,
+            history_model.changed_at,
+        )
+        .filter(history_model.idea_id.in_(idea_ids))
+        .order_by(history_model.idea_id, history_model.changed_at.asc())
+    ):
+        history.setdefault(h.idea_id, []).append(
+            {
+                "old_status": h.old_status,
+                "new_status": h.new_status,
+                "changed_by": h.changed_by,
+                "changed_at": _iso(h.changed_at),
+            }
+        )
+
+    for r in rows:
+        owner = owners.get(r.user_id)
+        yield {
+            "id": r.id,
+            "title": r.title,
+            "description": r.description,
+            "status": r.status,
+            "user_id": r.user_id,
+            "owner_name": owner.name if owner else "",
+            "owner_email": owner.email if owner else "",
+            "created_at": _iso(r.created_at),
+            "comments": comments.get(r.id, []),
+            "status_history": history.get(r.id, []),
+            "cursor": encode_cursor(r.created_at, r.id),
+        }
+
+
+def _keyed_records(
+    stream_db: Session, lookup_db: Session, apply_filters: Callable, model, batch_size: int
+) -> Iterator[tuple[tuple, dict]]:
+    columns = [model.id, model.title, model.description, model.status, model.user_id, model.created_at]
+    archived = model is ArchivedIdea
+    if archived:
+        columns.append(ArchivedIdea.comments)
+    query = apply_filters(stream_db.query(*columns), model)
+    rows = iter(query.order_by(model.created_at.desc(), model.id.desc()).yield_per(batch_size))
+    while batch := list(islice(rows, batch_size)):
+        for row, record in zip(batch, _enrich(lookup_db, batch, archived)):
+            # NULL creation times come last, as the databases order them
+            yield (row.created_at or datetime.min, row.id), record
+
+
+def iter_export_records(
+    apply_filters: Callable, batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[dict]:
+    """Yield export records newest first, archived ideas included.
+
+    `apply_filters(query, model)` narrows the base query of `model`, Idea or
+    ArchivedIdea.
+    """
+    with read_session() as stream_db, read_session() as archive_db, read_session() as lookup_db:
+        merged = heapq.merge(
+            _keyed_records(stream_db, lookup_db, apply_filters, Idea, batch_size),
+            _keyed_records(archive_db, lookup_db, apply_filters, ArchivedIdea, batch_size),
+            key=itemgetter(0),
+            reverse=True,
+        )
+        for _, record in merged:
+            yield record
+
+
+def _ndjson_chunks(records: Iterable[dict], batch_size: int) -> Iterator[bytes]:
+    records = iter(records)
+    while batch := list(islice(records, batch_size)):
+        yield "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in batch).encode()
+
+
+def _csv_chunks(records: Iterable[dict], batch_size: int, header: bool) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS)
+    if header:
+        writer.writeheader()
+    records = iter(records)
+    while batch := list(islice(records, batch_size)):
+        for r in batch:
+            writer.writerow(
+                {
+                    **r,
+                    "comments": json.dumps(r["comments"], ensure_ascii=False),
+                    "status_history": json.dumps(r["status_history"], ensure_ascii=False),
+                }
+            )
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def _gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_stream(
+    records: Iterable[dict],
+    fmt: str,
+    gzip: bool = False,
+    header: bool = True,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[bytes]:
+    chunks = (
+        _csv_chunks(records, batch_size, header)
+        if fmt == "csv"
+        else _ndjson_chunks(records, batch_size)
+    )
+    return _gzip_chunks(chunks) if gzip else chunks
@@ -0,0 +1,146 @@
+"""Daily submission forecast: EWMA level, day-of-week seasonality, Poisson bands.
+
+A NumPy port of ``ewmaSeasonalPoissonForecast`` from the frontend's
+``utils/trendForecast.js``, vectorized over series: ``counts`` is a
+(series, days) matrix, so the overall and every per-owner forecast come out of
+one computation instead of a loop per owner. Parameters are clamped exactly as
+in the frontend and the model is the same, but the numbers are not guaranteed
+to match it value for value:
+
+- days are UTC dates here and the browser's local dates there, so the series,
+  the weekday of each count and the seasonality can differ outright;
+- above ``NORMAL_APPROX_RATE`` the band uses ``NormalDist.inv_cdf`` where the
+  frontend uses Acklam's approximation (relative error about 1e-9);
+- below it the Poisson CDF is summed from log-space pmf terms rather than the
+  frontend's ``pmf * lam / k`` recurrence, and the EWMA and means are summed
+  in a different order, so a value within rounding error of a cut-off (a
+  quantile, or a forecast on a half cent) can land one step the other way.
+"""
+from datetime import date, timedelta
+from statistics import NormalDist
+
+import numpy as np
+
+MAX_HORIZON = 60
+# Above this rate the Poisson quantile uses the normal approximation
+NORMAL_APPROX_RATE = 80
+
+
+def trend_span(days_back: int) -> int:
+    """EWMA span the dashboard uses for a window of `days_back` days."""
+    return max(5, min(18, days_back // 3))
+
+
+def _js_weekday(day: date) -> int:
+    # 0=Sunday..6=Saturday, the order of the frontend's seasonality array
+    return (day.weekday() + 1) % 7
+
+
+def _round_half_up(values: np.ndarray) -> np.ndarray:
+    return np.floor(values + 0.5)
+
+
+def poisson_quantile(rates: np.ndarray, prob: float) -> np.ndarray:
+    """Smallest k with P(X <= k) >= `prob` for X ~ Poisson(rate), per rate."""
+    rates = np.maximum(np.asarray(rates, dtype=float), 0.0)
+    prob = min(max(prob, 0.0), 1.0)
+    result = np.zeros(rates.shape, dtype=np.int64)
+    if prob <= 0 or rates.size == 0:
+        return result
+
+    large = rates > NORMAL_APPROX_RATE
+    if large.any():
+        lam = rates[large]
+        z = NormalDist().inv_cdf(prob)
+        result[large] = np.maximum(0, _round_half_up(lam + z * np.sqrt(lam)))
+
+    small = (rates > 0) & ~large
+    if small.any():
+        # Forecast rates are rounded to cents, so many repeat; build each CDF once
+        lam, inverse = np.unique(rates[small], return_inverse=True)
+        max_k = np.maximum(30, np.ceil(lam + 12 * np.sqrt(lam + 1) + 10)).astype(np.int64)
+        k = np.arange(max_k.max() + 1)
+        log_factorial = np.concatenate(([0.0], np.cumsum(np.log(k[1:]))))
+        # (rates, k) table of the CDF from log-space pmf terms
+        pmf = np.exp(k[None, :] * np.log(lam)[:, None] - lam[:, None] - log_factorial[None, :])
+        cdf = np.cumsum(pmf, axis=1)
+        reached = cdf >= prob
+        first = np.where(reached.any(axis=1), reached.argmax(axis=1), max_k)
+        result[small] = np.minimum(first, max_k)[inverse]
+    return result
+
+
+def ewma_seasonal_poisson(
+    counts: np.ndarray,
+    dates: list[date],
+    horizon: int,
+    span: int = 10,
+    seasonality_smoothing: float = 1.0,
+    interval: float = 0.8,
+) -> dict:
+    """Forecast the next `horizon` days of each row of `counts`.
+
+    `dates` labels the columns and is shared by every series. Returns
+    (series, horizon) arrays ``forecast``, ``lower`` and ``upper`` plus the
+    per-series model parameters.
+    """
+    y = np.maximum(np.nan_to_num(np.atleast_2d(np.asarray(counts, dtype=float))), 0.0)
+    k, n = y.shape
+    h = max(0, min(MAX_HORIZON, int(horizon)))
+    ci = min(max(interval or 0.8, 0.5), 0.95)
+    span = min(max(int(span or 10), 3), 30)
+    alpha = 2 / (span + 1)
+
+    overall_mean = y.mean(axis=1) if n else np.zeros(k)
+
+    # EWMA seeded with the first value: weights (1-a)^(n-1) for y[0], a(1-a)^(n-1-i) after
+    if n:
+        decay = (1 - alpha) ** np.arange(n - 1, -1, -1)
+        weights = alpha * decay
+        weights[0] = decay[0]
+        ewma = y @ weights
+    else:
+        ewma = np.zeros(k)
+
+    # Small drift from last week against the week before, bounded
+    w, w2 = min(7, n), min(14, n)
+    last = y[:, n - w:].mean(axis=1) if w else overall_mean
+    prev = y[:, n - w2:n - w].mean(axis=1) if w2 > w else last
+    max_drift = np.maximum(0.25, 0.25 * np.maximum(1, ewma))
+    drift = np.clip((last - prev) / max(1, w), -max_drift, max_drift)
+
+    # Day-of-week seasonality (0=Sun..6=Sat), smoothed towards 1
+    s = max(0.0, seasonality_smoothing or 1.0)
+    one_hot = np.zeros((n, 7))
+    one_hot[np.arange(n), [_js_weekday(d) for d in dates[:n]]] = 1
+    sum_by_dow = y @ one_hot
+    count_by_dow = one_hot.sum(axis=0)
+    mean_by_dow = np.where(
+        count_by_dow > 0, sum_by_dow / np.maximum(count_by_dow, 1), overall_mean[:, None]
+    )
+    seasonal = np.clip((mean_by_dow + s) / (overall_mean[:, None] + s), 0.6, 1.6)
+
+    start = dates[n - 1] if n else date.today()
+    future_dow = [_js_weekday(start + timedelta(days=i + 1)) for i in range(h)]
+    base = np.maximum(0, ewma)
+    drifted = np.maximum(0, base[:, None] + drift[:, None] * np.arange(h)[None, :])
+    # Gentle shrinkage towards the overall mean for stability
+    mean = 0.75 * drifted * seasonal[:, future_dow] + 0.25 * overall_mean[:, None]
+    forecast = np.maximum(0, np.round(mean, 2))
+
+    lower_q = (1 - ci) / 2
+    return {
+        "forecast": forecast,
+        "lower": poisson_quantile(forecast, lower_q),
+        "upper": poisson_quantile(forecast, 1 - lower_q),
+        "model": {
+            "method": "ewma_seasonal_poisson",
+            "span": span,
+            "alpha": round(alpha, 3),
+            "interval": ci,
+            "baseEwma": np.round(base, 3),
+            "dailyDrift": np.round(drift, 3),
+            "overallMean": np.round(overall_mean, 3),
+            "seasonality": np.round(seasonal, 3),
+        },
+    }
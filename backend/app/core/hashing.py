@@ -0,0 +1,143 @@
+"""Bounded worker pool for bcrypt so hashing bursts cannot stall request threads.
+
+At most ``workers + queue_limit`` hashing jobs are admitted at once; beyond
+that ``run_async`` raises ``HasherBusy`` immediately and the auth routes,
+through ``hash_or_503``, answer 503 instead of queueing behind the CPU. Callers await the job rather
+than block a thread on it: a sync route waiting here would hold one of
+AnyIO's 40 threadpool threads per admitted job, so a login burst could take
+nearly all of them from every other sync route.
+"""
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+
+from app.config import settings
+from app.core.metrics import observe_hash
+
+
+class HasherBusy(Exception):
+    """Raised when the hashing queue is full."""
+
+
+def _timed_call(fn, args):
+    # Runs in the worker; wall-clock start is comparable across processes.
+    started = time.time()
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, started, time.perf_counter() - t0
+
+
+class PasswordHasher:
+    def __init__(self, kind: str, workers: int, queue_limit: int, timeout: float) -> None:
+        self.kind = kind
+        self.workers = max(1, workers)
+        self.capacity = self.workers + max(0, queue_limit)
+        self.timeout = timeout
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._stats = {
+            "submitted": 0,
+            "rejected": 0,
+            "completed": 0,
+            "failed": 0,
+            "queue_seconds_total": 0.0,
+            "queue_seconds_max": 0.0,
+            "hash_seconds_total": 0.0,
+            "hash_seconds_max": 0.0,
+        }
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.kind == "process":
+                        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.workers, thread_name_prefix="bcrypt"
+                        )
+        return self._executor
+
+    def _submit(self, fn, args):
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self._stats["rejected"] += 1
+                raise HasherBusy()
+            self._in_flight += 1
+            self._stats["submitted"] += 1
+        submitted = time.time()
+        try:
+            future = self._get_executor().submit(_timed_call, fn, args)
+        except Exception:
+            self._release(None, submitted)
+            raise
+        future.add_done_callback(lambda f: self._release(f, submitted))
+        return future
+
+    def _release(self, future, submitted: float) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if future is None or future.cancelled() or future.exception() is not None:
+                self._stats["failed"] += 1
+                return
+            _, started, hash_seconds = future.result()
+            queued = max(0.0, started - submitted)
+            self._stats["completed"] += 1
+            self._stats["queue_seconds_total"] += queued
+            self._stats["queue_seconds_max"] = max(self._stats["queue_seconds_max"], queued)
+            self._stats["hash_seconds_total"] += hash_seconds
+            self._stats["hash_seconds_max"] = max(self._stats["hash_seconds_max"], hash_seconds)
+        observe_hash(queued, hash_seconds)
+
+    async def run_async(self, fn, *args):
+        """Await `fn(*args)` on the pool without blocking the event loop."""
+        future = asyncio.wrap_future(self._submit(fn, args))
+        try:
+            result, _, _ = await asyncio.wait_for(future, timeout=self.timeout)
+        except TimeoutError:
+            raise HasherBusy() from None
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update(
+                kind=self.kind,
+                workers=self.workers,
+                capacity=self.capacity,
+                in_flight=self._in_flight,
+            )
+        done = stats["completed"] or 1
+        stats["queue_seconds_avg"] = stats["queue_seconds_total"] / done
+        stats["hash_seconds_avg"] = stats["hash_seconds_total"] / done
+        return stats
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    kind=settings.hash_pool_kind,
+    workers=settings.hash_pool_workers or min(4, os.cpu_count() or 1),
+    queue_limit=settings.hash_queue_limit,
+    timeout=settings.hash_timeout_seconds,
+)
+
+
+async def hash_or_503(fn, *args):
+    """``password_hasher.run_async`` for the auth routes: 503 with Retry-After when busy."""
+    try:
+        return await password_hasher.run_async(fn, *args)
+    except HasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication is busy, try again shortly",
+            headers={"Retry-After": "1"},
+        )
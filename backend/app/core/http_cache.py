@@ -0,0 +1,227 @@
+"""Weak ETags and a compressed response-body cache for frequently polled reads.
+
+Every write route calls ``touch``/``touch_idea`` before committing, which bumps
+one ``cache_versions`` row per affected scope in the same transaction. A read
+route first loads the versions of the scopes it depends on (a primary-key
+lookup), derives a weak ETag from them plus the request path and query, and
+answers ``304 Not Modified`` when the client already has it. Otherwise the
+body is built once per version and kept, gzip/brotli-compressed, in a bounded
+in-process LRU; entries for a scope are dropped after commit of any write to
+it in this process, and other workers' writes change the version and so the
+key.
+"""
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.responses import dumps
+from app.core.rollups import increment_rows
+from app.models.cache_version import CacheVersion
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+IDEAS_SCOPE = "ideas"
+# Bumped only when ideas are created or deleted; for reads that ignore edits and status changes
+SUBMISSIONS_SCOPE = "ideas:submissions"
+MIN_COMPRESS_SIZE = 1024
+CACHE_CONTROL = "private, no-cache"
+VARY = "Accept-Encoding, Authorization"
+
+
+def owner_scope(user_id: int) -> str:
+    return f"ideas:user:{user_id}"
+
+
+def comments_scope(idea_id: int) -> str:
+    return f"comments:idea:{idea_id}"
+
+
+def attachments_scope(idea_id: int) -> str:
+    return f"attachments:idea:{idea_id}"
+
+
+_PENDING_KEY = "http_cache_pending"
+
+
+def touch(db: Session, *scopes: str) -> None:
+    """Bump the version of each scope as part of the caller's transaction."""
+    increment_rows(db, CacheVersion, ("scope",), {(scope,): {"version": 1} for scope in scopes})
+    db.info.setdefault(_PENDING_KEY, set()).update(scopes)
+
+
+def touch_idea(db: Session, owner_id: int, idea_id: int | None = None) -> None:
+    """Scopes affected by a change to an idea (or to its comments)."""
+    scopes = [IDEAS_SCOPE, owner_scope(owner_id)]
+    if idea_id is not None:
+        scopes.append(comments_scope(idea_id))
+    touch(db, *scopes)
+
+
+def versions(db: Session, scopes: list[str]) -> dict[str, int]:
+    found = dict(
+        db.query(CacheVersion.scope, CacheVersion.version).filter(CacheVersion.scope.in_(scopes))
+    )
+    return {scope: found.get(scope, 0) for scope in scopes}
+
+
+class ResponseCache:
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size = 0
+        self._entries: OrderedDict[str, tuple[frozenset, dict[str, bytes]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, encoding: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or encoding not in entry[1]:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1][encoding]
+
+    def put(self, key: str, scopes, encoding: str, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = (frozenset(scopes), {})
+            self._size += len(body) - len(entry[1].get(encoding, b""))
+            entry[1][encoding] = body
+            self._entries.move_to_end(key)
+            while self._size > self.max_bytes and self._entries:
+                _, (_, bodies) = self._entries.popitem(last=False)
+                self._size -= sum(len(b) for b in bodies.values())
+                self.evictions += 1
+
+    def invalidate(self, scopes) -> None:
+        scopes = set(scopes)
+        with self._lock:
+            for key, (entry_scopes, bodies) in list(self._entries.items()):
+                if entry_scopes & scopes:
+                    del self._entries[key]
+                    self._size -= sum(len(b) for b in bodies.values())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+response_cache = ResponseCache(max_bytes=settings.response_cache_max_bytes)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    scopes = session.info.pop(_PENDING_KEY, None)
+    if scopes:
+        response_cache.invalidate(scopes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _accepted_encoding(request: Request) -> str:
+    accepted = set()
+    for part in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in {"q=0", "q=0.0", "q=0.00", "q=0.000"}:
+            continue
+        accepted.add(name.strip().lower())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return "identity"
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6)
+    return body
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison of `etag` with the request's If-None-Match."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def cached_json(
+    request: Request,
+    db: Session,
+    scopes: list[str],
+    build: Callable[[], Any],
+    vary: str = "",
+) -> Response:
+    """Serve `build()` as JSON with a weak ETag, a 304 path and the body cache.
+
+    `vary` adds anything besides the scopes and the URL the body depends on
+    (for example the current date for relative time buckets).
+    """
+    current = versions(db, scopes)
+    tag_source = "|".join(
+        [request.url.path, str(sorted(request.query_params.multi_items())), vary]
+        + [f"{scope}={version}" for scope, version in current.items()]
+    )
+    digest = hashlib.blake2b(tag_source.encode(), digest_size=12).hexdigest()
+    etag = f'W/"{digest}"'
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": VARY}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    encoding = _accepted_encoding(request)
+    body = response_cache.get(digest, encoding) if settings.response_cache_max_bytes > 0 else None
+    if body is None:
+        raw = response_cache.get(digest, "identity") if encoding != "identity" else None
+        if raw is None:
+            raw = dumps(build())
+        if len(raw) < MIN_COMPRESS_SIZE:
+            encoding = "identity"
+        body = _compress(raw, encoding)
+        if settings.response_cache_max_bytes > 0:
+            response_cache.put(digest, current, "identity", raw)
+            if encoding != "identity":
+                response_cache.put(digest, current, encoding, body)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
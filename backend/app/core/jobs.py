@@ -0,0 +1,469 @@
+"""Durable background jobs backed by the ``jobs`` table.
+
+A write route calls ``enqueue`` before committing, so the job is stored in
+the same transaction as the change that needs it (an outbox): both commit or
+neither does. With a ``dedupe_key``, enqueueing a key that is already stored
+does nothing, so retried requests do not queue the work twice.
+
+``JobWorker`` claims due jobs and runs their handlers on a thread pool.
+PostgreSQL, MySQL 8 and MariaDB 10.6+ claim with ``FOR UPDATE SKIP LOCKED``,
+so several workers never wait on each other. Other databases (SQLite) claim
+one row at a time with a conditional ``UPDATE``. A claimed job holds a lease
+of ``JOBS_LEASE_SECONDS``. If its worker dies, the job is queued again once the
+lease expires, so handlers must be idempotent: a job runs at least once. A failed
+job is retried with exponential backoff and jitter. After ``max_attempts`` it
+stays ``failed`` with its last error and gives up its ``dedupe_key``, so the
+same work can be queued again.
+
+A worker runs in every API process (``JOBS_IN_APP``, started by the lifespan),
+or on its own:
+
+    python -m app.core.jobs           # run until interrupted
+    python -m app.core.jobs --drain   # run what is due, then exit
+
+Handlers are registered by kind as ``"module:function"`` strings and imported
+on first use. Each one is called with the job's payload dict.
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+import os
+import random
+import signal
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import case, event, func, insert, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.metrics import (
+    JOB_OLDEST_QUEUED_SECONDS,
+    JOB_QUEUE_DEPTH,
+    JOB_RUN_SECONDS,
+    JOB_WAIT_SECONDS,
+    JOBS_PROCESSED,
+)
+from app.database import SessionLocal
+from app.models.job import JOB_STATUSES, Job
+
+logger = logging.getLogger(__name__)
+
+QUEUED, RUNNING, DONE, FAILED = JOB_STATUSES
+HANDLERS = {
+    "attachments.remove_orphans": "app.core.attachments:remove_orphans_job",
+    "ideas.archive": "app.core.archive:archive_job",
+}
+MAINTENANCE_SECONDS = 15.0
+PURGE_BATCH = 1000
+ERROR_MAX_LENGTH = 4000
+_ENQUEUED_KEY = "jobs_enqueued"
+
+
+def register(kind: str, target: str) -> None:
+    """Run jobs of `kind` with the function at `target` ("package.module:function")."""
+    HANDLERS[kind] = target
+
+
+def enqueue(
+    db: Session,
+    kind: str,
+    payload: dict | None = None,
+    dedupe_key: str | None = None,
+    delay_seconds: float = 0,
+    max_attempts: int | None = None,
+) -> None:
+    """Add a job to the caller's transaction; it is queued when that commits."""
+    if kind not in HANDLERS:
+        raise ValueError(f"No handler registered for job kind {kind!r}")
+    now = datetime.utcnow()
+    values = {
+        "kind": kind,
+        "payload": json.dumps(payload or {}, separators=(",", ":"), default=str),
+        "dedupe_key": dedupe_key,
+        "status": QUEUED,
+        "attempts": 0,
+        "max_attempts": max_attempts or settings.jobs_max_attempts,
+        "run_at": now + timedelta(seconds=delay_seconds),
+        "created_at": now,
+    }
+    table = Job.__table__
+    dialect = db.get_bind().dialect.name
+    if dedupe_key is None:
+        stmt = insert(table).values(**values)
+    elif dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+        # A no-op assignment rather than INSERT IGNORE, which would hide other errors
+        stmt = mysql_insert(table).values(**values)
+        stmt = stmt.on_duplicate_key_update(dedupe_key=stmt.inserted.dedupe_key)
+    elif dialect in {"sqlite", "postgresql"}:
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+
+        stmt = (
+            dialect_insert(table)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=["dedupe_key"])
+        )
+    else:
+        if db.query(Job.id).filter(Job.dedupe_key == dedupe_key).first():
+            return
+        stmt = insert(table).values(**values)
+    db.execute(stmt)
+    db.info[_ENQUEUED_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_after_commit(session):
+    if session.info.pop(_ENQUEUED_KEY, False):
+        job_worker.wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_enqueued(session):
+    session.info.pop(_ENQUEUED_KEY, None)
+
+
+@dataclass(frozen=True, slots=True)
+class ClaimedJob:
+    id: int
+    kind: str
+    payload: str
+    # Including this run
+    attempts: int
+    max_attempts: int
+    run_at: datetime
+
+
+def _resolve(kind: str):
+    target = HANDLERS.get(kind)
+    if target is None:
+        raise LookupError(f"No handler registered for job kind {kind!r}")
+    module, _, name = target.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds before retry number `attempts`: exponential, capped, with jitter."""
+    delay = min(
+        settings.jobs_retry_max_seconds, settings.jobs_retry_base_seconds * 2 ** (attempts - 1)
+    )
+    # Jitter keeps jobs that failed together from retrying in lockstep
+    return delay * random.uniform(0.5, 1.0)
+
+
+def _skip_locked(db: Session) -> bool:
+    dialect = db.get_bind().dialect
+    version = dialect.server_version_info or ()
+    if dialect.name == "postgresql":
+        return True
+    if dialect.name == "mysql":
+        if getattr(dialect, "is_mariadb", False):
+            return version >= (10, 6)
+        return version >= (8, 0, 1)
+    return False
+
+
+class JobWorker:
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        concurrency: int | None = None,
+        poll_seconds: float | None = None,
+        lease_seconds: float | None = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.concurrency = max(1, concurrency or settings.jobs_concurrency)
+        self.poll_seconds = poll_seconds or settings.jobs_poll_seconds
+        self.lease_seconds = lease_seconds or settings.jobs_lease_seconds
+        self.name = f"{socket.gethostname()}:{os.getpid()}:{id(self):x}"
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._stopping = False
+        self._task: asyncio.Task | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._last_maintenance = 0.0
+        self._stats = {"claimed": 0, "done": 0, "retried": 0, "failed": 0, "errors": 0}
+        self._depth: dict[str, int] = {}
+
+    # Lifecycle
+
+    def start(self) -> None:
+        """Run the worker as a task on the current event loop."""
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    def request_stop(self) -> None:
+        """Stop claiming; `run` returns once the running jobs finish."""
+        self._stopping = True
+        self.wake()
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Stop claiming and wait up to `timeout` for running jobs; the rest resume elsewhere."""
+        self.request_stop()
+        if self._task is not None:
+            try:
+                await asyncio.wait_for(self._task, timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Job worker stopped with jobs still running; their leases will expire")
+            self._task = None
+
+    def wake(self) -> None:
+        """Poll now instead of at the next interval; safe from any thread."""
+        loop, wakeup = self._loop, self._wakeup
+        if loop is not None and wakeup is not None:
+            try:
+                loop.call_soon_threadsafe(wakeup.set)
+            except RuntimeError:
+                pass  # loop closed
+
+    async def run(self, drain: bool = False) -> None:
+        """Claim and run jobs until stopped, or with `drain` until none are due."""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = wakeup = asyncio.Event()
+        # One thread per running job plus one for claims and maintenance
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.concurrency + 1, thread_name_prefix="jobs"
+        )
+        running: set[asyncio.Future] = set()
+        failures = 0
+        try:
+            while not self._stopping:
+                wakeup.clear()
+                claimed: list[ClaimedJob] = []
+                try:
+                    if time.monotonic() - self._last_maintenance >= MAINTENANCE_SECONDS:
+                        await self._in_thread(self.maintain)
+                    free = self.concurrency - len(running)
+                    if free > 0:
+                        claimed = await self._in_thread(self.claim, free)
+                    failures = 0
+                except Exception:
+                    # Database unavailable or not migrated yet; back off and retry
+                    failures += 1
+                    self._count("errors")
+                    logger.exception("Job worker could not reach the queue")
+                for job in claimed:
+                    future = self._loop.run_in_executor(self._executor, self.execute, job)
+                    running.add(future)
+                    future.add_done_callback(running.discard)
+                    # A finished job frees a slot: claim again without waiting for the poll
+                    future.add_done_callback(lambda _: wakeup.set())
+                if drain and not claimed and not running:
+                    break
+                timeout = self.poll_seconds * min(2 ** failures, 30)
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+        finally:
+            self._executor.shutdown(wait=False)
+            self._loop = self._wakeup = None
+
+    async def _in_thread(self, fn, *args):
+        return await self._loop.run_in_executor(self._executor, fn, *args)
+
+    # Queue operations (worker threads)
+
+    def claim(self, limit: int) -> list[ClaimedJob]:
+        now = datetime.utcnow()
+        lease = now + timedelta(seconds=self.lease_seconds)
+        claimed_values = {
+            "status": RUNNING,
+            "attempts": Job.attempts + 1,
+            "locked_by": self.name,
+            "locked_until": lease,
+        }
+        with self.session_factory() as db:
+            due = (
+                db.query(Job.id, Job.kind, Job.payload, Job.attempts, Job.max_attempts, Job.run_at)
+                .filter(Job.status == QUEUED, Job.run_at <= now)
+                .order_by(Job.run_at, Job.id)
+                .limit(limit)
+            )
+            if _skip_locked(db):
+                rows = due.with_for_update(skip_locked=True).all()
+                if rows:
+                    db.execute(
+                        update(Job).where(Job.id.in_([row.id for row in rows])).values(claimed_values)
+                    )
+            else:
+                # Without row locks: a job is ours only if it was still queued when we updated it
+                rows = [
+                    row
+                    for row in due.all()
+                    if db.execute(
+                        update(Job)
+                        .where(Job.id == row.id, Job.status == QUEUED)
+                        .values(claimed_values)
+                    ).rowcount
+                    == 1
+                ]
+            db.commit()
+        jobs = [
+            ClaimedJob(row.id, row.kind, row.payload, row.attempts + 1, row.max_attempts, row.run_at)
+            for row in rows
+        ]
+        for job in jobs:
+            JOB_WAIT_SECONDS.labels(job.kind).observe(max(0.0, (now - job.run_at).total_seconds()))
+        self._count("claimed", len(jobs))
+        return jobs
+
+    def execute(self, job: ClaimedJob) -> None:
+        started = time.perf_counter()
+        try:
+            _resolve(job.kind)(json.loads(job.payload))
+        except Exception as exc:
+            JOB_RUN_SECONDS.labels(job.kind).observe(time.perf_counter() - started)
+            self._failed(job, f"{type(exc).__name__}: {exc}")
+            return
+        JOB_RUN_SECONDS.labels(job.kind).observe(time.perf_counter() - started)
+        now = datetime.utcnow()
+        self._finish(
+            job,
+            {"status": DONE, "run_at": now, "finished_at": now, "last_error": None},
+        )
+        JOBS_PROCESSED.labels(job.kind, "done").inc()
+        self._count("done")
+
+    def _failed(self, job: ClaimedJob, error: str) -> None:
+        error = error[:ERROR_MAX_LENGTH]
+        if job.attempts >= job.max_attempts:
+            logger.error(
+                "Job %s (%s) failed for good after %d attempts: %s",
+                job.id,
+                job.kind,
+                job.attempts,
+                error,
+            )
+            values = {
+                "status": FAILED,
+                "dedupe_key": None,
+                "finished_at": datetime.utcnow(),
+                "last_error": error,
+            }
+            outcome = "failed"
+        else:
+            delay = retry_delay(job.attempts)
+            logger.warning("Job %s (%s) failed, retrying in %.0fs: %s", job.id, job.kind, delay, error)
+            values = {
+                "status": QUEUED,
+                "run_at": datetime.utcnow() + timedelta(seconds=delay),
+                "last_error": error,
+            }
+            outcome = "retry"
+        self._finish(job, values)
+        JOBS_PROCESSED.labels(job.kind, outcome).inc()
+        self._count("retried" if outcome == "retry" else "failed")
+
+    def _finish(self, job: ClaimedJob, values: dict) -> None:
+        # Only while we still hold the lease; after it expired the job belongs to another run
+        with self.session_factory() as db:
+            db.execute(
+                update(Job)
+                .where(Job.id == job.id, Job.status == RUNNING, Job.locked_by == self.name)
+                .values(locked_by=None, locked_until=None, **values)
+            )
+            db.commit()
+
+    def maintain(self) -> None:
+        """Requeue jobs whose lease expired, purge old done jobs and refresh the depth gauges."""
+        self._last_maintenance = time.monotonic()
+        now = datetime.utcnow()
+        with self.session_factory() as db:
+            exhausted = Job.attempts >= Job.max_attempts
+            db.execute(
+                update(Job)
+                .where(Job.status == RUNNING, Job.locked_until < now)
+                .values(
+                    status=case((exhausted, FAILED), else_=QUEUED),
+                    # Failed for good: free the key for a fresh enqueue, as _failed does
+                    dedupe_key=case((exhausted, None), else_=Job.dedupe_key),
+                    run_at=now,
+                    locked_by=None,
+                    locked_until=None,
+                    last_error="Lease expired before the job finished",
+                )
+            )
+            cutoff = now - timedelta(seconds=settings.jobs_retain_seconds)
+            old = [
+                job_id
+                for (job_id,) in db.query(Job.id)
+                .filter(Job.status == DONE, Job.run_at < cutoff)
+                .limit(PURGE_BATCH)
+            ]
+            if old:
+                db.query(Job).filter(Job.id.in_(old)).delete(synchronize_session=False)
+            depth = {
+                row.status: (row.count, row.oldest)
+                for row in db.query(
+                    Job.status, func.count(Job.id).label("count"), func.min(Job.run_at).label("oldest")
+                )
+                .filter(Job.status.in_([QUEUED, RUNNING, FAILED]))
+                .group_by(Job.status)
+            }
+            oldest_due = (
+                db.query(func.min(Job.run_at))
+                .filter(Job.status == QUEUED, Job.run_at <= now)
+                .scalar()
+            )
+            db.commit()
+        for status in (QUEUED, RUNNING, FAILED):
+            JOB_QUEUE_DEPTH.labels(status).set(depth.get(status, (0, None))[0])
+        JOB_OLDEST_QUEUED_SECONDS.set((now - oldest_due).total_seconds() if oldest_due else 0)
+        with self._lock:
+            self._depth = {status: count for status, (count, _) in depth.items()}
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[name] += amount
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "running": self._loop is not None,
+                "concurrency": self.concurrency,
+                **self._stats,
+                "depth": dict(self._depth),
+            }
+
+
+job_worker = JobWorker()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run background jobs from the jobs table.")
+    parser.add_argument("--drain", action="store_true", help="exit once no job is due")
+    parser.add_argument("--concurrency", type=int, default=None)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    import app.models  # noqa: F401  (register every mapper)
+
+    worker = JobWorker(concurrency=args.concurrency)
+
+    async def serve() -> None:
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, worker.request_stop)
+        await worker.run(drain=args.drain)
+
+    asyncio.run(serve())
+    print(json.dumps(worker.stats()))
+
+
+if __name__ == "__main__":
+    main()
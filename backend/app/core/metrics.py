@@ -0,0 +1,229 @@
+"""Prometheus metrics: per-route latency, SQL per request, pool and bcrypt timings.
+
+``MetricsMiddleware`` times every request under its route template and, via
+SQLAlchemy engine events, counts the statements and database time spent on
+its behalf. Requests issuing more than ``METRICS_QUERY_THRESHOLD`` statements
+are counted and logged as likely N+1 patterns.
+
+With several worker processes, set ``PROMETHEUS_MULTIPROC_DIR`` to an empty
+directory shared by the workers (and wipe it on deploy); ``/metrics`` then
+aggregates every worker's samples instead of reporting whichever one served
+the scrape.
+"""
+import contextvars
+import logging
+import os
+import time
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram
+from prometheus_client import REGISTRY, generate_latest, multiprocess
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+# Long-lived streams would only skew the latency histograms
+UNTIMED_ROUTES = {"/events"}
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+RESPONSE_BYTES = Histogram(
+    "http_response_size_bytes",
+    "Response body size",
+    ["method", "route"],
+    buckets=SIZE_BUCKETS,
+)
+REQUEST_QUERIES = Histogram(
+    "db_queries_per_request",
+    "SQL statements issued while serving a request",
+    ["method", "route"],
+    buckets=QUERY_BUCKETS,
+)
+REQUEST_DB_SECONDS = Histogram(
+    "db_time_per_request_seconds",
+    "Time spent executing SQL while serving a request",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+QUERY_HEAVY_REQUESTS = Counter(
+    "db_query_threshold_exceeded_total",
+    "Requests that issued more SQL statements than METRICS_QUERY_THRESHOLD",
+    ["method", "route"],
+)
+POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds",
+    "Time to get a connection from the pool, including waits and new connections",
+    ["engine"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+ADMISSION_REJECTED = Counter(
+    "http_requests_rejected_total",
+    "Requests refused by admission control (rate_limited or shed)",
+    ["reason", "route"],
+)
+JOBS_PROCESSED = Counter(
+    "jobs_processed_total",
+    "Background job runs by outcome (done, retry, failed)",
+    ["kind", "outcome"],
+)
+JOB_WAIT_SECONDS = Histogram(
+    "job_queue_wait_seconds",
+    "Time from a job becoming due to a worker claiming it",
+    ["kind"],
+    buckets=LATENCY_BUCKETS + (30, 60, 300, 900),
+)
+JOB_RUN_SECONDS = Histogram(
+    "job_run_seconds",
+    "Time spent running one job",
+    ["kind"],
+    buckets=LATENCY_BUCKETS + (30, 60, 300),
+)
+JOB_QUEUE_DEPTH = Gauge(
+    "job_queue_depth",
+    "Jobs by status (queued, running, failed) at the last worker check",
+    ["status"],
+    multiprocess_mode="max",
+)
+JOB_OLDEST_QUEUED_SECONDS = Gauge(
+    "job_oldest_queued_seconds",
+    "How long the oldest due job has been waiting for a worker",
+    multiprocess_mode="max",
+)
+HASH_QUEUE_SECONDS = Histogram(
+    "password_hash_queue_seconds",
+    "Time a bcrypt job waited for a worker",
+    buckets=LATENCY_BUCKETS,
+)
+HASH_SECONDS = Histogram(
+    "password_hash_seconds",
+    "Time spent hashing or verifying one password",
+    buckets=LATENCY_BUCKETS,
+)
+COLD_START_SECONDS = Gauge(
+    "app_cold_start_seconds",
+    "Worker start-up time by phase (import, startup, warmup, ready)",
+    ["phase"],
+    multiprocess_mode="all",
+)
+
+
+class _RequestStats:
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+# Shared by reference with the threadpool copies of the request context
+_current: contextvars.ContextVar[_RequestStats | None] = contextvars.ContextVar(
+    "request_stats", default=None
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = conn.info.get("query_started")
+    if stats is None or not started:
+        return
+    stats.queries += 1
+    stats.db_seconds += time.perf_counter() - started.pop()
+
+
+def instrument_pool(engine, name: str) -> None:
+    """Time connection checkouts of `engine`'s pool."""
+    pool = engine.pool
+    connect = pool.connect
+    observe = POOL_CHECKOUT_SECONDS.labels(name).observe
+
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            observe(time.perf_counter() - started)
+
+    pool.connect = timed_connect
+
+
+def observe_hash(queue_seconds: float, hash_seconds: float) -> None:
+    HASH_QUEUE_SECONDS.observe(queue_seconds)
+    HASH_SECONDS.observe(hash_seconds)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware so streaming responses are not buffered."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = _RequestStats()
+        token = _current.set(stats)
+        status_code = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _current.reset(token)
+            # The router stores the matched route in the scope
+            route = scope.get("route")
+            template = getattr(route, "path_format", None) or getattr(route, "path", "unmatched")
+            if template not in UNTIMED_ROUTES:
+                self._record(scope["method"], template, status_code, size, elapsed, stats)
+
+    @staticmethod
+    def _record(method, route, status_code, size, elapsed, stats) -> None:
+        REQUEST_SECONDS.labels(method, route, str(status_code)).observe(elapsed)
+        RESPONSE_BYTES.labels(method, route).observe(size)
+        REQUEST_QUERIES.labels(method, route).observe(stats.queries)
+        REQUEST_DB_SECONDS.labels(method, route).observe(stats.db_seconds)
+        if stats.queries > settings.metrics_query_threshold:
+            QUERY_HEAVY_REQUESTS.labels(method, route).inc()
+            logger.warning(
+                "%s %s issued %d SQL statements (threshold %d)",
+                method,
+                route,
+                stats.queries,
+                settings.metrics_query_threshold,
+            )
+
+
+def render_latest() -> tuple[bytes, str]:
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,45 @@
+import base64
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(created_at: datetime | None, row_id: int) -> str:
+    """Opaque keyset cursor for the (created_at, id) ordering."""
+    stamp = created_at.isoformat() if created_at else ""
+    raw = f"{stamp}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime | None, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        stamp, row_id = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        return (datetime.fromisoformat(stamp) if stamp else None), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_before(created_col, id_col, cursor: str):
+    """Filter for rows strictly after `cursor` in (created_at DESC, id DESC) order."""
+    created_at, row_id = decode_cursor(cursor)
+    if created_at is None:
+        return and_(created_col.is_(None), id_col < row_id)
+    return or_(
+        created_col < created_at,
+        and_(created_col == created_at, id_col < row_id),
+        created_col.is_(None),
+    )
+
+
+
+def keyset_after(created_col, id_col, cursor: str):
+    """Filter for rows strictly after `cursor` in (created_at ASC, id ASC) order."""
+    created_at, row_id = decode_cursor(cursor)
+    if created_at is None:
+        return or_(and_(created_col.is_(None), id_col > row_id), created_col.is_not(None))
+    return or_(
+        created_col > created_at,
+        and_(created_col == created_at, id_col > row_id),
+    )
@@ -0,0 +1,153 @@
+"""Bounded TTL/LRU cache of authenticated principals keyed by user id.
+
+``get_current_user`` consults this before touching the database. Entries are
+dropped after commit whenever a User or Role row changes in this process;
+other workers converge within the TTL.
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.role import Role
+from app.models.user import User
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """Read-only snapshot of the authenticated user handed to the routes."""
+
+    id: int
+    name: str
+    email: str
+    role_id: int
+    role_name: str | None
+    designation: str | None = None
+
+    @classmethod
+    def from_user(cls, user: User, role_name: str | None) -> "Principal":
+        return cls(
+            id=user.id,
+            name=user.name,
+            email=user.email,
+            role_id=user.role_id,
+            role_name=role_name,
+            designation=user.designation,
+        )
+
+
+class PrincipalCache:
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[int, tuple[float, Principal]] = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every invalidation so a lookup that raced with one is not cached
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self, user_id: int) -> Principal | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] < now:
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, principal: Principal, version: int | None = None) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            if version is not None and version != self._version:
+                return
+            self._entries[principal.id] = (time.monotonic() + self.ttl_seconds, principal)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_users(self, user_ids) -> None:
+        with self._lock:
+            self._version += 1
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def invalidate_roles(self, role_ids) -> None:
+        role_ids = set(role_ids)
+        with self._lock:
+            self._version += 1
+            for user_id, (_, principal) in list(self._entries.items()):
+                if principal.role_id in role_ids:
+                    del self._entries[user_id]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+principal_cache = PrincipalCache(
+    max_size=settings.principal_cache_size,
+    ttl_seconds=settings.principal_cache_ttl_seconds,
+)
+
+
+# Invalidate after commit so a concurrent request cannot re-cache pre-commit data.
+_PENDING_KEY = "principal_cache_pending"
+
+
+def _pending(session: Session) -> dict[str, set]:
+    return session.info.setdefault(_PENDING_KEY, {"users": set(), "roles": set()})
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_changes(session, flush_context, instances):
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User) and obj.id is not None:
+            _pending(session)["users"].add(obj.id)
+        elif isinstance(obj, Role) and obj.id is not None:
+            _pending(session)["roles"].add(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    if pending["users"]:
+        principal_cache.invalidate_users(pending["users"])
+    if pending["roles"]:
+        principal_cache.invalidate_roles(pending["roles"])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session):
+    session.info.pop(_PENDING_KEY, None)
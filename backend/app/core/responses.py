@@ -0,0 +1,37 @@
+"""JSON response that encodes straight to bytes, skipping ``jsonable_encoder``.
+
+List routes build plain dicts from Core rows and return ``FastJSONResponse``
+directly, so FastAPI neither validates them against the response model nor
+walks them through ``jsonable_encoder``. orjson is used when installed, with
+the stdlib encoder as a fallback; both write datetimes as ISO 8601, the same
+as the default response path.
+"""
+import json
+from datetime import date, datetime
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _default(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,586 @@
+"""Incrementally maintained idea rollups behind the /ideas/metrics routes.
+
+The write routes call the ``record_*`` helpers before committing so the
+rollups change in the same transaction as the idea itself. Counters back
+/ideas/metrics/summary; duration histograms built from the status history
+back /ideas/metrics/cycle-time. ``record_comment`` keeps each idea's comment
+count and latest comment current for the list routes. ``rebuild`` recomputes
+everything from the ``ideas``, ``idea_status_history`` and ``comments``
+tables and reports drift. Archived ideas (app.core.archive) keep counting, so
+the counters and histograms are recomputed over the archive tables as well:
+
+    python -m app.core.rollups            # verify only
+    python -m app.core.rollups --rebuild  # verify and overwrite
+"""
+from bisect import bisect_right
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import Date, String, case, cast, func, literal_column, or_, select, union_all, update
+from sqlalchemy.orm import Session
+
+from app.models.comment import Comment
+from app.models.idea import COMMENT_PREVIEW_LENGTH, Idea
+from app.models.idea_archive import ArchivedIdea, ArchivedStatusHistory
+from app.models.idea_rollup import (
+    IdeaCycleTimeBucket,
+    IdeaDailyCount,
+    IdeaOwnerStatusCount,
+    IdeaStatusCount,
+)
+from app.models.idea_status_history import IdeaStatusHistory
+
+
+DEFAULT_STATUS = "Submitted"
+FINAL_STATUSES = ("Approved", "Rejected")
+# Upper bounds (seconds) of the duration histogram buckets; the last bucket is open
+DURATION_BUCKETS = tuple(
+    hours * 3600 for hours in (1, 4, 12, 24, 48, 72, 120, 168, 336, 504, 720, 1440, 2160)
+)
+BUCKET_KEYS = ("week", "kind", "status", "user_id", "bucket")
+UPSERT_CHUNK = 500
+
+
+def _status_key(status: str | None) -> str:
+    return status or DEFAULT_STATUS
+
+
+def increment(db: Session, model, keys: dict, delta: int, column: str = "count") -> None:
+    """Add `delta` to `column` of the row identified by `keys`, creating it if needed."""
+    increment_columns(db, model, keys, {column: delta})
+
+
+def increment_columns(db: Session, model, keys: dict, deltas: dict[str, int]) -> None:
+    """Add each of `deltas` to its column of the row identified by `keys` (one upsert)."""
+    table = model.__table__
+    added = {column: table.c[column] + delta for column, delta in deltas.items()}
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+
+        stmt = insert(table).values(**keys, **deltas)
+        db.execute(stmt.on_duplicate_key_update(added))
+        return
+    if dialect in {"sqlite", "postgresql"}:
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+
+        stmt = insert(table).values(**keys, **deltas)
+        db.execute(stmt.on_conflict_do_update(index_elements=list(keys), set_=added))
+        return
+
+    where = [table.c[k] == v for k, v in keys.items()]
+    result = db.execute(update(table).where(*where).values(added))
+    if result.rowcount == 0:
+        db.execute(table.insert().values(**keys, **deltas))
+
+
+def increment_rows(
+    db: Session, model, key_names: tuple[str, ...], rows: dict[tuple, dict[str, int]]
+) -> None:
+    """increment_columns for many rows: `rows` maps key tuples to their deltas.
+
+    Every row must carry the same delta columns. MySQL, PostgreSQL and SQLite get
+    one multi-row upsert per chunk; other databases fall back to a row at a time.
+    """
+    if not rows:
+        return
+    table = model.__table__
+    dialect = db.get_bind().dialect.name
+    # Sorted so concurrent writers take the row locks in the same order
+    values = [{**dict(zip(key_names, key)), **deltas} for key, deltas in sorted(rows.items())]
+    columns = [column for column in values[0] if column not in key_names]
+    if dialect not in {"mysql", "sqlite", "postgresql"}:
+        for row in values:
+            increment_columns(
+                db, model, {k: row[k] for k in key_names}, {c: row[c] for c in columns}
+            )
+        return
+    for start in range(0, len(values), UPSERT_CHUNK):
+        chunk = values[start:start + UPSERT_CHUNK]
+        if dialect == "mysql":
+            from sqlalchemy.dialects.mysql import insert
+
+            stmt = insert(table).values(chunk)
+            db.execute(
+                stmt.on_duplicate_key_update({c: table.c[c] + stmt.inserted[c] for c in columns})
+            )
+            continue
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+
+        stmt = insert(table).values(chunk)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=list(key_names),
+                set_={c: table.c[c] + stmt.excluded[c] for c in columns},
+            )
+        )
+
+
+def _bump_day(db: Session, created_at: datetime | None, delta: int) -> None:
+    if created_at is not None:
+        increment(db, IdeaDailyCount, {"day": created_at.date()}, delta)
+
+
+def record_created(db: Session, idea: Idea) -> None:
+    status = _status_key(idea.status)
+    increment(db, IdeaStatusCount, {"status": status}, 1)
+    _bump_day(db, idea.created_at, 1)
+    increment(db, IdeaOwnerStatusCount, {"user_id": idea.user_id, "status": status}, 1)
+
+
+def record_bulk_created(db: Session, user_id: int, created_at: datetime, count: int) -> None:
+    """Rollup bump for `count` new ideas from one owner sharing one timestamp (bulk import)."""
+    if count <= 0:
+        return
+    increment(db, IdeaStatusCount, {"status": DEFAULT_STATUS}, count)
+    _bump_day(db, created_at, count)
+    increment(db, IdeaOwnerStatusCount, {"user_id": user_id, "status": DEFAULT_STATUS}, count)
+
+
+def record_deleted(db: Session, idea: Idea) -> None:
+    status = _status_key(idea.status)
+    increment(db, IdeaStatusCount, {"status": status}, -1)
+    _bump_day(db, idea.created_at, -1)
+    increment(db, IdeaOwnerStatusCount, {"user_id": idea.user_id, "status": status}, -1)
+    _remove_durations(db, idea)
+
+
+def record_comment(db: Session, comment: Comment) -> None:
+    """Count `comment` on its idea and make it the latest; call after flushing it."""
+    # Only a higher id replaces the latest comment, so concurrent comments settle on
+    # the last one added. MySQL applies SET clauses in order and later ones see the
+    # new values; last_comment_id, which the condition reads, is assigned last.
+    newer = or_(Idea.last_comment_id.is_(None), Idea.last_comment_id < comment.id)
+    db.execute(
+        update(Idea)
+        .where(Idea.id == comment.idea_id)
+        .ordered_values(
+            (Idea.comment_count, Idea.comment_count + 1),
+            (Idea.last_comment_at, case((newer, comment.created_at), else_=Idea.last_comment_at)),
+            (Idea.last_comment_by, case((newer, comment.commented_by), else_=Idea.last_comment_by)),
+            (
+                Idea.last_comment_preview,
+                case((newer, _preview(comment.comment_text)), else_=Idea.last_comment_preview),
+            ),
+            (Idea.last_comment_id, case((newer, comment.id), else_=Idea.last_comment_id)),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _preview(text: str | None) -> str:
+    return (text or "")[:COMMENT_PREVIEW_LENGTH]
+
+
+def _week_start(moment: datetime) -> date:
+    day = moment.date()
+    return day - timedelta(days=day.weekday())
+
+
+def _duration_bucket(kind: str, status: str, user_id: int, start, end) -> tuple[tuple, int]:
+    """(week, kind, status, user_id, bucket) key and whole seconds of one duration."""
+    # Whole seconds, rounded half up like the SQL in _expected_durations
+    seconds = max(0, int((end - start).total_seconds() + 0.5))
+    key = (_week_start(end), kind, status, user_id, bisect_right(DURATION_BUCKETS, seconds))
+    return key, seconds
+
+
+def _bump_duration(
+    db: Session, kind: str, status: str, user_id: int, start, end, sign: int
+) -> None:
+    if start is None or end is None:
+        return
+    key, seconds = _duration_bucket(kind, status, user_id, start, end)
+    increment_columns(
+        db,
+        IdeaCycleTimeBucket,
+        dict(zip(BUCKET_KEYS, key)),
+        {"count": sign, "seconds": sign * seconds},
+    )
+
+
+def record_transition(db: Session, idea: Idea, new: str, changed_at: datetime) -> None:
+    """Rollups for one status change; call before setting ``idea.status`` and adding its history."""
+    record_bulk_transitions(db, [(idea, new)], changed_at)
+
+
+def record_bulk_transitions(db: Session, changes: list[tuple], changed_at: datetime) -> None:
+    """Rollups for many status changes made at `changed_at`; call before adding their history.
+
+    `changes` holds (idea, new_status) pairs, at most one per idea, where each idea
+    has ``id``, ``user_id``, ``status`` (the old one) and ``created_at``. The effect
+    is that of the single changes applied one by one, with one history query and
+    one multi-row upsert per rollup table.
+    """
+    if not changes:
+        return
+    history = IdeaStatusHistory
+    previous = {
+        row.idea_id: row
+        for row in db.query(
+            history.idea_id,
+            func.max(history.changed_at).label("last_changed_at"),
+            func.max(case((history.new_status.in_(FINAL_STATUSES), 1), else_=0)).label("decided"),
+        )
+        .filter(history.idea_id.in_([idea.id for idea, _ in changes]))
+        .group_by(history.idea_id)
+    }
+
+    statuses: Counter = Counter()
+    owners: Counter = Counter()
+    durations: dict[tuple, list[int]] = defaultdict(lambda: [0, 0])
+
+    def add_duration(kind: str, status: str, user_id: int, start) -> None:
+        if start is None:
+            return
+        key, seconds = _duration_bucket(kind, status, user_id, start, changed_at)
+        durations[key][0] += 1
+        durations[key][1] += seconds
+
+    for idea, new in changes:
+        old = _status_key(idea.status)
+        last = previous.get(idea.id)
+        add_duration("dwell", old, idea.user_id, last.last_changed_at if last else idea.created_at)
+        if new in FINAL_STATUSES and not (last and last.decided):
+            add_duration("cycle", new, idea.user_id, idea.created_at)
+        new = _status_key(new)
+        if old != new:
+            statuses[old] -= 1
+            statuses[new] += 1
+            owners[(idea.user_id, old)] -= 1
+            owners[(idea.user_id, new)] += 1
+
+    increment_rows(
+        db, IdeaStatusCount, ("status",), {(k,): {"count": d} for k, d in statuses.items() if d}
+    )
+    increment_rows(
+        db,
+        IdeaOwnerStatusCount,
+        ("user_id", "status"),
+        {key: {"count": d} for key, d in owners.items() if d},
+    )
+    increment_rows(
+        db,
+        IdeaCycleTimeBucket,
+        BUCKET_KEYS,
+        {key: {"count": count, "seconds": seconds} for key, (count, seconds) in durations.items()},
+    )
+
+
+def _remove_durations(db: Session, idea: Idea) -> None:
+    # Per-idea replay of _expected_durations for the history being deleted with it
+    history = IdeaStatusHistory
+    entered_at = idea.created_at
+    decided = False
+    for row in (
+        db.query(history.old_status, history.new_status, history.changed_at)
+        .filter(history.idea_id == idea.id)
+        .order_by(history.changed_at, history.id)
+    ):
+        _bump_duration(db, "dwell", _status_key(row.old_status), idea.user_id, entered_at, row.changed_at, -1)
+        if row.new_status in FINAL_STATUSES and not decided:
+            _bump_duration(db, "cycle", row.new_status, idea.user_id, idea.created_at, row.changed_at, -1)
+            decided = True
+        entered_at = row.changed_at
+
+
+def histogram_percentile(counts: list[int], q: float) -> float | None:
+    """Approximate `q` quantile (seconds), interpolating within DURATION_BUCKETS.
+
+    Values in the open last bucket are reported as its lower bound.
+    """
+    total = sum(counts)
+    if not total:
+        return None
+    target = q * total
+    seen = 0
+    for index, count in enumerate(counts):
+        if count and seen + count >= target:
+            low = DURATION_BUCKETS[index - 1] if index else 0
+            high = DURATION_BUCKETS[index] if index < len(DURATION_BUCKETS) else low
+            return low + (high - low) * (target - seen) / count
+        seen += count
+    return float(DURATION_BUCKETS[-1])
+
+
+def _as_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value))
+
+
+def _all_ideas():
+    # Plain strings on both sides: PostgreSQL will not union its ENUM with VARCHAR
+    return union_all(
+        *(
+            select(model.id, model.user_id, cast(model.status, String(20)).label("status"), model.created_at)
+            for model in (Idea, ArchivedIdea)
+        )
+    ).subquery()
+
+
+def _all_history():
+    return union_all(
+        *(
+            select(h.id, h.idea_id, h.old_status, h.new_status, h.changed_at)
+            for h in (IdeaStatusHistory, ArchivedStatusHistory)
+        )
+    ).subquery()
+
+
+def _expected(db: Session) -> dict[str, dict]:
+    ideas = _all_ideas().c
+    status_col = func.coalesce(ideas.status, DEFAULT_STATUS)
+    day_col = func.date(ideas.created_at)
+    return {
+        "status": {
+            (s,): n
+            for s, n in db.query(status_col, func.count(ideas.id)).group_by(status_col)
+        },
+        "daily": {
+            (_as_date(d),): n
+            for d, n in db.query(day_col, func.count(ideas.id))
+            .filter(ideas.created_at.is_not(None))
+            .group_by(day_col)
+        },
+        "owner": {
+            (u, s): n
+            for u, s, n in db.query(ideas.user_id, status_col, func.count(ideas.id)).group_by(
+                ideas.user_id, status_col
+            )
+        },
+        "durations": _expected_durations(db),
+        "comments": {
+            (idea_id,): (n, last_id)
+            for idea_id, n, last_id in db.query(
+                Comment.idea_id, func.count(Comment.id), func.max(Comment.id)
+            ).group_by(Comment.idea_id)
+        },
+    }
+
+
+def _seconds_between(dialect: str, start, end):
+    if dialect == "sqlite":
+        seconds = func.round((func.julianday(end) - func.julianday(start)) * 86400)
+    elif dialect == "mysql":
+        seconds = func.timestampdiff(literal_column("SECOND"), start, end)
+    else:
+        seconds = func.round(func.extract("epoch", end - start))
+    return case((seconds < 0, 0), else_=seconds)
+
+
+def _week_of(dialect: str, moment):
+    # Monday of the week, as _week_start does
+    if dialect == "sqlite":
+        return func.date(moment, "weekday 0", "-6 days")
+    if dialect == "mysql":
+        return func.subdate(func.date(moment), func.weekday(moment))
+    return cast(func.date_trunc("week", moment), Date)
+
+
+def _expected_durations(db: Session) -> dict[tuple, tuple[int, int]]:
+    """Duration histograms straight from the history, in two grouped queries.
+
+    LAG gives each transition the time its idea entered the status it leaves
+    (the creation time for the first one); ROW_NUMBER over the final-status
+    rows finds each idea's first decision.
+    """
+    dialect = db.get_bind().dialect.name
+    history_rows = _all_history()
+    ideas_rows = _all_ideas()
+    history, ideas = history_rows.c, ideas_rows.c
+    order = (history.changed_at, history.id)
+    is_final = case((history.new_status.in_(FINAL_STATUSES), 1), else_=0)
+    steps = (
+        select(
+            history.idea_id,
+            ideas.user_id,
+            func.coalesce(history.old_status, DEFAULT_STATUS).label("old_status"),
+            history.new_status,
+            history.changed_at,
+            ideas.created_at,
+            func.coalesce(
+                func.lag(history.changed_at).over(partition_by=history.idea_id, order_by=order),
+                ideas.created_at,
+            ).label("entered_at"),
+            func.row_number().over(partition_by=(history.idea_id, is_final), order_by=order).label("nth"),
+        )
+        .select_from(history_rows)
+        .join(ideas_rows, ideas.id == history.idea_id)
+        .subquery()
+    )
+
+    found = {}
+    for kind, status, start, where in (
+        ("dwell", steps.c.old_status, steps.c.entered_at, ()),
+        (
+            "cycle",
+            steps.c.new_status,
+            steps.c.created_at,
+            (steps.c.new_status.in_(FINAL_STATUSES), steps.c.nth == 1),
+        ),
+    ):
+        seconds = _seconds_between(dialect, start, steps.c.changed_at)
+        bucket = case(
+            *((seconds < bound, index) for index, bound in enumerate(DURATION_BUCKETS)),
+            else_=len(DURATION_BUCKETS),
+        )
+        # Grouped by output name so the expressions are not repeated with new parameters
+        query = (
+            select(
+                _week_of(dialect, steps.c.changed_at).label("week_start"),
+                status.label("duration_status"),
+                steps.c.user_id,
+                bucket.label("bucket_index"),
+                func.count(),
+                func.sum(seconds),
+            )
+            .where(start.is_not(None), steps.c.changed_at.is_not(None), *where)
+            .group_by(
+                literal_column("week_start"),
+                literal_column("duration_status"),
+                steps.c.user_id,
+                literal_column("bucket_index"),
+            )
+        )
+        for week, status_value, user_id, index, count, total in db.execute(query):
+            found[(_as_date(week), kind, status_value, user_id, int(index))] = (count, int(total))
+    return found
+
+
+def _actual(db: Session) -> dict[str, dict]:
+    return {
+        "status": {(r.status,): r.count for r in db.query(IdeaStatusCount) if r.count},
+        "daily": {(r.day,): r.count for r in db.query(IdeaDailyCount) if r.count},
+        "owner": {
+            (r.user_id, r.status): r.count for r in db.query(IdeaOwnerStatusCount) if r.count
+        },
+        "durations": {
+            (r.week, r.kind, r.status, r.user_id, r.bucket): (r.count, r.seconds)
+            for r in db.query(IdeaCycleTimeBucket)
+            if r.count
+        },
+        "comments": {
+            (r.id,): (r.comment_count, r.last_comment_id)
+            for r in db.query(Idea.id, Idea.comment_count, Idea.last_comment_id).filter(
+                or_(Idea.comment_count != 0, Idea.last_comment_id.is_not(None))
+            )
+        },
+    }
+
+
+def verify(db: Session) -> list[dict]:
+    """Return one entry per rollup key whose stored count differs from the source rows."""
+    expected, actual = _expected(db), _actual(db)
+    drift = []
+    for name in expected:
+        for key in sorted(set(expected[name]) | set(actual[name]), key=str):
+            want = expected[name].get(key, 0)
+            have = actual[name].get(key, 0)
+            if want != have:
+                drift.append({"rollup": name, "key": key, "expected": want, "actual": have})
+    return drift
+
+
+def rebuild(db: Session) -> list[dict]:
+    """Recompute every rollup from scratch and return the drift that was corrected."""
+    drift = verify(db)
+    expected = _expected(db)
+    db.query(IdeaStatusCount).delete()
+    db.query(IdeaDailyCount).delete()
+    db.query(IdeaOwnerStatusCount).delete()
+    db.query(IdeaCycleTimeBucket).delete()
+    db.add_all(IdeaStatusCount(status=s, count=n) for (s,), n in expected["status"].items())
+    db.add_all(IdeaDailyCount(day=d, count=n) for (d,), n in expected["daily"].items())
+    db.add_all(
+        IdeaOwnerStatusCount(user_id=u, status=s, count=n)
+        for (u, s), n in expected["owner"].items()
+    )
+    db.add_all(
+        IdeaCycleTimeBucket(week=w, kind=k, status=s, user_id=u, bucket=b, count=n, seconds=t)
+        for (w, k, s, u, b), (n, t) in expected["durations"].items()
+    )
+    _rebuild_comment_summaries(db, expected["comments"])
+    db.commit()
+    return drift
+
+
+def _rebuild_comment_summaries(db: Session, expected: dict) -> None:
+    db.execute(
+        update(Idea)
+        .where(or_(Idea.comment_count != 0, Idea.last_comment_id.is_not(None)))
+        .values(
+            comment_count=0,
+            last_comment_id=None,
+            last_comment_at=None,
+            last_comment_by=None,
+            last_comment_preview=None,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    latest = [last_id for _, last_id in expected.values()]
+    for start in range(0, len(latest), 1000):
+        rows = db.query(
+            Comment.id, Comment.idea_id, Comment.created_at, Comment.commented_by, Comment.comment_text
+        ).filter(Comment.id.in_(latest[start:start + 1000]))
+        summaries = [
+            {
+                "id": c.idea_id,
+                "comment_count": expected[(c.idea_id,)][0],
+                "last_comment_id": c.id,
+                "last_comment_at": c.created_at,
+                "last_comment_by": c.commented_by,
+                "last_comment_preview": _preview(c.comment_text),
+            }
+            for c in rows
+        ]
+        if summaries:
+            # Bulk UPDATE by primary key, one executemany per batch
+            db.execute(update(Idea), summaries)
+
+
+def ensure_initialized(db: Session) -> None:
+    """Backfill the rollups once when they are empty but ideas already exist."""
+    counters_missing = (
+        db.query(IdeaStatusCount).first() is None and db.query(Idea.id).first() is not None
+    )
+    durations_missing = (
+        db.query(IdeaCycleTimeBucket).first() is None
+        and db.query(IdeaStatusHistory.id).first() is not None
+    )
+    comments_missing = (
+        db.query(Comment.id)
+        .join(Idea, Idea.id == Comment.idea_id)
+        .filter(Idea.comment_count == 0)
+        .first()
+        is not None
+    )
+    if counters_missing or durations_missing or comments_missing:
+        rebuild(db)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    import app.models  # noqa: F401  (register every mapper)
+    from app.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Verify or rebuild the idea metrics rollups.")
+    parser.add_argument("--rebuild", action="store_true", help="overwrite rollups with recomputed values")
+    args = parser.parse_args()
+
+    with SessionLocal() as session:
+        found = rebuild(session) if args.rebuild else verify(session)
+
+    for item in found:
+        print(f"{item['rollup']} {item['key']}: expected {item['expected']}, found {item['actual']}")
+    print(f"{len(found)} drifted rollup row(s){' corrected' if args.rebuild and found else ''}")
+    raise SystemExit(1 if found and not args.rebuild else 0)
@@ -0,0 +1,195 @@
+"""In-memory BM25 inverted index over idea titles, descriptions and comments.
+
+The index is built from the database in a background thread at startup and
+kept current by the write routes, which call ``index_idea``/``remove_idea``/
+``index_comment`` after commit. Writes made by other worker processes are
+picked up by the periodic rebuild (``SEARCH_REBUILD_SECONDS``).
+"""
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+
+from app.config import settings
+from app.core.background_index import BackgroundIndexService
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in into is it its of on or "
+    "so that the their this to was we were will with".split()
+)
+# Title matches count more than body/comment matches (a simple BM25F weighting)
+FIELD_WEIGHTS = {"title": 3, "description": 1, "comments": 1}
+K1 = 1.2
+B = 0.75
+
+
+def tokenize(text: str | None) -> list[str]:
+    if not text:
+        return []
+    return [t for t in TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+class _Doc:
+    __slots__ = ("owner_id", "fields", "comment_ids", "terms", "length")
+
+    def __init__(self, owner_id: int) -> None:
+        self.owner_id = owner_id
+        self.fields: dict[str, Counter] = {name: Counter() for name in FIELD_WEIGHTS}
+        self.comment_ids: set[int] = set()
+        self.terms: Counter = Counter()
+        self.length = 0
+
+    def recompute(self) -> None:
+        terms: Counter = Counter()
+        for name, weight in FIELD_WEIGHTS.items():
+            for term, tf in self.fields[name].items():
+                terms[term] += tf * weight
+        self.terms = terms
+        self.length = sum(terms.values())
+
+
+class SearchIndex:
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._docs: dict[int, _Doc] = {}
+        self._postings: dict[str, dict[int, int]] = {}
+        self._total_length = 0
+        # Flat lookups used by the scoring loop
+        self._lengths: dict[int, int] = {}
+        self._by_owner: dict[int, set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def _unlink(self, doc_id: int, doc: _Doc) -> None:
+        for term in doc.terms:
+            posting = self._postings.get(term)
+            if posting is not None:
+                posting.pop(doc_id, None)
+                if not posting:
+                    del self._postings[term]
+        self._total_length -= doc.length
+        self._lengths.pop(doc_id, None)
+        owned = self._by_owner.get(doc.owner_id)
+        if owned is not None:
+            owned.discard(doc_id)
+            if not owned:
+                del self._by_owner[doc.owner_id]
+
+    def _link(self, doc_id: int, doc: _Doc) -> None:
+        doc.recompute()
+        for term, tf in doc.terms.items():
+            self._postings.setdefault(term, {})[doc_id] = tf
+        self._total_length += doc.length
+        self._lengths[doc_id] = doc.length
+        self._by_owner.setdefault(doc.owner_id, set()).add(doc_id)
+
+    def upsert_idea(self, idea_id: int, owner_id: int, title: str, description: str) -> None:
+        with self._lock:
+            doc = self._docs.get(idea_id)
+            if doc is None:
+                doc = self._docs[idea_id] = _Doc(owner_id)
+            else:
+                self._unlink(idea_id, doc)
+            doc.owner_id = owner_id
+            doc.fields["title"] = Counter(tokenize(title))
+            doc.fields["description"] = Counter(tokenize(description))
+            self._link(idea_id, doc)
+
+    def add_comment(self, idea_id: int, comment_id: int, text: str) -> None:
+        weight = FIELD_WEIGHTS["comments"]
+        with self._lock:
+            doc = self._docs.get(idea_id)
+            if doc is None or comment_id in doc.comment_ids:
+                return
+            doc.comment_ids.add(comment_id)
+            # Comments only ever add terms, so patch the postings in place
+            for term, tf in Counter(tokenize(text)).items():
+                doc.fields["comments"][term] += tf
+                doc.terms[term] += tf * weight
+                self._postings.setdefault(term, {})[idea_id] = doc.terms[term]
+                doc.length += tf * weight
+                self._total_length += tf * weight
+            self._lengths[idea_id] = doc.length
+
+    def remove_idea(self, idea_id: int) -> None:
+        with self._lock:
+            doc = self._docs.pop(idea_id, None)
+            if doc is not None:
+                self._unlink(idea_id, doc)
+
+    def search(
+        self,
+        query: str,
+        owner_id: int | None = None,
+        offset: int = 0,
+        limit: int = 20,
+    ) -> tuple[list[tuple[int, float]], int]:
+        """Return ((idea_id, score) for the requested page, total matches)."""
+        terms = set(tokenize(query))
+        if not terms:
+            return [], 0
+        with self._lock:
+            n = len(self._docs)
+            if n == 0:
+                return [], 0
+            k = K1 * (1 - B)
+            kb = K1 * B / (self._total_length / n)
+            lengths = self._lengths
+            owned = self._by_owner.get(owner_id, set()) if owner_id is not None else None
+            scores: dict[int, float] = {}
+            for term in terms:
+                posting = self._postings.get(term)
+                if not posting:
+                    continue
+                idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+                if owned is None:
+                    matches = posting.items()
+                elif len(owned) < len(posting):
+                    matches = [(d, posting[d]) for d in owned if d in posting]
+                else:
+                    matches = [(d, tf) for d, tf in posting.items() if d in owned]
+                for doc_id, tf in matches:
+                    score = idf * tf * (K1 + 1) / (tf + k + kb * lengths[doc_id])
+                    scores[doc_id] = scores.get(doc_id, 0.0) + score
+        top = heapq.nlargest(offset + limit, scores.items(), key=lambda item: (item[1], item[0]))
+        return top[offset:], len(scores)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"documents": len(self._docs), "terms": len(self._postings)}
+
+
+class SearchService(BackgroundIndexService):
+    name = "search-index"
+
+    def new_index(self) -> SearchIndex:
+        return SearchIndex()
+
+    def load(self, index: SearchIndex, db) -> None:
+        from app.models.comment import Comment
+        from app.models.idea import Idea
+
+        rows = db.query(Idea.id, Idea.user_id, Idea.title, Idea.description)
+        for row in rows.yield_per(1000):
+            index.upsert_idea(row.id, row.user_id, row.title, row.description)
+        comments = db.query(Comment.id, Comment.idea_id, Comment.comment_text)
+        for row in comments.yield_per(1000):
+            index.add_comment(row.idea_id, row.id, row.comment_text)
+
+    def index_idea(self, idea) -> None:
+        self.apply(("upsert_idea", idea.id, idea.user_id, idea.title, idea.description))
+
+    def remove_idea(self, idea_id: int) -> None:
+        self.apply(("remove_idea", idea_id))
+
+    def index_comment(self, comment) -> None:
+        self.apply(("add_comment", comment.idea_id, comment.id, comment.comment_text))
+
+    def search(self, query: str, owner_id: int | None, offset: int, limit: int):
+        return self.index.search(query, owner_id=owner_id, offset=offset, limit=limit)
+
+
+search_service = SearchService(rebuild_seconds=settings.search_rebuild_seconds)
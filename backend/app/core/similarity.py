@@ -0,0 +1,154 @@
+"""MinHash/LSH index for spotting near-duplicate ideas at submission time.
+
+Each idea's title and description are shingled into word unigrams and
+bigrams and reduced to a fixed-size MinHash signature. The signature is split
+into bands, and ideas sharing any band bucket become candidates, so a lookup
+touches only a handful of ideas instead of scanning all of them. Candidates
+are ranked by the estimated Jaccard similarity of their signatures.
+"""
+import threading
+import zlib
+
+import numpy as np
+
+from app.config import settings
+from app.core.background_index import BackgroundIndexService
+from app.core.search import tokenize
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+# Largest prime below 2**32 so signatures fit in uint32
+PRIME = np.uint64(4294967291)
+
+_rng = np.random.default_rng(20240611)
+_A = _rng.integers(1, 1 << 31, size=NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, 1 << 31, size=NUM_PERM, dtype=np.uint64)
+
+
+def shingles(title: str | None, description: str | None) -> set[str]:
+    tokens = tokenize(title) + tokenize(description)
+    grams = set(tokens)
+    grams.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    return grams
+
+
+def signature(title: str | None, description: str | None) -> np.ndarray | None:
+    grams = shingles(title, description)
+    if not grams:
+        return None
+    hashes = np.fromiter(
+        (zlib.crc32(g.encode()) for g in grams), dtype=np.uint64, count=len(grams)
+    )
+    # (a * h + b) mod p for every permutation/shingle pair, then min per permutation
+    permuted = (_A[:, None] * hashes[None, :] + _B[:, None]) % PRIME
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+class MinHashIndex:
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._signatures: dict[int, np.ndarray] = {}
+        self._buckets: list[dict[bytes, set[int]]] = [{} for _ in range(BANDS)]
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    @staticmethod
+    def _band_keys(sig: np.ndarray):
+        for band in range(BANDS):
+            yield band, sig[band * ROWS:(band + 1) * ROWS].tobytes()
+
+    def upsert_idea(self, idea_id: int, title: str | None, description: str | None) -> None:
+        sig = signature(title, description)
+        with self._lock:
+            self.remove_idea(idea_id)
+            if sig is None:
+                return
+            self._signatures[idea_id] = sig
+            for band, key in self._band_keys(sig):
+                self._buckets[band].setdefault(key, set()).add(idea_id)
+
+    def remove_idea(self, idea_id: int) -> None:
+        with self._lock:
+            sig = self._signatures.pop(idea_id, None)
+            if sig is None:
+                return
+            for band, key in self._band_keys(sig):
+                bucket = self._buckets[band].get(key)
+                if bucket is not None:
+                    bucket.discard(idea_id)
+                    if not bucket:
+                        del self._buckets[band][key]
+
+    def query(
+        self,
+        title: str | None,
+        description: str | None,
+        k: int = 5,
+        min_similarity: float = 0.0,
+        exclude_id: int | None = None,
+    ) -> list[tuple[int, float]]:
+        """Top-k (idea_id, estimated Jaccard similarity), most similar first."""
+        sig = signature(title, description)
+        if sig is None:
+            return []
+        candidates: set[int] = set()
+        with self._lock:
+            for band, key in self._band_keys(sig):
+                candidates.update(self._buckets[band].get(key, ()))
+            candidates.discard(exclude_id)
+            if not candidates:
+                return []
+            ids = list(candidates)
+            matrix = np.stack([self._signatures[i] for i in ids])
+        scores = (matrix == sig).mean(axis=1)
+        order = np.argsort(-scores, kind="stable")[:k]
+        return [(ids[i], float(scores[i])) for i in order if scores[i] >= min_similarity]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "documents": len(self._signatures),
+                "buckets": sum(len(b) for b in self._buckets),
+            }
+
+
+class SimilarityService(BackgroundIndexService):
+    name = "similarity-index"
+
+    def new_index(self) -> MinHashIndex:
+        return MinHashIndex()
+
+    def load(self, index: MinHashIndex, db) -> None:
+        from app.models.idea import Idea
+        from app.models.idea_archive import ArchivedIdea
+
+        # Archived ideas (app.core.archive) keep their ids, and new submissions should
+        # still be flagged as duplicates of long-decided ones
+        for model in (Idea, ArchivedIdea):
+            rows = db.query(model.id, model.title, model.description)
+            for row in rows.yield_per(1000):
+                index.upsert_idea(row.id, row.title, row.description)
+
+    def index_idea(self, idea) -> None:
+        self.apply(("upsert_idea", idea.id, idea.title, idea.description))
+
+    def remove_idea(self, idea_id: int) -> None:
+        self.apply(("remove_idea", idea_id))
+
+    def similar(
+        self, title: str, description: str, k: int, exclude_id: int | None = None
+    ) -> list[tuple[int, float]]:
+        if not self.ready:
+            return []
+        return self.index.query(
+            title,
+            description,
+            k=k,
+            min_similarity=settings.similarity_threshold,
+            exclude_id=exclude_id,
+        )
+
+
+similarity_service = SimilarityService(rebuild_seconds=settings.search_rebuild_seconds)
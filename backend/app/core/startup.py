@@ -0,0 +1,152 @@
+"""Worker readiness: pool warm-up off the request path and cold-start timing.
+
+The lifespan calls ``begin`` and then ``start_warm_up``. A background thread
+then checks that the schema is migrated to the latest revision, opens ``DB_POOL_WARMUP``
+connections per engine and loads the lazily imported hashing/JWT libraries.
+``/health/ready`` answers 503 until that has succeeded. While the database
+is unreachable or not yet bootstrapped, the thread retries with backoff and
+reports why.
+
+Each worker records its phases: ``import`` (first ``app`` import to lifespan
+start), ``startup`` (lifespan start-up) and ``warmup``, plus ``ready`` as the
+total. They are logged once, exported as the ``app_cold_start_seconds``
+gauge and included in the readiness payload.
+"""
+import logging
+import os
+import threading
+import time
+
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app import IMPORT_STARTED
+from app.config import settings
+from app.core.metrics import COLD_START_SECONDS
+
+logger = logging.getLogger(__name__)
+
+RETRY_SECONDS = (0.5, 1, 2, 5)
+
+
+class SchemaNotReady(SQLAlchemyError):
+    pass
+
+
+class WorkerStartup:
+    def __init__(self, started: float) -> None:
+        self.started = started
+        self.ready = False
+        self.reason = "starting"
+        self.attempts = 0
+        self.phases: dict[str, float] = {}
+        self._mark = started
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _phase(self, name: str) -> None:
+        now = time.perf_counter()
+        self.phases[name] = round(now - self._mark, 3)
+        self._mark = now
+
+    def begin(self) -> None:
+        self._phase("import")
+
+    def start_warm_up(self, engines, on_ready=()) -> None:
+        """Warm up in the background, then call each of `on_ready`."""
+        self._phase("startup")
+        self._thread = threading.Thread(
+            target=self._warm_up, args=(engines, on_ready), name="warm-up", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _warm_up(self, engines, on_ready) -> None:
+        while not self._stop.is_set():
+            self.attempts += 1
+            try:
+                for engine in engines:
+                    _check_schema(engine)
+                    _warm_pool(engine, settings.db_pool_warmup)
+                _preload_libraries()
+            except SQLAlchemyError as exc:
+                self.reason = _describe(exc)
+                delay = RETRY_SECONDS[min(self.attempts, len(RETRY_SECONDS)) - 1]
+                logger.warning("Not ready (%s); retrying in %ss", self.reason, delay)
+                self._stop.wait(delay)
+                continue
+            self._phase("warmup")
+            self.phases["ready"] = round(self._mark - self.started, 3)
+            for phase, seconds in self.phases.items():
+                COLD_START_SECONDS.labels(phase).set(seconds)
+            self.reason = None
+            self.ready = True
+            logger.info(
+                "Worker %d ready in %.2fs (%s)",
+                os.getpid(),
+                self.phases["ready"],
+                ", ".join(f"{k} {v:.2f}s" for k, v in self.phases.items() if k != "ready"),
+            )
+            for callback in on_ready:
+                callback()
+            return
+
+    def status(self) -> dict:
+        return {
+            "ready": self.ready,
+            "reason": self.reason,
+            "pid": os.getpid(),
+            "attempts": self.attempts,
+            "cold_start_seconds": dict(self.phases),
+        }
+
+
+def _check_schema(engine) -> None:
+    from app.bootstrap import head_revision
+
+    with engine.connect() as conn:
+        if not inspect(conn).has_table("alembic_version"):
+            raise SchemaNotReady("schema missing; run python -m app.bootstrap")
+        current = conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+        if current != head_revision():
+            raise SchemaNotReady(
+                f"schema at revision {current}, expected {head_revision()}; run python -m app.bootstrap"
+            )
+        if conn.execute(text("SELECT COUNT(*) FROM roles")).scalar() == 0:
+            raise SchemaNotReady("roles not seeded; run python -m app.bootstrap")
+
+
+def _warm_pool(engine, count: int) -> None:
+    # Hold the connections together so the pool really opens `count` of them
+    size = getattr(engine.pool, "size", None)
+    count = min(count, size()) if callable(size) else 1
+    connections = []
+    try:
+        for _ in range(max(1, count)):
+            conn = engine.connect()
+            connections.append(conn)
+            conn.execute(text("SELECT 1"))
+    finally:
+        for conn in connections:
+            conn.close()
+
+
+def _preload_libraries() -> None:
+    # Imported lazily to keep start-up short; load them before the first login
+    from jose import jwt  # noqa: F401
+
+    from app.core.security import _pwd_context
+
+    _pwd_context()
+
+
+def _describe(exc: SQLAlchemyError) -> str:
+    if isinstance(exc, SchemaNotReady):
+        return str(exc)
+    message = str(getattr(exc, "orig", None) or exc).splitlines()[0]
+    return f"database not ready: {message[:200]}"
+
+
+worker_startup = WorkerStartup(IMPORT_STARTED)
@@ -1,11 +1,26 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
 
+from app import bootstrap
+from app.routers import attachments
 from app.routers import auth
 from app.routers import ideas
 from app.routers import comments
-from app.database import engine, Base
+from app.routers import health
+from app.routers import events
+from app.routers import metrics
+from app.config import settings
+from app.core.admission import AdmissionMiddleware, admission
+from app.core.hashing import password_hasher
+from app.core.jobs import job_worker
+from app.core.metrics import MetricsMiddleware, instrument_pool
+from app.core.search import search_service
+from app.core.similarity import similarity_service
+from app.core.startup import worker_startup
+from app.database import engine, replica_engine, SessionLocal
 
 # Import ALL models so SQLAlchemy knows them
 from app.models.role import Role
@@ -14,25 +29,51 @@ from app.models.idea import Idea
 from app.models.comment import Comment
 from app.models.attachment import Attachment
 from app.models.idea_status_history import IdeaStatusHistory
+from app.models.idea_rollup import (
+	IdeaCycleTimeBucket,
+	IdeaDailyCount,
+	IdeaOwnerStatusCount,
+	IdeaStatusCount,
+)
+from app.models.cache_version import CacheVersion
+from app.models.job import Job
+from app.models.idea_archive import ArchivedIdea, ArchivedStatusHistory
 
 
-def seed_roles() -> None:
-	"""Ensure default roles exist so registration with role_id 1/2 works.
-
-	id=1 → team_member
-	id=2 → team_lead
-	"""
-	with Session(engine) as session:
-		if not session.query(Role).filter(Role.id == 1).first():
-			session.add(Role(id=1, role_name="team_member", description="Regular team member"))
-
-		if not session.query(Role).filter(Role.id == 2).first():
-			session.add(Role(id=2, role_name="team_lead", description="Team lead with approval rights"))
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+	"""Per-worker start-up; schema and seed data come from `python -m app.bootstrap`."""
+	worker_startup.begin()
+	if settings.db_auto_init:
+		await run_in_threadpool(bootstrap.run)
+	# /health/ready reports ready once the pool is warm; the in-memory indexes
+	# are then built in the background without delaying the first requests
+	engines = [engine] if replica_engine is None else [engine, replica_engine]
+	worker_startup.start_warm_up(
+		engines,
+		on_ready=[
+			lambda: search_service.start_background_build(SessionLocal),
+			lambda: similarity_service.start_background_build(SessionLocal),
+		],
+	)
+	if settings.jobs_in_app:
+		job_worker.start()
+	yield
+	await job_worker.stop()
+	worker_startup.stop()
+	password_hasher.shutdown()
+	for eng in engines:
+		eng.dispose()
 
-		session.commit()
 
+app = FastAPI(lifespan=lifespan)
 
-app = FastAPI()
+# Innermost, so CORS headers reach refused requests and metrics count them
+if settings.admission_enabled:
+	app.add_middleware(AdmissionMiddleware)
+	admission.monitor.watch_pool(engine)
+	if replica_engine is not None:
+		admission.monitor.watch_pool(replica_engine)
 
 # Allow frontend running on localhost to call this API
 app.add_middleware(
@@ -44,11 +85,26 @@ app.add_middleware(
 	allow_headers=["*"],
 )
 
-# Create all tables and seed base data
-Base.metadata.create_all(bind=engine)
-seed_roles()
+# ASYNC_DB=1 serves the same routes through AsyncSession for side-by-side comparison
+if settings.async_db:
+	from app.routers import attachments_async, auth_async, comments_async, ideas_async
+
+	app.include_router(auth_async.router)
+	app.include_router(ideas_async.router)
+	app.include_router(comments_async.router)
+	app.include_router(attachments_async.router)
+else:
+	app.include_router(auth.router)
+	app.include_router(ideas.router)
+	app.include_router(comments.router)
+	app.include_router(attachments.router)
+app.include_router(events.router)
+app.include_router(health.router)
 
-app.include_router(auth.router)
-app.include_router(ideas.router)
-app.include_router(comments.router)
+if settings.metrics_enabled:
+	app.add_middleware(MetricsMiddleware)
+	app.include_router(metrics.router)
+	instrument_pool(engine, "primary")
+	if replica_engine is not None:
+		instrument_pool(replica_engine, "replica")
 
@@ -4,3 +4,12 @@ from app.models.idea import Idea
 from app.models.comment import Comment
 from app.models.attachment import Attachment
 from app.models.idea_status_history import IdeaStatusHistory
+from app.models.idea_rollup import (
+    IdeaCycleTimeBucket,
+    IdeaDailyCount,
+    IdeaOwnerStatusCount,
+    IdeaStatusCount,
+)
+from app.models.cache_version import CacheVersion
+from app.models.job import Job
+from app.models.idea_archive import ArchivedIdea, ArchivedStatusHistory
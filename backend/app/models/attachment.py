@@ -1,12 +1,25 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import BigInteger, Column, Index, Integer, String, ForeignKey, DateTime
+from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
 
 class Attachment(Base):
     __tablename__ = "attachments"
+    # Listing and per-idea quota by idea; orphan checks by digest
+    __table_args__ = (
+        Index("ix_attachments_idea_id_uploaded_at", "idea_id", "uploaded_at"),
+        Index("ix_attachments_sha256", "sha256"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     idea_id = Column(Integer, ForeignKey("ideas.id"), nullable=False)
     file_name = Column(String(255), nullable=False)
+    # Blob key in the attachment store; identical uploads share one blob
     file_path = Column(String(255), nullable=False)
+    sha256 = Column(String(64), nullable=False)
+    size = Column(BigInteger, nullable=False)
+    content_type = Column(String(100), nullable=False)
+    uploaded_by = Column(Integer, ForeignKey("users.id"), nullable=False)
     uploaded_at = Column(DateTime, default=datetime.utcnow)
+
+    idea = relationship("Idea", back_populates="attachments")
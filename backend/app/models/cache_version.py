@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, String
+from app.database import Base
+
+
+class CacheVersion(Base):
+    """Write counter per response scope, bumped in the same transaction as the write."""
+
+    __tablename__ = "cache_versions"
+
+    scope = Column(String(100), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
@@ -1,10 +1,11 @@
-from sqlalchemy import Column, Integer, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Index, Integer, Text, ForeignKey, DateTime
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
 
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (Index("ix_comments_idea_id_created_at", "idea_id", "created_at"),)
 
     id = Column(Integer, primary_key=True, index=True)
     comment_text = Column(Text, nullable=False)
@@ -1,20 +1,43 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Enum, Index, Integer, String, Text, ForeignKey, DateTime
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
 
+IDEA_STATUSES = ("Submitted", "In Review", "Approved", "Rejected")
+COMMENT_PREVIEW_LENGTH = 200
+
+
 class Idea(Base):
     __tablename__ = "ideas"
+    # List routes page newest first by (created_at, id), optionally per owner or status
+    __table_args__ = (
+        Index("ix_ideas_created_at_id", "created_at", "id"),
+        Index("ix_ideas_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_ideas_status_created_at_id", "status", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=False)
-    status = Column(String(20), default="Submitted")
+    # ENUM on MySQL/PostgreSQL, a short VARCHAR elsewhere
+    status = Column(
+        Enum(*IDEA_STATUSES, name="idea_status", validate_strings=True),
+        nullable=False,
+        default="Submitted",
+    )
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Comment summary for list views, kept current by rollups.record_comment;
+    # the latest comment is the one added last (highest id)
+    comment_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_comment_id = Column(Integer)
+    last_comment_at = Column(DateTime)
+    last_comment_by = Column(Integer)
+    last_comment_preview = Column(String(COMMENT_PREVIEW_LENGTH))
 
     user = relationship("User", back_populates="ideas")
     comments = relationship("Comment", back_populates="idea", cascade="all, delete-orphan")
+    attachments = relationship("Attachment", back_populates="idea", cascade="all, delete-orphan")
     status_history = relationship(
         "IdeaStatusHistory",
         back_populates="idea",
@@ -0,0 +1,50 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, LargeBinary, String, Text
+from sqlalchemy.dialects.mysql import LONGBLOB
+from datetime import datetime
+from app.database import Base
+from app.models.idea import COMMENT_PREVIEW_LENGTH
+
+
+class ArchivedIdea(Base):
+    """A finalized idea moved out of ``ideas`` by app.core.archive; keeps its id."""
+
+    __tablename__ = "archived_ideas"
+    # Same keyset indexes as ideas, for the export and the forecast
+    __table_args__ = (
+        Index("ix_archived_ideas_created_at_id", "created_at", "id"),
+        Index("ix_archived_ideas_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_archived_ideas_status_created_at_id", "status", "created_at", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    title = Column(String(255), nullable=False)
+    description = Column(Text, nullable=False)
+    status = Column(String(20), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime)
+    comment_count = Column(Integer, nullable=False, default=0)
+    last_comment_id = Column(Integer)
+    last_comment_at = Column(DateTime)
+    last_comment_by = Column(Integer)
+    last_comment_preview = Column(String(COMMENT_PREVIEW_LENGTH))
+    # Last status change, the one the archive age is measured from
+    decided_at = Column(DateTime, nullable=False)
+    archived_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    # The comments, oldest first, as one zlib-compressed JSON array; only ever read whole
+    comments = Column(LargeBinary().with_variant(LONGBLOB(), "mysql"), nullable=False)
+
+
+class ArchivedStatusHistory(Base):
+    """Status history of archived ideas, kept as rows so rollups can replay it in SQL."""
+
+    __tablename__ = "archived_idea_status_history"
+    __table_args__ = (
+        Index("ix_archived_idea_status_history_idea_id_changed_at", "idea_id", "changed_at"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    idea_id = Column(Integer, nullable=False)
+    old_status = Column(String(20))
+    new_status = Column(String(20))
+    changed_by = Column(Integer, nullable=False)
+    changed_at = Column(DateTime)
@@ -0,0 +1,44 @@
+from sqlalchemy import BigInteger, Column, Integer, String, ForeignKey, Date
+from app.database import Base
+
+
+class IdeaStatusCount(Base):
+    __tablename__ = "idea_status_counts"
+
+    status = Column(String(20), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class IdeaDailyCount(Base):
+    __tablename__ = "idea_daily_counts"
+
+    day = Column(Date, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class IdeaOwnerStatusCount(Base):
+    __tablename__ = "idea_owner_status_counts"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    status = Column(String(20), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class IdeaCycleTimeBucket(Base):
+    """Histogram of status dwell and end-to-end cycle times per week, owner and status.
+
+    ``kind`` is "dwell" (time spent in ``status`` before leaving it) or "cycle"
+    (creation to the first final decision ``status``); ``bucket`` indexes
+    ``app.core.rollups.DURATION_BUCKETS``. ``week`` is the Monday of the week
+    the transition happened.
+    """
+
+    __tablename__ = "idea_cycle_time_buckets"
+
+    week = Column(Date, primary_key=True)
+    kind = Column(String(10), primary_key=True)
+    status = Column(String(20), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    bucket = Column(Integer, primary_key=True, autoincrement=False)
+    count = Column(Integer, nullable=False, default=0)
+    seconds = Column(BigInteger, nullable=False, default=0)
@@ -1,10 +1,11 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Index, Integer, String, ForeignKey, DateTime
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
 
 class IdeaStatusHistory(Base):
     __tablename__ = "idea_status_history"
+    __table_args__ = (Index("ix_idea_status_history_idea_id_changed_at", "idea_id", "changed_at"),)
 
     id = Column(Integer, primary_key=True, index=True)
     idea_id = Column(Integer, ForeignKey("ideas.id"), nullable=False)
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text
+from datetime import datetime
+from app.database import Base
+
+JOB_STATUSES = ("queued", "running", "done", "failed")
+
+
+class Job(Base):
+    """Durable background job; see app.core.jobs."""
+
+    __tablename__ = "jobs"
+    # Workers claim due jobs by (status, run_at); done jobs are purged by the same index
+    __table_args__ = (Index("ix_jobs_status_run_at_id", "status", "run_at", "id"),)
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(64), nullable=False)
+    # JSON object passed to the handler
+    payload = Column(Text, nullable=False)
+    # At most one queued, running or retained done job per key; enqueueing the same key
+    # again is a no-op. A job that fails for good releases its key
+    dedupe_key = Column(String(191), unique=True)
+    status = Column(String(10), nullable=False, default="queued")
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    # When the job is next due (first run or retry); for done jobs, when it last ran
+    run_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    # Lease of the worker running it; an expired lease puts the job back in the queue
+    locked_by = Column(String(100))
+    locked_until = Column(DateTime)
+    finished_at = Column(DateTime)
+    last_error = Column(Text)
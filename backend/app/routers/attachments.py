@@ -0,0 +1,118 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, Response
+from sqlalchemy.orm import Session
+
+from app.core.attachments import (
+    ATTACHMENT_COLUMNS,
+    attachment_store,
+    enqueue_orphan_cleanup,
+    idea_for_read,
+    idea_for_write,
+    serialize_attachment,
+    upload_attachment,
+)
+from app.core.deps import get_current_user
+from app.core.http_cache import attachments_scope, cached_json, etag_matches, touch
+from app.database import get_db, get_read_db
+from app.models.attachment import Attachment
+
+router = APIRouter(prefix="/ideas", tags=["Attachments"])
+
+# A blob never changes once stored, and the digest is its ETag
+DOWNLOAD_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+
+# Raw request body, e.g. fetch(url, {method: "POST", body: file, headers: {"Content-Type": file.type}})
+@router.post("/{idea_id}/attachments", status_code=status.HTTP_201_CREATED)
+async def upload(
+    request: Request,
+    idea_id: int,
+    filename: str = Query(..., min_length=1, max_length=255),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    return await upload_attachment(
+        request, idea_id, filename, current_user, lambda fn: run_in_threadpool(fn, db)
+    )
+
+
+@router.get("/{idea_id}/attachments")
+def list_attachments(
+    request: Request,
+    idea_id: int,
+    db: Session = Depends(get_read_db),
+    current_user=Depends(get_current_user),
+):
+    idea_for_read(db, idea_id, current_user)
+
+    def build():
+        rows = (
+            db.query(*ATTACHMENT_COLUMNS)
+            .filter(Attachment.idea_id == idea_id)
+            .order_by(Attachment.uploaded_at.asc(), Attachment.id.asc())
+        )
+        return [serialize_attachment(row) for row in rows]
+
+    return cached_json(request, db, [attachments_scope(idea_id)], build)
+
+
+@router.get("/{idea_id}/attachments/{attachment_id}")
+def download(
+    request: Request,
+    idea_id: int,
+    attachment_id: int,
+    db: Session = Depends(get_read_db),
+    current_user=Depends(get_current_user),
+):
+    idea_for_read(db, idea_id, current_user)
+    row = (
+        db.query(Attachment.sha256, Attachment.file_name, Attachment.content_type)
+        .filter(Attachment.id == attachment_id, Attachment.idea_id == idea_id)
+        .first()
+    )
+    # Release the pooled connection before the file streams out
+    db.rollback()
+    if not row:
+        raise HTTPException(status_code=404, detail="Attachment not found")
+
+    etag = f'"{row.sha256}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": DOWNLOAD_CACHE_CONTROL,
+        "X-Content-Type-Options": "nosniff",
+    }
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    path = attachment_store.path(row.sha256)
+    if not path.is_file():
+        raise HTTPException(status_code=404, detail="Attachment content is missing")
+    # Handles Range/If-Range, and hands the file to the server (http.response.pathsend) when supported
+    return FileResponse(path, media_type=row.content_type, filename=row.file_name, headers=headers)
+
+
+@router.delete("/{idea_id}/attachments/{attachment_id}")
+def delete_attachment(
+    idea_id: int,
+    attachment_id: int,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    idea = idea_for_write(db, idea_id, current_user)
+    attachment = (
+        db.query(Attachment)
+        .filter(Attachment.id == attachment_id, Attachment.idea_id == idea_id)
+        .first()
+    )
+    if not attachment:
+        raise HTTPException(status_code=404, detail="Attachment not found")
+    # The idea's owner or whoever uploaded it
+    if current_user.id not in {idea.user_id, attachment.uploaded_by}:
+        raise HTTPException(status_code=403, detail="Not allowed")
+
+    digest = attachment.sha256
+    db.delete(attachment)
+    touch(db, attachments_scope(idea_id))
+    enqueue_orphan_cleanup(db, [digest])
+    db.commit()
+    return {"message": "Attachment deleted successfully"}
@@ -0,0 +1,62 @@
+"""AsyncSession variant of app.routers.attachments, mounted when ASYNC_DB is enabled."""
+from fastapi import APIRouter, Depends, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.attachments import upload_attachment
+from app.core.deps import get_current_user_async
+from app.database import get_async_db, get_async_read_db
+from app.routers import attachments
+
+router = APIRouter(prefix="/ideas", tags=["Attachments"])
+
+
+@router.post("/{idea_id}/attachments", status_code=status.HTTP_201_CREATED)
+async def upload(
+    request: Request,
+    idea_id: int,
+    filename: str = Query(..., min_length=1, max_length=255),
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user_async),
+):
+    return await upload_attachment(request, idea_id, filename, current_user, db.run_sync)
+
+
+@router.get("/{idea_id}/attachments")
+async def list_attachments(
+    request: Request,
+    idea_id: int,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user=Depends(get_current_user_async),
+):
+    return await db.run_sync(
+        lambda s: attachments.list_attachments(request, idea_id, db=s, current_user=current_user)
+    )
+
+
+@router.get("/{idea_id}/attachments/{attachment_id}")
+async def download(
+    request: Request,
+    idea_id: int,
+    attachment_id: int,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user=Depends(get_current_user_async),
+):
+    return await db.run_sync(
+        lambda s: attachments.download(
+            request, idea_id, attachment_id, db=s, current_user=current_user
+        )
+    )
+
+
+@router.delete("/{idea_id}/attachments/{attachment_id}")
+async def delete_attachment(
+    idea_id: int,
+    attachment_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user_async),
+):
+    return await db.run_sync(
+        lambda s: attachments.delete_attachment(
+            idea_id, attachment_id, db=s, current_user=current_user
+        )
+    )
@@ -1,8 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_current_user
-from app.core.security import create_access_token, get_password_hash, verify_password
+from app.core.principal_cache import Principal, principal_cache
+from app.core.hashing import hash_or_503
+from app.core.security import create_access_token, get_password_hash, verify_and_update_password
 from app.database import get_db
 from app.models.role import Role
 from app.models.user import User
@@ -30,15 +33,14 @@ def _resolve_role_id(db: Session, user_data: RegisterRequest) -> int:
     return role.id
 
 
-@router.post("/register", status_code=status.HTTP_201_CREATED)
-def register(user_data: RegisterRequest, db: Session = Depends(get_db)):
+def _new_user_role_id(db: Session, user_data: RegisterRequest) -> int:
     existing_user = db.query(User).filter(User.email == user_data.email).first()
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
+    return _resolve_role_id(db, user_data)
 
-    role_id = _resolve_role_id(db, user_data)
-    hashed_password = get_password_hash(user_data.password)
 
+def _add_user(db: Session, user_data: RegisterRequest, role_id: int, hashed_password: str) -> dict:
     user = User(
         name=user_data.name,
         email=user_data.email,
@@ -54,16 +56,32 @@ def register(user_data: RegisterRequest, db: Session = Depends(get_db)):
     return {"message": "User registered successfully", "user_id": user.id}
 
 
-@router.post("/login", response_model=TokenResponse)
-def login(data: LoginRequest, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == data.email).first()
-    if not user or not verify_password(data.password, user.password):
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password")
+# Login and register are async so the database steps take a threadpool thread
+# only while they run, not while the hash waits its turn on the pool
+@router.post("/register", status_code=status.HTTP_201_CREATED)
+async def register(user_data: RegisterRequest, db: Session = Depends(get_db)):
+    role_id = await run_in_threadpool(_new_user_role_id, db, user_data)
+    hashed_password = await hash_or_503(get_password_hash, user_data.password)
+    return await run_in_threadpool(_add_user, db, user_data, role_id, hashed_password)
+
+
+def _find_user(db: Session, email: str) -> User | None:
+    return db.query(User).filter(User.email == email).first()
+
+
+def _issue_token(db: Session, user: User, new_hash: str | None) -> dict:
+    if new_hash:
+        # Cost factor changed since this hash was made; upgrade it transparently
+        user.password = new_hash
+        db.commit()
 
     role = db.query(Role).filter(Role.id == user.role_id).first()
     role_name = role.role_name if role else ""
 
-    access_token = create_access_token(data={"user_id": user.id})
+    principal_cache.put(Principal.from_user(user, role_name or None))
+    access_token = create_access_token(
+        data={"user_id": user.id, "role_id": user.role_id, "role": role_name}
+    )
     return {
         "access_token": access_token,
         "token_type": "bearer",
@@ -76,12 +94,22 @@ def login(data: LoginRequest, db: Session = Depends(get_db)):
     }
 
 
+@router.post("/login", response_model=TokenResponse)
+async def login(data: LoginRequest, db: Session = Depends(get_db)):
+    user = await run_in_threadpool(_find_user, db, data.email)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password")
+    verified, new_hash = await hash_or_503(verify_and_update_password, data.password, user.password)
+    if not verified:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password")
+    return await run_in_threadpool(_issue_token, db, user, new_hash)
+
+
 @router.get("/me")
-def me(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    role = db.query(Role).filter(Role.id == current_user.role_id).first()
+def me(current_user: Principal = Depends(get_current_user)):
     return {
         "id": current_user.id,
         "name": current_user.name,
         "email": current_user.email,
-        "role": role.role_name if role else "",
+        "role": current_user.role_name or "",
     }
@@ -0,0 +1,104 @@
+"""AsyncSession variant of app.routers.auth, mounted when ASYNC_DB is enabled.
+
+Password hashing is CPU-bound, so it runs on the bounded pool in
+app.core.hashing rather than on the event loop.
+"""
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.deps import get_current_user_async
+from app.core.principal_cache import Principal, principal_cache
+from app.core.hashing import hash_or_503
+from app.core.security import create_access_token, get_password_hash, verify_and_update_password
+from app.database import get_async_db
+from app.models.role import Role
+from app.models.user import User
+from app.schemas.auth import RegisterRequest, TokenResponse
+from app.schemas.auth import LoginRequest
+
+
+router = APIRouter(prefix="/auth", tags=["Auth"])
+
+
+async def _resolve_role_id(db: AsyncSession, user_data: RegisterRequest) -> int:
+    if user_data.role_id is not None:
+        role = await db.get(Role, user_data.role_id)
+        if not role:
+            raise HTTPException(status_code=400, detail="Invalid role_id")
+        return role.id
+
+    role_name = (user_data.role or "").strip()
+    if not role_name:
+        raise HTTPException(status_code=400, detail="role or role_id is required")
+
+    role = await db.scalar(select(Role).where(Role.role_name == role_name))
+    if not role:
+        raise HTTPException(status_code=400, detail="Invalid role")
+    return role.id
+
+
+@router.post("/register", status_code=status.HTTP_201_CREATED)
+async def register(user_data: RegisterRequest, db: AsyncSession = Depends(get_async_db)):
+    existing_user = await db.scalar(select(User).where(User.email == user_data.email))
+    if existing_user:
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    role_id = await _resolve_role_id(db, user_data)
+    hashed_password = await hash_or_503(get_password_hash, user_data.password)
+
+    user = User(
+        name=user_data.name,
+        email=user_data.email,
+        password=hashed_password,
+        role_id=role_id,
+        designation=user_data.designation,
+    )
+
+    db.add(user)
+    await db.commit()
+    await db.refresh(user)
+
+    return {"message": "User registered successfully", "user_id": user.id}
+
+
+@router.post("/login", response_model=TokenResponse)
+async def login(data: LoginRequest, db: AsyncSession = Depends(get_async_db)):
+    user = await db.scalar(select(User).where(User.email == data.email))
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password")
+    verified, new_hash = await hash_or_503(verify_and_update_password, data.password, user.password)
+    if not verified:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password")
+    if new_hash:
+        # Cost factor changed since this hash was made; upgrade it transparently
+        user.password = new_hash
+        await db.commit()
+
+    role = await db.get(Role, user.role_id)
+    role_name = role.role_name if role else ""
+
+    principal_cache.put(Principal.from_user(user, role_name or None))
+    access_token = create_access_token(
+        data={"user_id": user.id, "role_id": user.role_id, "role": role_name}
+    )
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "user": {
+            "id": user.id,
+            "name": user.name,
+            "email": user.email,
+            "role": role_name,
+        },
+    }
+
+
+@router.get("/me")
+async def me(current_user: Principal = Depends(get_current_user_async)):
+    return {
+        "id": current_user.id,
+        "name": current_user.name,
+        "email": current_user.email,
+        "role": current_user.role_name or "",
+    }
@@ -1,18 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.orm import Session
 
+from app.core import rollups
 from app.core.deps import get_current_user
-from app.database import get_db
+from app.core.events import comment_event, event_broker
+from app.core.http_cache import cached_json, comments_scope, touch_idea
+from app.core.pagination import encode_cursor, keyset_after
+from app.core.search import search_service
+from app.database import get_db, get_read_db
 from app.models.comment import Comment
 from app.models.idea import Idea
-from app.schemas.comment import CommentCreate, CommentResponse
+from app.schemas.comment import CommentCreate, CommentPage, CommentResponse
 
 router = APIRouter(prefix="/comments", tags=["Comments"])
 
-@router.get("/idea/{idea_id}", response_model=list[CommentResponse])
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+@router.get("/idea/{idea_id}", response_model=CommentPage)
 def list_comments_for_idea(
+	request: Request,
 	idea_id: int,
-	db: Session = Depends(get_db),
+	cursor: str | None = None,
+	limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+	db: Session = Depends(get_read_db),
 	current_user=Depends(get_current_user),
 ):
 	idea = db.query(Idea).filter(Idea.id == idea_id).first()
@@ -20,14 +31,22 @@ def list_comments_for_idea(
 		raise HTTPException(status_code=404, detail="Idea not found")
 
 	# Allow only owner or team lead to view comments
-	if idea.user_id != current_user.id:
-		from app.models.role import Role
+	if idea.user_id != current_user.id and current_user.role_name != "team_lead":
+		raise HTTPException(status_code=403, detail="Not allowed")
 
-		role = db.query(Role).filter(Role.id == current_user.role_id).first()
-		if not role or role.role_name != "team_lead":
-			raise HTTPException(status_code=403, detail="Not allowed")
+	def build():
+		# Oldest first, one keyset page at a time
+		query = db.query(
+			Comment.id, Comment.comment_text, Comment.idea_id, Comment.commented_by, Comment.created_at
+		).filter(Comment.idea_id == idea_id)
+		if cursor:
+			query = query.filter(keyset_after(Comment.created_at, Comment.id, cursor))
+		rows = query.order_by(Comment.created_at.asc(), Comment.id.asc()).limit(limit + 1).all()
+		page = rows[:limit]
+		next_cursor = encode_cursor(page[-1].created_at, page[-1].id) if len(rows) > limit else None
+		return {"items": [dict(row._mapping) for row in page], "next_cursor": next_cursor}
 
-	return db.query(Comment).filter(Comment.idea_id == idea_id).order_by(Comment.created_at.asc()).all()
+	return cached_json(request, db, [comments_scope(idea_id)], build)
 
 @router.post("/idea/{idea_id}", response_model=CommentResponse, status_code=status.HTTP_201_CREATED)
 def add_comment_to_idea(
@@ -41,12 +60,8 @@ def add_comment_to_idea(
 		raise HTTPException(status_code=404, detail="Idea not found")
 
 	# Allow owner or team lead to comment
-	if idea.user_id != current_user.id:
-		from app.models.role import Role
-
-		role = db.query(Role).filter(Role.id == current_user.role_id).first()
-		if not role or role.role_name != "team_lead":
-			raise HTTPException(status_code=403, detail="Not allowed")
+	if idea.user_id != current_user.id and current_user.role_name != "team_lead":
+		raise HTTPException(status_code=403, detail="Not allowed")
 
 	comment = Comment(
 		idea_id=idea_id,
@@ -54,6 +69,11 @@ def add_comment_to_idea(
 		commented_by=current_user.id,
 	)
 	db.add(comment)
+	db.flush()
+	rollups.record_comment(db, comment)
+	touch_idea(db, idea.user_id, idea_id)
 	db.commit()
 	db.refresh(comment)
+	search_service.index_comment(comment)
+	event_broker.publish("comment.created", idea.user_id, comment_event(comment))
 	return comment
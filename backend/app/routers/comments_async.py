@@ -0,0 +1,36 @@
+"""AsyncSession variant of app.routers.comments, mounted when ASYNC_DB is enabled."""
+from fastapi import APIRouter, Depends, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.deps import get_current_user_async
+from app.database import get_async_db, get_async_read_db
+from app.routers import comments
+from app.schemas.comment import CommentCreate, CommentPage, CommentResponse
+
+router = APIRouter(prefix="/comments", tags=["Comments"])
+
+@router.get("/idea/{idea_id}", response_model=CommentPage)
+async def list_comments_for_idea(
+	request: Request,
+	idea_id: int,
+	cursor: str | None = None,
+	limit: int = Query(comments.DEFAULT_PAGE_SIZE, ge=1, le=comments.MAX_PAGE_SIZE),
+	db: AsyncSession = Depends(get_async_read_db),
+	current_user=Depends(get_current_user_async),
+):
+	return await db.run_sync(
+		lambda s: comments.list_comments_for_idea(
+			request, idea_id, cursor=cursor, limit=limit, db=s, current_user=current_user
+		)
+	)
+
+@router.post("/idea/{idea_id}", response_model=CommentResponse, status_code=status.HTTP_201_CREATED)
+async def add_comment_to_idea(
+	idea_id: int,
+	payload: CommentCreate,
+	db: AsyncSession = Depends(get_async_db),
+	current_user=Depends(get_current_user_async),
+):
+	return await db.run_sync(
+		lambda s: comments.add_comment_to_idea(idea_id, payload, db=s, current_user=current_user)
+	)
@@ -0,0 +1,68 @@
+"""Server-sent events: idea status changes and new comments, filtered per user.
+
+Browsers' ``EventSource`` cannot set headers, so the token may also be passed
+as ``?access_token=``. Reconnecting clients send ``Last-Event-ID`` (or
+``?last_event_id=``) and receive what they missed from the broker's buffer;
+if the gap is older than the buffer a ``reset`` event tells them to refetch.
+"""
+from fastapi import APIRouter, Depends, Header, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from fastapi.security import OAuth2PasswordBearer
+
+from app.config import settings
+from app.core.deps import principal_for_token
+from app.core.events import event_broker, format_sse
+
+router = APIRouter(tags=["Events"])
+
+optional_oauth2 = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
+
+
+@router.get("/events")
+async def stream_events(
+    request: Request,
+    access_token: str | None = Query(None),
+    last_event_id: int | None = Query(None),
+    last_event_header: str | None = Header(None, alias="Last-Event-ID"),
+    token: str | None = Depends(optional_oauth2),
+):
+    principal = await run_in_threadpool(principal_for_token, token or access_token)
+    if last_event_header and last_event_header.strip().isdigit():
+        last_event_id = int(last_event_header)
+
+    subscription = event_broker.subscribe(principal.id, principal.role_name == "team_lead")
+
+    async def stream():
+        # Ids up to the replay's high-water mark were sent from the buffer; skip them if
+        # also queued. Everything above it is sent as it arrives
+        replayed = 0
+        try:
+            # Suggest a reconnect delay; flushes headers to the client straight away
+            yield b"retry: 3000\n\n"
+            if last_event_id is not None:
+                missed, lost, replayed = event_broker.replay(subscription, last_event_id)
+                if lost:
+                    yield b"event: reset\ndata: {}\n\n"
+                for event in missed:
+                    yield format_sse(event)
+            while not await request.is_disconnected():
+                batch = await subscription.next_batch(settings.events_heartbeat_seconds)
+                if subscription.dropped:
+                    # Too far behind: close so the client reconnects and resumes
+                    yield b"event: dropped\ndata: {}\n\n"
+                    break
+                if not batch:
+                    yield b": ping\n\n"
+                    continue
+                for event in batch:
+                    if event.id > replayed:
+                        yield format_sse(event)
+        finally:
+            event_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
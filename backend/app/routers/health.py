@@ -0,0 +1,73 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+
+from app.core.admission import admission
+from app.core.deps import require_team_lead
+from app.core.events import event_broker
+from app.core.hashing import password_hasher
+from app.core.http_cache import response_cache
+from app.core.jobs import job_worker
+from app.core.principal_cache import principal_cache
+from app.core.search import search_service
+from app.core.similarity import similarity_service
+from app.core.startup import worker_startup
+from app.database import pool_stats
+
+router = APIRouter(prefix="/health", tags=["Health"])
+# Internals (pool, cache, queue and limiter state) are for team leads; the probes stay open
+details = APIRouter(dependencies=[Depends(require_team_lead)])
+
+
+@router.get("")
+@router.get("/live")
+def liveness():
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+def readiness():
+    # 503 until the schema is bootstrapped and this worker's pool is warm
+    payload = worker_startup.status()
+    return JSONResponse(payload, status_code=200 if payload["ready"] else 503)
+
+
+@details.get("/db")
+def database_health():
+    # Per-engine pool usage and replica status (replica routing falls back to the primary)
+    return pool_stats()
+
+
+@details.get("/caches")
+def cache_stats():
+    return {
+        "principal": principal_cache.stats(),
+        "search": search_service.stats(),
+        "similarity": similarity_service.stats(),
+        "responses": response_cache.stats(),
+    }
+
+
+@details.get("/events")
+def event_stats():
+    return event_broker.stats()
+
+
+@details.get("/hashing")
+def hashing_stats():
+    # Time spent waiting for a bcrypt worker versus hashing, plus admission rejections
+    return password_hasher.stats()
+
+
+@details.get("/admission")
+def admission_stats():
+    # Rate limit backend, this worker's load and the requests refused so far
+    return admission.stats()
+
+
+@details.get("/jobs")
+def job_stats():
+    # This process's worker, and queue depth as of its last maintenance pass
+    return job_worker.stats()
+
+
+router.include_router(details)
@@ -1,30 +1,90 @@
-from datetime import datetime, timedelta
-
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import date, datetime, timedelta
+from typing import Literal
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+import numpy as np
+from sqlalchemy import case, func, insert, update
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.config import settings
+from app.core import rollups
+from app.core.archive import archived_comment_page, load_archived
+from app.core.attachments import enqueue_orphan_cleanup
+from app.core.bulk_import import import_ideas
+from app.core.forecast import ewma_seasonal_poisson, trend_span
+from app.core.http_cache import (
+    IDEAS_SCOPE,
+    SUBMISSIONS_SCOPE,
+    attachments_scope,
+    cached_json,
+    owner_scope,
+    touch,
+    touch_idea,
+)
+from app.core.events import comment_event, event_broker, idea_status_event
+from app.core.export import MEDIA_TYPES, export_stream, iter_export_records
+from app.core.pagination import encode_cursor, keyset_before
+from app.core.responses import FastJSONResponse
+from app.core.search import search_service
+from app.core.similarity import similarity_service
+from app.database import SessionLocal, get_db, get_read_db
 from app.models.comment import Comment
-from app.models.idea import Idea
+from app.models.idea import IDEA_STATUSES, Idea
+from app.models.idea_archive import ArchivedIdea
+from app.models.idea_rollup import (
+    IdeaCycleTimeBucket,
+    IdeaDailyCount,
+    IdeaOwnerStatusCount,
+    IdeaStatusCount,
+)
 from app.models.idea_status_history import IdeaStatusHistory
 from app.models.user import User
-from app.schemas.idea import IdeaCreate, IdeaUpdate
-from app.schemas.comment import CommentCreate
+from app.schemas.idea import IdeaCreate, IdeaPage, IdeaSearchPage, IdeaUpdate, StatusChange
+from app.schemas.comment import CommentCreate, CommentPage
 from app.core.deps import get_current_user
 from app.core.deps import require_team_lead, require_team_member
+from app.routers import comments as comments_router
 
 router = APIRouter(prefix="/ideas", tags=["Ideas"])
 
 
-ALLOWED_STATUSES = {"Submitted", "In Review", "Approved", "Rejected"}
-
-
-def _build_comment_map(db: Session, idea_ids: list[int]) -> dict[int, list[Comment]]:
-    comment_map: dict[int, list[Comment]] = {}
+ALLOWED_STATUSES = set(IDEA_STATUSES)
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+BULK_STATUS_MAX_ITEMS = 500
+
+# List routes load only these columns as row tuples instead of ORM instances
+IDEA_COLUMNS = (
+    Idea.id,
+    Idea.title,
+    Idea.description,
+    Idea.status,
+    Idea.user_id,
+    Idea.created_at,
+    Idea.comment_count,
+    Idea.last_comment_id,
+    Idea.last_comment_at,
+    Idea.last_comment_by,
+    Idea.last_comment_preview,
+)
+OWNER_COLUMNS = (User.id, User.name, User.email)
+COMMENT_COLUMNS = (
+    Comment.id,
+    Comment.comment_text,
+    Comment.idea_id,
+    Comment.commented_by,
+    Comment.created_at,
+)
+
+
+def _build_comment_map(db: Session, idea_ids: list[int]) -> dict[int, list]:
+    comment_map: dict[int, list] = {}
     if not idea_ids:
         return comment_map
     for c in (
-        db.query(Comment)
+        db.query(*COMMENT_COLUMNS)
         .filter(Comment.idea_id.in_(idea_ids))
         .order_by(Comment.created_at.asc())
         .all()
@@ -33,8 +93,16 @@ def _build_comment_map(db: Session, idea_ids: list[int]) -> dict[int, list[Comme
     return comment_map
 
 
-def _serialize_idea(idea: Idea, owner: User | None, comments: list[Comment]):
-    return {
+def _owner_map(db: Session, owner_ids: set[int]) -> dict:
+    if not owner_ids:
+        return {}
+    return {u.id: u for u in db.query(*OWNER_COLUMNS).filter(User.id.in_(owner_ids))}
+
+
+def _serialize_idea(idea, owner, comments=None):
+    # Works on ORM instances and on Core rows loaded with the *_COLUMNS above.
+    # Full comments only when given; the count and latest comment always.
+    result = {
         "id": idea.id,
         "title": idea.title,
         "description": idea.description,
@@ -46,7 +114,20 @@ def _serialize_idea(idea: Idea, owner: User | None, comments: list[Comment]):
             "name": owner.name if owner else "",
             "email": owner.email if owner else "",
         },
-        "comments": [
+        "comment_count": idea.comment_count,
+        "last_comment": (
+            {
+                "id": idea.last_comment_id,
+                "comment_text": idea.last_comment_preview,
+                "commented_by": idea.last_comment_by,
+                "created_at": idea.last_comment_at,
+            }
+            if idea.last_comment_id is not None
+            else None
+        ),
+    }
+    if comments is not None:
+        result["comments"] = [
             {
                 "id": c.id,
                 "comment_text": c.comment_text,
@@ -55,8 +136,42 @@ def _serialize_idea(idea: Idea, owner: User | None, comments: list[Comment]):
                 "created_at": c.created_at,
             }
             for c in comments
-        ],
+        ]
+    return result
+
+
+def _similar_ideas(
+    db: Session, title: str, description: str, k: int, exclude_id: int | None = None
+) -> list[dict]:
+    matches = similarity_service.similar(title, description, k=k, exclude_id=exclude_id)
+    if not matches:
+        return []
+    rows = {
+        r.id: r
+        for r in db.query(Idea.id, Idea.title, Idea.status, Idea.user_id).filter(
+            Idea.id.in_([idea_id for idea_id, _ in matches])
+        )
     }
+    # The index also holds archived ideas (app.core.archive)
+    archived = [idea_id for idea_id, _ in matches if idea_id not in rows]
+    if archived:
+        rows.update(
+            (r.id, r)
+            for r in db.query(
+                ArchivedIdea.id, ArchivedIdea.title, ArchivedIdea.status, ArchivedIdea.user_id
+            ).filter(ArchivedIdea.id.in_(archived))
+        )
+    return [
+        {
+            "id": idea_id,
+            "title": rows[idea_id].title,
+            "status": rows[idea_id].status,
+            "user_id": rows[idea_id].user_id,
+            "similarity": round(score, 3),
+        }
+        for idea_id, score in matches
+        if idea_id in rows
+    ]
 
 
 # Create idea (Team Member)
@@ -72,51 +187,246 @@ def create_idea(
         user_id=current_user.id,
     )
     db.add(idea)
+    db.flush()
+    rollups.record_created(db, idea)
+    touch_idea(db, idea.user_id)
+    touch(db, SUBMISSIONS_SCOPE)
     db.commit()
     db.refresh(idea)
-    owner = db.query(User).filter(User.id == idea.user_id).first()
-    comments = db.query(Comment).filter(Comment.idea_id == idea.id).all()
-    return _serialize_idea(idea, owner, comments)
+    similar = _similar_ideas(
+        db, idea.title, idea.description, k=settings.similar_ideas_k, exclude_id=idea.id
+    )
+    search_service.index_idea(idea)
+    similarity_service.index_idea(idea)
+    # The owner is the caller and a new idea has no comments; skip both lookups
+    result = _serialize_idea(idea, current_user, [])
+    # Possible duplicates, so the submitter can withdraw or link their idea
+    result["similar"] = similar
+    return result
+
+
+# Bulk import (Team Member): JSON array, NDJSON or CSV body
+@router.post("/bulk")
+async def bulk_import(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user=Depends(require_team_member),
+):
+    return await import_ideas(
+        request, current_user.id, lambda fn: run_in_threadpool(fn, db)
+    )
+
+
+@router.post("/similar")
+def similar_ideas(
+    data: IdeaCreate,
+    k: int = Query(5, ge=1, le=20),
+    db: Session = Depends(get_read_db),
+    current_user=Depends(get_current_user),
+):
+    # Preview of near-duplicates before submitting
+    if not similarity_service.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Similarity index is warming up",
+            headers={"Retry-After": "5"},
+        )
+    similarity_service.maybe_refresh(SessionLocal)
+    return {"items": _similar_ideas(db, data.title, data.description, k=k)}
+
+
+def _check_statuses(status_filter: list[str] | None) -> None:
+    if status_filter and set(status_filter) - ALLOWED_STATUSES:
+        raise HTTPException(status_code=400, detail="Invalid status")
+
+
+def _filter_ideas(
+    query,
+    status_filter: list[str] | None = None,
+    owner_id: int | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    model=Idea,
+):
+    # `model` is Idea or ArchivedIdea, which share these columns
+    if status_filter:
+        _check_statuses(status_filter)
+        query = query.filter(model.status.in_(status_filter))
+    if owner_id is not None:
+        query = query.filter(model.user_id == owner_id)
+    if created_from is not None:
+        query = query.filter(model.created_at >= created_from)
+    if created_to is not None:
+        query = query.filter(model.created_at < created_to)
+    return query
+
+
+def _paginate_ideas(
+    db: Session, query, cursor: str | None, limit: int, include: str | None = None
+):
+    """Fetch one keyset page (newest first) and enrich only the ideas on it."""
+    if cursor:
+        query = query.filter(keyset_before(Idea.created_at, Idea.id, cursor))
+    rows = query.order_by(Idea.created_at.desc(), Idea.id.desc()).limit(limit + 1).all()
+    ideas = rows[:limit]
+
+    user_map = _owner_map(db, {i.user_id for i in ideas})
+    comment_map = _build_comment_map(db, [i.id for i in ideas]) if include == "comments" else None
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = ideas[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return {
+        "items": [
+            _serialize_idea(
+                i,
+                user_map.get(i.user_id),
+                comment_map.get(i.id, []) if comment_map is not None else None,
+            )
+            for i in ideas
+        ],
+        "next_cursor": next_cursor,
+    }
 
 
 # Get own ideas
-@router.get("/my")
+@router.get("/my", response_model=IdeaPage)
 def get_my_ideas(
-    db: Session = Depends(get_db),
+    request: Request,
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    status_filter: list[str] | None = Query(None, alias="status"),
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    include: Literal["comments"] | None = None,
+    db: Session = Depends(get_read_db),
     current_user=Depends(get_current_user),
 ):
-    ideas = (
-        db.query(Idea)
-        .filter(Idea.user_id == current_user.id)
-        .order_by(Idea.created_at.desc())
-        .all()
+    query = _filter_ideas(
+        db.query(*IDEA_COLUMNS),
+        status_filter=status_filter,
+        owner_id=current_user.id,
+        created_from=created_from,
+        created_to=created_to,
+    )
+    return cached_json(
+        request,
+        db,
+        [owner_scope(current_user.id)],
+        lambda: _paginate_ideas(db, query, cursor, limit, include),
     )
-    idea_ids = [i.id for i in ideas]
-    comment_map = _build_comment_map(db, idea_ids)
-    owner = db.query(User).filter(User.id == current_user.id).first()
-    return [_serialize_idea(i, owner, comment_map.get(i.id, [])) for i in ideas]
 
 
-@router.get("/all")
+@router.get("/all", response_model=IdeaPage)
 def get_all_ideas(
-    db: Session = Depends(get_db),
+    request: Request,
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    status_filter: list[str] | None = Query(None, alias="status"),
+    owner_id: int | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    include: Literal["comments"] | None = None,
+    db: Session = Depends(get_read_db),
     current_user=Depends(require_team_lead),
 ):
-    # Return enriched shape used by frontend (owner + comments)
-    ideas = db.query(Idea).order_by(Idea.created_at.desc()).all()
-    user_map = {u.id: u for u in db.query(User).all()}
-    comment_map = _build_comment_map(db, [i.id for i in ideas])
-
-    result = []
-    for idea in ideas:
-        owner = user_map.get(idea.user_id)
-        result.append(_serialize_idea(idea, owner, comment_map.get(idea.id, [])))
-    return result
+    # Owner and comment summary per idea (full comments with include=comments), one page at a time
+    query = _filter_ideas(
+        db.query(*IDEA_COLUMNS),
+        status_filter=status_filter,
+        owner_id=owner_id,
+        created_from=created_from,
+        created_to=created_to,
+    )
+    return cached_json(
+        request, db, [IDEAS_SCOPE], lambda: _paginate_ideas(db, query, cursor, limit, include)
+    )
+
+@router.get("/export")
+def export_ideas(
+    fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    gzip: bool = False,
+    cursor: str | None = None,
+    status_filter: list[str] | None = Query(None, alias="status"),
+    owner_id: int | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    current_user=Depends(require_team_lead),
+):
+    # Validate up front: once streaming starts the status code is already sent
+    _check_statuses(status_filter)
+    resume = (
+        {model: keyset_before(model.created_at, model.id, cursor) for model in (Idea, ArchivedIdea)}
+        if cursor
+        else {}
+    )
+
+    def apply_filters(query, model):
+        query = _filter_ideas(
+            query,
+            status_filter=status_filter,
+            owner_id=owner_id,
+            created_from=created_from,
+            created_to=created_to,
+            model=model,
+        )
+        return query.filter(resume[model]) if cursor else query
+
+    filename = f"ideas-export.{fmt}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        export_stream(iter_export_records(apply_filters), fmt, gzip=gzip, header=cursor is None),
+        media_type="application/gzip" if gzip else MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/search", response_model=IdeaSearchPage)
+def search_ideas(
+    q: str = Query(..., min_length=1, max_length=200),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    include: Literal["comments"] | None = None,
+    db: Session = Depends(get_read_db),
+    current_user=Depends(get_current_user),
+):
+    if not search_service.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Search index is warming up",
+            headers={"Retry-After": "5"},
+        )
+    search_service.maybe_refresh(SessionLocal)
+
+    # Team leads search everything; everyone else only their own ideas
+    owner_id = None if current_user.role_name == "team_lead" else current_user.id
+    hits, total = search_service.search(q, owner_id=owner_id, offset=offset, limit=limit)
+
+    ids = [idea_id for idea_id, _ in hits]
+    ideas = {i.id: i for i in db.query(*IDEA_COLUMNS).filter(Idea.id.in_(ids))} if ids else {}
+    user_map = _owner_map(db, {i.user_id for i in ideas.values()})
+    comment_map = _build_comment_map(db, list(ideas)) if include == "comments" else None
+
+    items = []
+    for idea_id, score in hits:
+        idea = ideas.get(idea_id)
+        if idea is None:
+            continue
+        comments = comment_map.get(idea_id, []) if comment_map is not None else None
+        item = _serialize_idea(idea, user_map.get(idea.user_id), comments)
+        item["score"] = round(score, 4)
+        items.append(item)
+    next_offset = offset + limit if offset + limit < total else None
+    return FastJSONResponse({"items": items, "total": total, "next_offset": next_offset})
+
 
 # Get idea by ID
 @router.get("/{idea_id}")
 def get_idea(idea_id: int, db: Session = Depends(get_db)):
     idea = db.query(Idea).filter(Idea.id == idea_id).first()
+    if not idea:
+        # Finalized ideas may have moved to the archive (app.core.archive)
+        idea = load_archived(db, idea_id)
     if not idea:
         raise HTTPException(status_code=404, detail="Idea not found")
     return idea
@@ -141,8 +451,11 @@ def update_idea(
 
     idea.title = data.title
     idea.description = data.description
+    touch_idea(db, idea.user_id)
     db.commit()
     db.refresh(idea)
+    search_service.index_idea(idea)
+    similarity_service.index_idea(idea)
     owner = db.query(User).filter(User.id == idea.user_id).first()
     comments = db.query(Comment).filter(Comment.idea_id == idea.id).order_by(Comment.created_at.asc()).all()
     return _serialize_idea(idea, owner, comments)
@@ -154,7 +467,8 @@ def delete_idea(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    idea = db.query(Idea).filter(Idea.id == idea_id).first()
+    # Locked so a concurrent status change cannot move the status the rollups subtract
+    idea = db.query(Idea).filter(Idea.id == idea_id).with_for_update().first()
     if not idea:
         raise HTTPException(status_code=404, detail="Idea not found")
 
@@ -164,11 +478,110 @@ def delete_idea(
     if idea.status in {"Approved", "Rejected"}:
         raise HTTPException(status_code=400, detail="Cannot delete after final decision")
 
+    rollups.record_deleted(db, idea)
+    touch_idea(db, idea.user_id, idea_id)
+    touch(db, SUBMISSIONS_SCOPE, attachments_scope(idea_id))
+    # Attachment rows go with the idea (cascade); their blobs may now be orphaned
+    digests = {a.sha256 for a in idea.attachments}
+    enqueue_orphan_cleanup(db, digests)
     db.delete(idea)
     db.commit()
+    search_service.remove_idea(idea_id)
+    similarity_service.remove_idea(idea_id)
     return {"message": "Idea deleted successfully"}
 
 
+@router.patch("/status")
+def set_statuses(
+    changes: list[StatusChange] = Body(..., min_length=1, max_length=BULK_STATUS_MAX_ITEMS),
+    db: Session = Depends(get_db),
+    current_user=Depends(require_team_lead),
+):
+    # Results come back in request order; invalid items are reported, not fatal
+    results: list[dict | None] = [None] * len(changes)
+    wanted: dict[int, tuple[int, str]] = {}
+    for index, change in enumerate(changes):
+        status_value = change.status.strip()
+        if status_value not in ALLOWED_STATUSES:
+            results[index] = {"id": change.id, "ok": False, "detail": "Invalid status"}
+        elif change.id in wanted:
+            results[index] = {"id": change.id, "ok": False, "detail": "Duplicate idea"}
+        else:
+            wanted[change.id] = (index, status_value)
+
+    # Locked so the old statuses the rollups subtract cannot change underneath
+    rows = {}
+    if wanted:
+        rows = {
+            row.id: row
+            for row in db.query(Idea.id, Idea.title, Idea.status, Idea.user_id, Idea.created_at)
+            .filter(Idea.id.in_(wanted))
+            .with_for_update()
+        }
+    applied = []
+    for idea_id, (index, status_value) in wanted.items():
+        row = rows.get(idea_id)
+        if row is None:
+            results[index] = {"id": idea_id, "ok": False, "detail": "Idea not found"}
+            continue
+        if row.status == status_value:
+            results[index] = {"id": idea_id, "ok": True, "changed": False, "status": status_value}
+            continue
+        # Reopening a decision stays a deliberate, single-idea PATCH /ideas/{id}/status
+        if row.status in rollups.FINAL_STATUSES:
+            results[index] = {
+                "id": idea_id,
+                "ok": False,
+                "detail": "Cannot change status after final decision",
+            }
+            continue
+        applied.append((row, status_value))
+        results[index] = {
+            "id": idea_id,
+            "ok": True,
+            "changed": True,
+            "old_status": row.status,
+            "status": status_value,
+        }
+
+    if applied:
+        changed_at = datetime.utcnow()
+        rollups.record_bulk_transitions(db, applied, changed_at)
+        db.execute(
+            update(Idea)
+            .where(Idea.id.in_([row.id for row, _ in applied]))
+            .values(
+                status=case(
+                    {row.id: status_value for row, status_value in applied},
+                    value=Idea.id,
+                    else_=Idea.status,
+                )
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.execute(
+            insert(IdeaStatusHistory),
+            [
+                {
+                    "idea_id": row.id,
+                    "old_status": row.status,
+                    "new_status": status_value,
+                    "changed_by": current_user.id,
+                    "changed_at": changed_at,
+                }
+                for row, status_value in applied
+            ],
+        )
+        touch(db, IDEAS_SCOPE, *sorted({owner_scope(row.user_id) for row, _ in applied}))
+    db.commit()
+    for row, status_value in applied:
+        event = idea_status_event(row, row.status, current_user.id)
+        # `row` still holds the old status
+        event["status"] = status_value
+        event_broker.publish("idea.status", row.user_id, event)
+    return {"updated": len(applied), "results": results}
+
+
 @router.patch("/{idea_id}/status")
 def set_status(
     idea_id: int,
@@ -180,25 +593,49 @@ def set_status(
     if status_value not in ALLOWED_STATUSES:
         raise HTTPException(status_code=400, detail="Invalid status")
 
-    idea = db.query(Idea).filter(Idea.id == idea_id).first()
+    # Locked like set_statuses: concurrent changes must not subtract the same old status
+    idea = db.query(Idea).filter(Idea.id == idea_id).with_for_update().first()
     if not idea:
         raise HTTPException(status_code=404, detail="Idea not found")
 
     old = idea.status
+    changed_at = datetime.utcnow()
+    rollups.record_transition(db, idea, status_value, changed_at)
     idea.status = status_value
+    touch_idea(db, idea.user_id)
     db.add(
         IdeaStatusHistory(
             idea_id=idea.id,
             old_status=old,
             new_status=status_value,
             changed_by=current_user.id,
+            changed_at=changed_at,
         )
     )
     db.commit()
     db.refresh(idea)
+    event_broker.publish("idea.status", idea.user_id, idea_status_event(idea, old, current_user.id))
     return {"ok": True}
 
 
+@router.get("/{idea_id}/comments", response_model=CommentPage)
+def list_idea_comments(
+    request: Request,
+    idea_id: int,
+    cursor: str | None = None,
+    limit: int = Query(comments_router.DEFAULT_PAGE_SIZE, ge=1, le=comments_router.MAX_PAGE_SIZE),
+    db: Session = Depends(get_read_db),
+    current_user=Depends(get_current_user),
+):
+    # Archived ideas keep their comments in the archive row (app.core.archive)
+    page = archived_comment_page(db, idea_id, cursor, limit, current_user)
+    if page is not None:
+        return page
+    return comments_router.list_comments_for_idea(
+        request, idea_id, cursor=cursor, limit=limit, db=db, current_user=current_user
+    )
+
+
 @router.post("/{idea_id}/comments", status_code=status.HTTP_201_CREATED)
 def add_comment(
     idea_id: int,
@@ -215,8 +652,13 @@ def add_comment(
         commented_by=current_user.id,
     )
     db.add(comment)
+    db.flush()
+    rollups.record_comment(db, comment)
+    touch_idea(db, idea.user_id, idea_id)
     db.commit()
     db.refresh(comment)
+    search_service.index_comment(comment)
+    event_broker.publish("comment.created", idea.user_id, comment_event(comment))
     return {"ok": True}
 
 
@@ -233,29 +675,38 @@ def _week_start(dt: datetime) -> datetime:
 
 @router.get("/metrics/summary")
 def metrics_summary(
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_read_db),
     current_user=Depends(require_team_lead),
 ):
-    ideas = db.query(Idea).all()
+    # Day/week buckets are relative to today, so the ETag varies by date too
+    return cached_json(
+        request, db, [IDEAS_SCOPE], lambda: _metrics_summary(db), vary=date.today().isoformat()
+    )
+
+
+def _metrics_summary(db: Session) -> dict:
+    # Reads only the rollup tables maintained by the write routes (see app.core.rollups)
+    by_status = {r.status: r.count for r in db.query(IdeaStatusCount).all()}
 
-    total = len(ideas)
-    open_count = sum(1 for i in ideas if i.status == "Submitted")
-    in_progress = sum(1 for i in ideas if i.status == "In Review")
-    approved = sum(1 for i in ideas if i.status == "Approved")
-    rejected = sum(1 for i in ideas if i.status == "Rejected")
+    total = sum(by_status.values())
+    open_count = by_status.get("Submitted", 0)
+    in_progress = by_status.get("In Review", 0)
+    approved = by_status.get("Approved", 0)
+    rejected = by_status.get("Rejected", 0)
     completed = approved + rejected
 
     now = datetime.now()
+    oldest = min(now - timedelta(days=6), _week_start(now - timedelta(days=21)))
     day_buckets: dict[str, int] = {}
     week_buckets: dict[str, int] = {}
 
-    for idea in ideas:
-        created = idea.created_at or now
-        day_key = _format_day_key(created)
-        day_buckets[day_key] = day_buckets.get(day_key, 0) + 1
-        wk = _week_start(created)
-        wk_key = _format_day_key(wk)
-        week_buckets[wk_key] = week_buckets.get(wk_key, 0) + 1
+    for row in db.query(IdeaDailyCount).filter(IdeaDailyCount.day >= oldest.date()).all():
+        day = datetime(row.day.year, row.day.month, row.day.day)
+        day_key = _format_day_key(day)
+        day_buckets[day_key] = day_buckets.get(day_key, 0) + row.count
+        wk_key = _format_day_key(_week_start(day))
+        week_buckets[wk_key] = week_buckets.get(wk_key, 0) + row.count
 
     last7_days = []
     for idx in range(7):
@@ -270,12 +721,20 @@ def metrics_summary(
         last4_weeks.append({"key": wk_key, "count": week_buckets.get(wk_key, 0)})
     last4_weeks = list(reversed(last4_weeks))
 
-    from app.models.user import User
-
-    users = {u.id: u for u in db.query(User).all()}
+    owner_rows = (
+        db.query(IdeaOwnerStatusCount)
+        .filter(IdeaOwnerStatusCount.count != 0)
+        .all()
+    )
+    owner_ids = {r.user_id for r in owner_rows}
+    users = (
+        {u.id: u for u in db.query(User).filter(User.id.in_(owner_ids)).all()}
+        if owner_ids
+        else {}
+    )
     by_whom: dict[str, dict] = {}
-    for idea in ideas:
-        owner = users.get(idea.user_id)
+    for row in owner_rows:
+        owner = users.get(row.user_id)
         email = (owner.email if owner else "unknown").lower()
         entry = by_whom.get(email) or {
             "ownerEmail": owner.email if owner else "Unknown",
@@ -285,13 +744,13 @@ def metrics_summary(
             "inProgress": 0,
             "completed": 0,
         }
-        entry["total"] += 1
-        if idea.status == "Submitted":
-            entry["open"] += 1
-        if idea.status == "In Review":
-            entry["inProgress"] += 1
-        if idea.status in {"Approved", "Rejected"}:
-            entry["completed"] += 1
+        entry["total"] += row.count
+        if row.status == "Submitted":
+            entry["open"] += row.count
+        if row.status == "In Review":
+            entry["inProgress"] += row.count
+        if row.status in {"Approved", "Rejected"}:
+            entry["completed"] += row.count
         by_whom[email] = entry
 
     by_whom_list = sorted(by_whom.values(), key=lambda x: x["total"], reverse=True)
@@ -307,3 +766,200 @@ def metrics_summary(
         "last4Weeks": last4_weeks,
         "byWhom": by_whom_list,
     }
+
+
+@router.get("/metrics/cycle-time")
+def metrics_cycle_time(
+    request: Request,
+    weeks: int = Query(12, ge=1, le=104),
+    owner_id: int | None = None,
+    db: Session = Depends(get_read_db),
+    current_user=Depends(require_team_lead),
+):
+    # Week buckets are relative to today, so the ETag varies by date too
+    return cached_json(
+        request,
+        db,
+        [IDEAS_SCOPE],
+        lambda: _cycle_time_summary(db, weeks, owner_id),
+        vary=date.today().isoformat(),
+    )
+
+
+def _hours(seconds: float | None) -> float | None:
+    return round(seconds / 3600, 2) if seconds is not None else None
+
+
+def _duration_stats(histogram: dict) -> dict:
+    # Percentiles are interpolated within the histogram buckets, the mean is exact
+    buckets = histogram["buckets"]
+    count = sum(buckets)
+    return {
+        "count": count,
+        "meanHours": _hours(histogram["seconds"] / count) if count else None,
+        "p50Hours": _hours(rollups.histogram_percentile(buckets, 0.5)),
+        "p75Hours": _hours(rollups.histogram_percentile(buckets, 0.75)),
+        "p90Hours": _hours(rollups.histogram_percentile(buckets, 0.9)),
+    }
+
+
+def _cycle_time_summary(db: Session, weeks: int, owner_id: int | None) -> dict:
+    # Reads only the duration histograms maintained by set_status (see app.core.rollups)
+    today = date.today()
+    this_week = today - timedelta(days=today.weekday())
+    week_keys = [this_week - timedelta(weeks=n) for n in reversed(range(weeks))]
+    query = db.query(IdeaCycleTimeBucket).filter(IdeaCycleTimeBucket.week >= week_keys[0])
+    if owner_id is not None:
+        query = query.filter(IdeaCycleTimeBucket.user_id == owner_id)
+
+    slots = len(rollups.DURATION_BUCKETS) + 1
+    # group -> kind -> status -> {"buckets": [...], "seconds": n}
+    groups: dict = {}
+
+    def add(group, row, status_key):
+        histogram = (
+            groups.setdefault(group, {})
+            .setdefault(row.kind, {})
+            .setdefault(status_key, {"buckets": [0] * slots, "seconds": 0})
+        )
+        histogram["buckets"][row.bucket] += row.count
+        histogram["seconds"] += row.seconds
+
+    for row in query.filter(IdeaCycleTimeBucket.count != 0).all():
+        for group in ("all", ("owner", row.user_id), ("week", row.week)):
+            add(group, row, row.status)
+            if row.kind == "cycle":
+                add(group, row, "all")
+
+    def section(group) -> dict:
+        kinds = groups.get(group, {})
+        return {
+            "dwell": {s: _duration_stats(h) for s, h in kinds.get("dwell", {}).items()},
+            "cycleTime": {s: _duration_stats(h) for s, h in kinds.get("cycle", {}).items()},
+        }
+
+    owner_ids = {g[1] for g in groups if isinstance(g, tuple) and g[0] == "owner"}
+    users = (
+        {u.id: u for u in db.query(*OWNER_COLUMNS).filter(User.id.in_(owner_ids))}
+        if owner_ids
+        else {}
+    )
+    by_owner = []
+    for user_id in owner_ids:
+        owner = users.get(user_id)
+        by_owner.append(
+            {
+                "ownerId": user_id,
+                "ownerEmail": owner.email if owner else "Unknown",
+                "ownerName": owner.name if owner else "",
+                **section(("owner", user_id)),
+            }
+        )
+    by_owner.sort(key=lambda o: o["cycleTime"].get("all", {}).get("count", 0), reverse=True)
+
+    return {
+        "weeks": weeks,
+        "since": week_keys[0].isoformat(),
+        "bucketBoundsHours": [b / 3600 for b in rollups.DURATION_BUCKETS],
+        **section("all"),
+        "byOwner": by_owner,
+        "byWeek": [{"week": w.isoformat(), **section(("week", w))} for w in week_keys],
+    }
+
+
+@router.get("/metrics/forecast")
+def metrics_forecast(
+    request: Request,
+    horizon: int = Query(7, ge=0, le=60),
+    days_back: int = Query(30, ge=7, le=180),
+    interval: float = Query(0.8, ge=0.5, le=0.95),
+    by_owner: bool = False,
+    db: Session = Depends(get_read_db),
+    current_user=Depends(require_team_lead),
+):
+    # Only new or deleted ideas change the series; the window moves with the date
+    return cached_json(
+        request,
+        db,
+        [SUBMISSIONS_SCOPE],
+        lambda: _submission_forecast(db, horizon, days_back, interval, by_owner),
+        vary=datetime.utcnow().date().isoformat(),
+    )
+
+
+def _daily_submissions(db: Session, start: date, days: int, by_owner: bool):
+    """(owner ids, counts matrix) with one row per owner, or a single row."""
+    since = datetime.combine(start, datetime.min.time())
+    rows = []
+    # Archived ideas were submitted all the same; their counts add up below
+    for model in (Idea, ArchivedIdea):
+        day = func.date(model.created_at)
+        columns = [day, model.user_id] if by_owner else [day]
+        rows += (
+            db.query(*columns, func.count(model.id))
+            .filter(model.created_at >= since)
+            .group_by(*columns)
+            .all()
+        )
+    owner_ids = sorted({r[1] for r in rows}) if by_owner else [None]
+    position = {owner: i for i, owner in enumerate(owner_ids)}
+    counts = np.zeros((len(owner_ids), days))
+    for row in rows:
+        # SQLite returns DATE() as text
+        row_day = date.fromisoformat(row[0]) if isinstance(row[0], str) else row[0]
+        offset = (row_day - start).days
+        if 0 <= offset < days:
+            counts[position[row[1] if by_owner else None], offset] += row[-1]
+    return owner_ids, counts
+
+
+def _submission_forecast(
+    db: Session, horizon: int, days_back: int, interval: float, by_owner: bool
+) -> dict:
+    # Same series and model as buildIdeaTrendForecast in the frontend, on UTC days
+    # (see app.core.forecast for where the numbers can differ)
+    today = datetime.utcnow().date()
+    start = today - timedelta(days=days_back - 1)
+    dates = [start + timedelta(days=i) for i in range(days_back)]
+    owner_ids, counts = _daily_submissions(db, start, days_back, by_owner)
+    if by_owner:
+        # Row 0 is the team-wide series, forecast in the same batch as the owners
+        counts = np.vstack([counts.sum(axis=0), counts])
+    result = ewma_seasonal_poisson(
+        counts, dates, horizon, span=trend_span(days_back), interval=interval
+    )
+    model = result["model"]
+
+    def series(i: int) -> dict:
+        return {
+            "actual": counts[i].astype(int).tolist(),
+            "forecast": result["forecast"][i].tolist(),
+            "lower": result["lower"][i].tolist(),
+            "upper": result["upper"][i].tolist(),
+            "model": {
+                key: value[i].tolist() if isinstance(value, np.ndarray) else value
+                for key, value in model.items()
+            },
+        }
+
+    summary = {
+        "labels": [d.isoformat() for d in dates],
+        "forecastLabels": [(today + timedelta(days=i + 1)).isoformat() for i in range(horizon)],
+        **series(0),
+    }
+    if by_owner:
+        users = _owner_map(db, set(owner_ids))
+        by_whom = []
+        for i, user_id in enumerate(owner_ids, start=1):
+            owner = users.get(user_id)
+            by_whom.append(
+                {
+                    "ownerId": user_id,
+                    "ownerEmail": owner.email if owner else "Unknown",
+                    "ownerName": owner.name if owner else "",
+                    **series(i),
+                }
+            )
+        by_whom.sort(key=lambda o: sum(o["actual"]), reverse=True)
+        summary["byOwner"] = by_whom
+    return summary
@@ -0,0 +1,278 @@
+"""AsyncSession variant of app.routers.ideas, mounted when ASYNC_DB is enabled.
+
+Each route awaits the shared sync implementation through ``AsyncSession.run_sync``
+so the business rules live in one place while database I/O goes through the
+async driver instead of a threadpool thread.
+"""
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Body, Depends, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.bulk_import import import_ideas
+from app.core.deps import get_current_user_async
+from app.core.deps import require_team_lead_async, require_team_member_async
+from app.database import get_async_db, get_async_read_db
+from app.routers import comments as comments_router
+from app.routers import ideas
+from app.schemas.comment import CommentCreate, CommentPage
+from app.schemas.idea import IdeaCreate, IdeaPage, IdeaSearchPage, IdeaUpdate, StatusChange
+
+router = APIRouter(prefix="/ideas", tags=["Ideas"])
+
+
+@router.post("/", status_code=status.HTTP_201_CREATED)
+async def create_idea(
+    data: IdeaCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(require_team_member_async),
+):
+    return await db.run_sync(
+        lambda s: ideas.create_idea(data, db=s, current_user=current_user)
+    )
+
+
+@router.post("/bulk")
+async def bulk_import(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(require_team_member_async),
+):
+    return await import_ideas(request, current_user.id, db.run_sync)
+
+
+@router.post("/similar")
+async def similar_ideas(
+    data: IdeaCreate,
+    k: int = Query(5, ge=1, le=20),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user=Depends(get_current_user_async),
+):
+    return await db.run_sync(
+        lambda s: ideas.similar_ideas(data, k=k, db=s, current_user=current_user)
+    )
+
+
+@router.get("/my", response_model=IdeaPage)
+async def get_my_ideas(
+    request: Request,
+    cursor: str | None = None,
+    limit: int = Query(ideas.DEFAULT_PAGE_SIZE, ge=1, le=ideas.MAX_PAGE_SIZE),
+    status_filter: list[str] | None = Query(None, alias="status"),
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    include: Literal["comments"] | None = None,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user=Depends(get_current_user_async),
+):
+    return await db.run_sync(
+        lambda s: ideas.get_my_ideas(
+            request,
+            cursor=cursor,
+            limit=limit,
+            status_filter=status_filter,
+            created_from=created_from,
+            created_to=created_to,
+            include=include,
+            db=s,
+            current_user=current_user,
+        )
+    )
+
+
+@router.get("/all", response_model=IdeaPage)
+async def get_all_ideas(
+    request: Request,
+    cursor: str | None = None,
+    limit: int = Query(ideas.DEFAULT_PAGE_SIZE, ge=1, le=ideas.MAX_PAGE_SIZE),
+    status_filter: list[str] | None = Query(None, alias="status"),
+    owner_id: int | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    include: Literal["comments"] | None = None,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user=Depends(require_team_lead_async),
+):
+    return await db.run_sync(
+        lambda s: ideas.get_all_ideas(
+            request,
+            cursor=cursor,
+            limit=limit,
+            status_filter=status_filter,
+            owner_id=owner_id,
+            created_from=created_from,
+            created_to=created_to,
+            include=include,
+            db=s,
+            current_user=current_user,
+        )
+    )
+
+
+@router.get("/export")
+async def export_ideas(
+    fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    gzip: bool = False,
+    cursor: str | None = None,
+    status_filter: list[str] | None = Query(None, alias="status"),
+    owner_id: int | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    current_user=Depends(require_team_lead_async),
+):
+    # The stream reads through its own sync sessions; Starlette iterates it in the threadpool
+    return ideas.export_ideas(
+        fmt=fmt,
+        gzip=gzip,
+        cursor=cursor,
+        status_filter=status_filter,
+        owner_id=owner_id,
+        created_from=created_from,
+        created_to=created_to,
+        current_user=current_user,
+    )
+
+
+@router.get("/search", response_model=IdeaSearchPage)
+async def search_ideas(
+    q: str = Query(..., min_length=1, max_length=200),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    include: Literal["comments"] | None = None,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user=Depends(get_current_user_async),
+):
+    return await db.run_sync(
+        lambda s: ideas.search_ideas(
+            q=q, offset=offset, limit=limit, include=include, db=s, current_user=current_user
+        )
+    )
+
+
+@router.get("/{idea_id}")
+async def get_idea(idea_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(lambda s: ideas.get_idea(idea_id, db=s))
+
+
+@router.put("/{idea_id}")
+async def update_idea(
+    idea_id: int,
+    data: IdeaUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user_async),
+):
+    return await db.run_sync(
+        lambda s: ideas.update_idea(idea_id, data, db=s, current_user=current_user)
+    )
+
+
+@router.delete("/{idea_id}")
+async def delete_idea(
+    idea_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user_async),
+):
+    return await db.run_sync(
+        lambda s: ideas.delete_idea(idea_id, db=s, current_user=current_user)
+    )
+
+
+@router.patch("/status")
+async def set_statuses(
+    changes: list[StatusChange] = Body(..., min_length=1, max_length=ideas.BULK_STATUS_MAX_ITEMS),
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(require_team_lead_async),
+):
+    return await db.run_sync(
+        lambda s: ideas.set_statuses(changes, db=s, current_user=current_user)
+    )
+
+
+@router.patch("/{idea_id}/status")
+async def set_status(
+    idea_id: int,
+    payload: dict,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(require_team_lead_async),
+):
+    return await db.run_sync(
+        lambda s: ideas.set_status(idea_id, payload, db=s, current_user=current_user)
+    )
+
+
+@router.get("/{idea_id}/comments", response_model=CommentPage)
+async def list_idea_comments(
+    request: Request,
+    idea_id: int,
+    cursor: str | None = None,
+    limit: int = Query(comments_router.DEFAULT_PAGE_SIZE, ge=1, le=comments_router.MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user=Depends(get_current_user_async),
+):
+    return await db.run_sync(
+        lambda s: ideas.list_idea_comments(
+            request, idea_id, cursor=cursor, limit=limit, db=s, current_user=current_user
+        )
+    )
+
+
+@router.post("/{idea_id}/comments", status_code=status.HTTP_201_CREATED)
+async def add_comment(
+    idea_id: int,
+    payload: CommentCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(require_team_lead_async),
+):
+    return await db.run_sync(
+        lambda s: ideas.add_comment(idea_id, payload, db=s, current_user=current_user)
+    )
+
+
+@router.get("/metrics/summary")
+async def metrics_summary(
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user=Depends(require_team_lead_async),
+):
+    return await db.run_sync(
+        lambda s: ideas.metrics_summary(request, db=s, current_user=current_user)
+    )
+
+
+@router.get("/metrics/cycle-time")
+async def metrics_cycle_time(
+    request: Request,
+    weeks: int = Query(12, ge=1, le=104),
+    owner_id: int | None = None,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user=Depends(require_team_lead_async),
+):
+    return await db.run_sync(
+        lambda s: ideas.metrics_cycle_time(
+            request, weeks=weeks, owner_id=owner_id, db=s, current_user=current_user
+        )
+    )
+
+
+@router.get("/metrics/forecast")
+async def metrics_forecast(
+    request: Request,
+    horizon: int = Query(7, ge=0, le=60),
+    days_back: int = Query(30, ge=7, le=180),
+    interval: float = Query(0.8, ge=0.5, le=0.95),
+    by_owner: bool = False,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user=Depends(require_team_lead_async),
+):
+    return await db.run_sync(
+        lambda s: ideas.metrics_forecast(
+            request,
+            horizon=horizon,
+            days_back=days_back,
+            interval=interval,
+            by_owner=by_owner,
+            db=s,
+            current_user=current_user,
+        )
+    )
@@ -16,3 +16,8 @@ class CommentResponse(BaseModel):
 
 	class Config:
 		from_attributes = True
+
+
+class CommentPage(BaseModel):
+	items: list[CommentResponse]
+	next_cursor: str | None = None
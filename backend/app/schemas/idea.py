@@ -11,6 +11,10 @@ class IdeaUpdate(BaseModel):
     title: str
     description: str
 
+class StatusChange(BaseModel):
+    id: int
+    status: str
+
 class IdeaResponse(BaseModel):
     id: int
     title: str
@@ -32,6 +36,14 @@ class IdeaOwner(BaseModel):
         from_attributes = True
 
 
+class CommentSummary(BaseModel):
+    id: int
+    # First COMMENT_PREVIEW_LENGTH characters of the comment
+    comment_text: str
+    commented_by: int
+    created_at: datetime
+
+
 class IdeaWithOwner(BaseModel):
     id: int
     title: str
@@ -40,7 +52,25 @@ class IdeaWithOwner(BaseModel):
     created_at: datetime
     user_id: int
     owner: IdeaOwner
-    comments: list[CommentResponse] = []
+    comment_count: int = 0
+    last_comment: CommentSummary | None = None
+    # Only with include=comments
+    comments: list[CommentResponse] | None = None
 
     class Config:
         from_attributes = True
+
+
+class IdeaPage(BaseModel):
+    items: list[IdeaWithOwner]
+    next_cursor: str | None = None
+
+
+class IdeaSearchHit(IdeaWithOwner):
+    score: float
+
+
+class IdeaSearchPage(BaseModel):
+    items: list[IdeaSearchHit]
+    total: int
+    next_offset: int | None = None
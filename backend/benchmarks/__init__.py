@@ -0,0 +1 @@
+"""Benchmarks for the backend. Run from the backend folder, e.g. ``python -m benchmarks.search``."""
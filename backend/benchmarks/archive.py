@@ -0,0 +1,126 @@
+"""Hot-path latency before and after archiving finalized ideas.
+
+Seeds a database like ``benchmarks.load``, times the routes and index
+rebuilds that read the hot tables, moves the Approved/Rejected ideas decided
+more than ``--older-than-days`` ago to the archive tables (app.core.archive)
+and times them again. Also checks that the metrics rollups still verify.
+
+    python -m benchmarks.archive --ideas 20000 --older-than-days 7
+
+The response body cache is disabled so every request reaches the database.
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+
+os.environ.setdefault("RESPONSE_CACHE_MAX_BYTES", "0")
+
+# Imported first: picks the throw-away database before the app reads DATABASE_URL
+from benchmarks.load import _auth, seed  # noqa: E402
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core import rollups  # noqa: E402
+from app.core.archive import archive_finalized  # noqa: E402
+from app.core.search import search_service  # noqa: E402
+from app.core.similarity import similarity_service  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.comment import Comment  # noqa: E402
+from app.models.idea import Idea  # noqa: E402
+from app.models.idea_status_history import IdeaStatusHistory  # noqa: E402
+
+HOT_TABLES = (Idea, Comment, IdeaStatusHistory)
+
+
+def _all_pages(client, headers: dict, params: dict) -> None:
+    cursor = None
+    while True:
+        page = client.get(
+            "/ideas/all", headers=headers, params={**params, **({"cursor": cursor} if cursor else {})}
+        ).json()
+        cursor = page["next_cursor"]
+        if not cursor:
+            return
+
+
+def operations(client, data, rng) -> dict:
+    lead, member = _auth(data.leads[0]), _auth(data.members[0])
+    final = {"status": ["Approved", "Rejected"], "limit": 200}
+    return {
+        "GET /ideas/all (first page)": lambda: client.get("/ideas/all", headers=lead),
+        "GET /ideas/all?include=comments": lambda: client.get(
+            "/ideas/all", headers=lead, params={"include": "comments"}
+        ),
+        "GET /ideas/all?status=final (all pages)": lambda: _all_pages(client, lead, final),
+        "GET /ideas/my": lambda: client.get("/ideas/my", headers=member),
+        "GET /ideas/search": lambda: client.get(
+            "/ideas/search", headers=lead, params={"q": rng.choice(["build", "cache", "report"])}
+        ),
+        "POST /ideas/similar": lambda: client.post(
+            "/ideas/similar",
+            headers=member,
+            json={"title": "Cache the build", "description": "Reuse build outputs"},
+        ),
+        "search index rebuild": lambda: search_service.build(SessionLocal),
+        "similarity index rebuild": lambda: similarity_service.build(SessionLocal),
+    }
+
+
+def measure(ops: dict, repeat: int) -> dict[str, float]:
+    timings = {}
+    for name, op in ops.items():
+        op()  # warm up
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            op()
+            samples.append((time.perf_counter() - started) * 1000)
+        timings[name] = statistics.median(samples)
+    return timings
+
+
+def table_sizes() -> dict[str, int]:
+    with SessionLocal() as db:
+        return {model.__tablename__: db.query(model).count() for model in HOT_TABLES}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--lead-share", type=float, default=0.25)
+    parser.add_argument("--ideas", type=int, default=20_000)
+    parser.add_argument("--comments-per-idea", type=int, default=2)
+    parser.add_argument("--older-than-days", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    data = seed(args, rng)
+    ops = operations(TestClient(app), data, rng)
+
+    sizes_before = table_sizes()
+    before = measure(ops, args.repeat)
+    started = time.perf_counter()
+    archived, _ = archive_finalized(args.older_than_days)
+    elapsed = time.perf_counter() - started
+    sizes_after = table_sizes()
+    after = measure(ops, args.repeat)
+
+    print(f"archived {archived} ideas in {elapsed:.1f}s")
+    for table, count in sizes_before.items():
+        print(f"  {table:22s} {count:>8} -> {sizes_after[table]:>8} rows")
+    print(f"{'operation':40s} {'before':>9} {'after':>9} {'speedup':>8}")
+    for name in ops:
+        print(f"{name:40s} {before[name]:>7.1f}ms {after[name]:>7.1f}ms {before[name] / after[name]:>7.2f}x")
+    with SessionLocal() as db:
+        drift = rollups.verify(db)
+    print(f"rollups: {len(drift)} drifted row(s)")
+    raise SystemExit(1 if drift else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,428 @@
+"""In-process load test of the API with a seeded synthetic dataset.
+
+Runs the FastAPI app in this process (ASGI transport, no sockets) against a
+throw-away SQLite file unless ``DATABASE_URL`` is set, drives a weighted mix
+of team member and team lead requests at fixed concurrency, and reports
+p50/p95/p99 latency, throughput and SQL statements per request for every
+route. Needs ``httpx``.
+
+    python -m benchmarks.load --ideas 10000 --requests 5000 --concurrency 16 --json run.json
+    python -m benchmarks.load --baseline run.json      # exit 1 on regression
+
+Logins cost a full bcrypt each; set ``BCRYPT_ROUNDS`` (e.g. 4) to keep them
+from dominating runs on small machines. Comparisons only make sense between
+runs with the same options on the same machine.
+"""
+import argparse
+import asyncio
+import contextvars
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+_scratch = tempfile.mkdtemp(prefix="ideaflow-bench-")
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{_scratch}/bench.db"
+os.environ.setdefault("ATTACHMENTS_DIR", f"{_scratch}/attachments")
+os.environ.setdefault("SEARCH_REBUILD_SECONDS", "0")
+# Measures capacity; rate limits and shedding would refuse most of the run
+os.environ.setdefault("ADMISSION_ENABLED", "0")
+
+import httpx  # noqa: E402
+from sqlalchemy import delete, event, insert, select  # noqa: E402
+from sqlalchemy.engine import Engine  # noqa: E402
+
+from app import bootstrap  # noqa: E402
+from app.core import rollups  # noqa: E402
+from app.core.principal_cache import principal_cache  # noqa: E402
+from app.core.search import search_service  # noqa: E402
+from app.core.security import create_access_token, get_password_hash  # noqa: E402
+from app.core.similarity import similarity_service  # noqa: E402
+from app.database import SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.comment import Comment  # noqa: E402
+from app.models.idea import Idea  # noqa: E402
+from app.models.idea_archive import ArchivedIdea, ArchivedStatusHistory  # noqa: E402
+from app.models.idea_status_history import IdeaStatusHistory  # noqa: E402
+from app.models.user import User  # noqa: E402
+from benchmarks.search import _percentile, _text  # noqa: E402
+
+PASSWORD = "benchmark-password"
+STATUSES = ["Submitted", "In Review", "Approved", "Rejected"]
+MEMBER_ROLE_ID, LEAD_ROLE_ID = 1, 2
+
+# SQL statements issued while serving the current request
+_query_count: contextvars.ContextVar[list[int] | None] = contextvars.ContextVar(
+    "bench_query_count", default=None
+)
+
+
+# On Engine itself, so the async engine's statements (its sync_engine) are counted too
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = _query_count.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+class Dataset:
+    def __init__(self) -> None:
+        self.members: list[dict] = []
+        self.leads: list[dict] = []
+        self.ideas_by_owner: dict[int, list[int]] = {}
+        self.idea_ids: list[int] = []
+
+
+def seed(args, rng: random.Random) -> Dataset:
+    bootstrap.run()
+    password = get_password_hash(PASSWORD)
+    now = datetime.utcnow()
+    with SessionLocal() as db:
+        for model in (ArchivedStatusHistory, ArchivedIdea, IdeaStatusHistory, Comment, Idea, User):
+            db.execute(delete(model))
+        users = []
+        for i in range(1, args.users + 1):
+            lead = i <= max(1, int(args.users * args.lead_share))
+            users.append(
+                {
+                    "id": i,
+                    "name": f"Bench User {i}",
+                    "email": f"user{i}@bench.ideaflow.io",
+                    "password": password,
+                    "role_id": LEAD_ROLE_ID if lead else MEMBER_ROLE_ID,
+                }
+            )
+        db.execute(insert(User), users)
+        member_ids = [u["id"] for u in users if u["role_id"] == MEMBER_ROLE_ID]
+        lead_ids = [u["id"] for u in users if u["role_id"] == LEAD_ROLE_ID]
+
+        ideas, comments, history = [], [], []
+        for idea_id in range(1, args.ideas + 1):
+            created = now - timedelta(minutes=rng.randint(0, 90 * 24 * 60))
+            status = rng.choices(STATUSES, weights=[5, 2, 2, 1])[0]
+            ideas.append(
+                {
+                    "id": idea_id,
+                    "title": _text(rng, 6),
+                    "description": _text(rng, 40),
+                    "status": status,
+                    "user_id": rng.choice(member_ids),
+                    "created_at": created,
+                }
+            )
+            for _ in range(args.comments_per_idea):
+                comments.append(
+                    {
+                        "idea_id": idea_id,
+                        "comment_text": _text(rng, 12),
+                        "commented_by": rng.choice(lead_ids),
+                        "created_at": created + timedelta(hours=rng.randint(1, 48)),
+                    }
+                )
+            if status != "Submitted":
+                history.append(
+                    {
+                        "idea_id": idea_id,
+                        "old_status": "Submitted",
+                        "new_status": status,
+                        "changed_by": rng.choice(lead_ids),
+                        "changed_at": min(now, created + timedelta(hours=rng.randint(1, 96))),
+                    }
+                )
+        for model, rows in ((Idea, ideas), (Comment, comments), (IdeaStatusHistory, history)):
+            for start in range(0, len(rows), 5000):
+                db.execute(insert(model), rows[start:start + 5000])
+        db.commit()
+        rollups.rebuild(db)
+
+        data = Dataset()
+        roles = {u["id"]: u["role_id"] for u in users}
+        for user_id, role_id in roles.items():
+            token = create_access_token(
+                {
+                    "user_id": user_id,
+                    "role_id": role_id,
+                    "role": "team_lead" if role_id == LEAD_ROLE_ID else "team_member",
+                }
+            )
+            entry = {"id": user_id, "email": f"user{user_id}@bench.ideaflow.io", "token": token}
+            (data.leads if role_id == LEAD_ROLE_ID else data.members).append(entry)
+        for idea_id, owner_id in db.execute(select(Idea.id, Idea.user_id)):
+            data.ideas_by_owner.setdefault(owner_id, []).append(idea_id)
+            data.idea_ids.append(idea_id)
+    principal_cache.clear()
+
+    # ASGITransport does not run the lifespan; build the indexes on the seed directly
+    search_service.build(SessionLocal)
+    similarity_service.build(SessionLocal)
+    return data
+
+
+def _auth(user: dict) -> dict:
+    return {"Authorization": f"Bearer {user['token']}"}
+
+
+def _own_idea(data: Dataset, user: dict, rng: random.Random) -> int:
+    owned = data.ideas_by_owner.get(user["id"])
+    return rng.choice(owned) if owned else rng.choice(data.idea_ids)
+
+
+# (route, weight, request builder) per role; builders return (method, url, kwargs)
+MEMBER_MIX = [
+    ("GET /ideas/my", 30, lambda d, u, r: ("GET", "/ideas/my", {})),
+    (
+        "GET /comments/idea/{id}",
+        10,
+        lambda d, u, r: ("GET", f"/comments/idea/{_own_idea(d, u, r)}", {}),
+    ),
+    (
+        "GET /ideas/search",
+        10,
+        lambda d, u, r: ("GET", "/ideas/search", {"params": {"q": _text(r, 2)}}),
+    ),
+    (
+        "POST /ideas/similar",
+        5,
+        lambda d, u, r: (
+            "POST",
+            "/ideas/similar",
+            {"json": {"title": _text(r, 6), "description": _text(r, 30)}},
+        ),
+    ),
+    (
+        "POST /ideas/",
+        8,
+        lambda d, u, r: (
+            "POST",
+            "/ideas/",
+            {"json": {"title": _text(r, 6), "description": _text(r, 40)}},
+        ),
+    ),
+    ("GET /auth/me", 5, lambda d, u, r: ("GET", "/auth/me", {})),
+    (
+        "POST /auth/login",
+        2,
+        lambda d, u, r: (
+            "POST",
+            "/auth/login",
+            {"json": {"email": u["email"], "password": PASSWORD}, "auth": False},
+        ),
+    ),
+]
+LEAD_MIX = [
+    ("GET /ideas/all", 25, lambda d, u, r: ("GET", "/ideas/all", {})),
+    ("GET /ideas/metrics/summary", 15, lambda d, u, r: ("GET", "/ideas/metrics/summary", {})),
+    (
+        "GET /ideas/search",
+        10,
+        lambda d, u, r: ("GET", "/ideas/search", {"params": {"q": _text(r, 2)}}),
+    ),
+    (
+        "PATCH /ideas/{id}/status",
+        8,
+        lambda d, u, r: (
+            "PATCH",
+            f"/ideas/{r.choice(d.idea_ids)}/status",
+            {"json": {"status": r.choice(STATUSES)}},
+        ),
+    ),
+    (
+        "POST /ideas/{id}/comments",
+        6,
+        lambda d, u, r: (
+            "POST",
+            f"/ideas/{r.choice(d.idea_ids)}/comments",
+            {"json": {"comment_text": _text(r, 12)}},
+        ),
+    ),
+]
+
+
+async def _send(client, data, rng, lead_share, results, record: bool) -> None:
+    is_lead = rng.random() < lead_share
+    mix = LEAD_MIX if is_lead else MEMBER_MIX
+    user = rng.choice(data.leads if is_lead else data.members)
+    name, _, build = rng.choices(mix, weights=[w for _, w, _ in mix])[0]
+    method, url, kwargs = build(data, user, rng)
+    headers = {} if kwargs.pop("auth", True) is False else _auth(user)
+
+    counter = [0]
+    token = _query_count.set(counter)
+    started = time.perf_counter()
+    try:
+        response = await client.request(method, url, headers=headers, **kwargs)
+        ok = response.status_code < 400
+    except Exception:
+        ok = False
+    finally:
+        elapsed = time.perf_counter() - started
+        _query_count.reset(token)
+    if record:
+        entry = results.setdefault(name, {"latencies": [], "queries": [], "errors": 0})
+        entry["latencies"].append(elapsed * 1000)
+        entry["queries"].append(counter[0])
+        entry["errors"] += 0 if ok else 1
+
+
+async def drive(data: Dataset, args) -> tuple[dict, float]:
+    results: dict[str, dict] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for phase, total in (("warmup", args.warmup), ("measure", args.requests)):
+            remaining = total
+            started = time.perf_counter()
+
+            async def worker(worker_id: int) -> None:
+                nonlocal remaining
+                rng = random.Random(args.seed * 1000 + worker_id + (0 if phase == "warmup" else 500))
+                while remaining > 0:
+                    remaining -= 1
+                    await _send(client, data, rng, args.lead_share, results, phase == "measure")
+
+            await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+            elapsed = time.perf_counter() - started
+    return results, elapsed
+
+
+def summarize(results: dict, elapsed: float, args) -> dict:
+    routes = {}
+    for name, entry in sorted(results.items()):
+        latencies = entry["latencies"]
+        routes[name] = {
+            "count": len(latencies),
+            "errors": entry["errors"],
+            "p50_ms": round(_percentile(latencies, 50), 3),
+            "p95_ms": round(_percentile(latencies, 95), 3),
+            "p99_ms": round(_percentile(latencies, 99), 3),
+            "mean_ms": round(statistics.fmean(latencies), 3),
+            "rps": round(len(latencies) / elapsed, 1),
+            "queries_per_request": round(statistics.fmean(entry["queries"]), 2),
+        }
+    total = sum(r["count"] for r in routes.values())
+    return {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "database": engine.dialect.name,
+            "users": args.users,
+            "ideas": args.ideas,
+            "comments_per_idea": args.comments_per_idea,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "lead_share": args.lead_share,
+            "seed": args.seed,
+        },
+        "total": {
+            "requests": total,
+            "errors": sum(r["errors"] for r in routes.values()),
+            "seconds": round(elapsed, 3),
+            "rps": round(total / elapsed, 1),
+        },
+        "routes": routes,
+    }
+
+
+def compare(
+    report: dict, baseline: dict, tolerance: float, min_delta_ms: float, min_samples: int
+) -> list[str]:
+    """Regressions of `report` against `baseline`, as human-readable lines."""
+    problems = []
+    for name, base in baseline["routes"].items():
+        current = report["routes"].get(name)
+        # Tail percentiles of rarely hit routes are too noisy to gate on
+        if current is None or min(current["count"], base["count"]) < min_samples:
+            continue
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            limit = base[key] * (1 + tolerance)
+            if current[key] > limit and current[key] - base[key] > min_delta_ms:
+                problems.append(f"{name}: {key} {base[key]:.2f} -> {current[key]:.2f}")
+        if current["queries_per_request"] > base["queries_per_request"] + 0.5:
+            problems.append(
+                f"{name}: queries/request {base['queries_per_request']}"
+                f" -> {current['queries_per_request']}"
+            )
+        base_rate = base["errors"] / max(1, base["count"])
+        if current["errors"] / max(1, current["count"]) > base_rate + 0.01:
+            problems.append(f"{name}: errors {base['errors']} -> {current['errors']}")
+    base_rps = baseline["total"]["rps"]
+    if report["total"]["rps"] < base_rps * (1 - tolerance):
+        problems.append(f"throughput: {base_rps} -> {report['total']['rps']} req/s")
+    return problems
+
+
+def print_report(report: dict) -> None:
+    meta, total = report["meta"], report["total"]
+    print(
+        f"{meta['database']}: {meta['users']} users, {meta['ideas']} ideas;"
+        f" {meta['requests']} requests at concurrency {meta['concurrency']}"
+    )
+    print(
+        f"{'route':30s} {'count':>6} {'err':>4} {'p50':>8} {'p95':>8} {'p99':>8}"
+        f" {'req/s':>7} {'q/req':>6}"
+    )
+    for name, r in report["routes"].items():
+        print(
+            f"{name:30s} {r['count']:>6} {r['errors']:>4} {r['p50_ms']:>6.1f}ms"
+            f" {r['p95_ms']:>6.1f}ms {r['p99_ms']:>6.1f}ms {r['rps']:>7.1f}"
+            f" {r['queries_per_request']:>6.1f}"
+        )
+    print(
+        f"total: {total['requests']} requests, {total['errors']} errors,"
+        f" {total['seconds']:.1f}s, {total['rps']:.1f} req/s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--lead-share", type=float, default=0.25, help="share of leads and lead traffic")
+    parser.add_argument("--ideas", type=int, default=10_000)
+    parser.add_argument("--comments-per-idea", type=int, default=2)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--baseline", help="compare against a saved report; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="ignore smaller latency changes")
+    parser.add_argument("--min-samples", type=int, default=100, help="skip routes with fewer requests")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    t0 = time.perf_counter()
+    data = seed(args, rng)
+    print(f"seeded in {time.perf_counter() - t0:.1f}s")
+
+    results, elapsed = asyncio.run(drive(data, args))
+    report = summarize(results, elapsed, args)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(report, fh, indent=2)
+    # Some routes rightly run no SQL (principal cache, in-memory indexes), but a whole run
+    # without any means the statement counter missed the engine the routes used
+    if not any(sum(entry["queries"]) for entry in results.values()):
+        print("no SQL statements counted; the q/req column is meaningless")
+        sys.exit(1)
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+        problems = compare(report, baseline, args.tolerance, args.min_delta_ms, args.min_samples)
+        if problems:
+            print("REGRESSIONS against", args.baseline)
+            for line in problems:
+                print("  " + line)
+            sys.exit(1)
+        print("no regressions against", args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+"""EXPLAIN every SQL statement the routers issue and fail on full table scans.
+
+Seeds a database like ``benchmarks.load`` (a throw-away SQLite file unless
+``DATABASE_URL`` is set), migrates it, sends one request per router query
+shape, captures the statements each one executes and runs them through the
+database's EXPLAIN. A statement whose plan reads a whole table without an
+index (SQLite ``SCAN <table>``, MySQL ``type=ALL``, PostgreSQL ``Seq Scan``)
+is reported, and the command exits 1.
+
+    python -m benchmarks.query_plans
+    DATABASE_URL=mysql+pymysql://... python -m benchmarks.query_plans --ideas 50000
+
+MySQL and PostgreSQL may prefer a scan on tables too small for an index to
+pay off; seed enough rows for the plans to be representative.
+"""
+import argparse
+import random
+import re
+import sys
+from datetime import datetime, timedelta
+
+# Imported first: picks the throw-away database before the app reads DATABASE_URL
+from benchmarks.load import PASSWORD, STATUSES, _auth, _own_idea, seed
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.archive import archive_ideas, due_ideas
+from app.database import SessionLocal, engine
+from app.main import app
+
+# Rollup and lookup tables stay small whatever the data volume; scanning them is intended
+BOUNDED_TABLES = {"roles", "idea_status_counts", "idea_owner_status_counts", "alembic_version"}
+EXPLAINED = ("SELECT", "UPDATE", "DELETE", "WITH")
+SQLITE_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$")
+POSTGRES_SCAN = re.compile(r"Seq Scan on (\w+)")
+
+_captured: list[tuple[str, object]] | None = None
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _capture(conn, cursor, statement, parameters, context, executemany):
+    if _captured is not None and statement.lstrip().upper().startswith(EXPLAINED):
+        _captured.append((statement, parameters[0] if executemany else parameters))
+
+
+def _next_cursor(client, url: str, headers: dict, limit: int = 5) -> str:
+    return client.get(url, headers=headers, params={"limit": limit}).json()["next_cursor"]
+
+
+def _open_idea(client, user: dict) -> int:
+    # Seeded ideas may already be final, which rejects edits, deletes and attachment changes
+    payload = {"title": "Attach the logs", "description": "Logs from the outage"}
+    return client.post("/ideas/", json=payload, headers=_auth(user)).json()["id"]
+
+
+def _archived_idea(data) -> int:
+    with SessionLocal() as db:
+        idea_id = archive_ideas(db, due_ideas(db, datetime.utcnow(), 0, 1))[0]
+        db.commit()
+    # Later builders pick from these and expect the ideas to be in the hot table
+    for ids in (data.idea_ids, *data.ideas_by_owner.values()):
+        if idea_id in ids:
+            ids.remove(idea_id)
+    return idea_id
+
+
+# (route, role, request builder); builders return (method, url, kwargs)
+REQUESTS = [
+    ("GET /ideas/my", "member", lambda c, d, u, r: ("GET", "/ideas/my", {})),
+    (
+        "GET /ideas/my?status",
+        "member",
+        lambda c, d, u, r: ("GET", "/ideas/my", {"params": {"status": "Submitted"}}),
+    ),
+    (
+        "GET /ideas/my?created_from",
+        "member",
+        lambda c, d, u, r: (
+            "GET",
+            "/ideas/my",
+            {"params": {"created_from": (datetime.utcnow() - timedelta(days=7)).isoformat()}},
+        ),
+    ),
+    (
+        "GET /ideas/my?cursor",
+        "member",
+        lambda c, d, u, r: (
+            "GET",
+            "/ideas/my",
+            {"params": {"limit": 5, "cursor": _next_cursor(c, "/ideas/my", _auth(u))}},
+        ),
+    ),
+    ("GET /ideas/{id}", "member", lambda c, d, u, r: ("GET", f"/ideas/{_own_idea(d, u, r)}", {})),
+    (
+        "GET /ideas/{id} (archived)",
+        "member",
+        lambda c, d, u, r: ("GET", f"/ideas/{_archived_idea(d)}", {}),
+    ),
+    (
+        "PUT /ideas/{id}",
+        "member",
+        lambda c, d, u, r: (
+            "PUT",
+            f"/ideas/{_open_idea(c, u)}",
+            {"json": {"title": "Renamed idea", "description": "Updated description"}},
+        ),
+    ),
+    (
+        "GET /comments/idea/{id}",
+        "member",
+        lambda c, d, u, r: ("GET", f"/comments/idea/{_own_idea(d, u, r)}", {}),
+    ),
+    (
+        "GET /comments/idea/{id}?cursor",
+        "member",
+        lambda c, d, u, r: (
+            lambda url: (
+                "GET",
+                url,
+                {"params": {"limit": 1, "cursor": _next_cursor(c, url, _auth(u), limit=1)}},
+            )
+        )(f"/comments/idea/{_own_idea(d, u, r)}"),
+    ),
+    (
+        "POST /comments/idea/{id}",
+        "member",
+        lambda c, d, u, r: (
+            "POST",
+            f"/comments/idea/{_own_idea(d, u, r)}",
+            {"json": {"comment_text": "Follow-up"}},
+        ),
+    ),
+    (
+        "POST /ideas/",
+        "member",
+        lambda c, d, u, r: (
+            "POST",
+            "/ideas/",
+            {"json": {"title": "Cache the build", "description": "Reuse build outputs"}},
+        ),
+    ),
+    (
+        "POST /ideas/similar",
+        "member",
+        lambda c, d, u, r: (
+            "POST",
+            "/ideas/similar",
+            {"json": {"title": "Cache the build", "description": "Reuse build outputs"}},
+        ),
+    ),
+    (
+        "GET /ideas/search",
+        "member",
+        lambda c, d, u, r: ("GET", "/ideas/search", {"params": {"q": "build"}}),
+    ),
+    (
+        "POST /ideas/{id}/attachments",
+        "member",
+        lambda c, d, u, r: (
+            "POST",
+            f"/ideas/{_open_idea(c, u)}/attachments",
+            {"params": {"filename": "notes.txt"}, "content": b"Attached notes"},
+        ),
+    ),
+    (
+        "GET /ideas/{id}/attachments",
+        "member",
+        lambda c, d, u, r: ("GET", f"/ideas/{_own_idea(d, u, r)}/attachments", {}),
+    ),
+    ("GET /auth/me", "member", lambda c, d, u, r: ("GET", "/auth/me", {})),
+    (
+        "POST /auth/login",
+        "member",
+        lambda c, d, u, r: (
+            "POST",
+            "/auth/login",
+            {"json": {"email": u["email"], "password": PASSWORD}, "auth": False},
+        ),
+    ),
+    (
+        "DELETE /ideas/{id}",
+        "member",
+        lambda c, d, u, r: ("DELETE", f"/ideas/{_open_idea(c, u)}", {}),
+    ),
+    ("GET /ideas/all", "lead", lambda c, d, u, r: ("GET", "/ideas/all", {})),
+    (
+        "GET /ideas/all?include=comments",
+        "lead",
+        lambda c, d, u, r: ("GET", "/ideas/all", {"params": {"include": "comments"}}),
+    ),
+    (
+        "GET /ideas/all?status",
+        "lead",
+        lambda c, d, u, r: ("GET", "/ideas/all", {"params": {"status": ["Approved", "Rejected"]}}),
+    ),
+    (
+        "GET /ideas/all?owner_id",
+        "lead",
+        lambda c, d, u, r: ("GET", "/ideas/all", {"params": {"owner_id": d.members[0]["id"]}}),
+    ),
+    (
+        "GET /ideas/all?cursor",
+        "lead",
+        lambda c, d, u, r: (
+            "GET",
+            "/ideas/all",
+            {"params": {"limit": 5, "cursor": _next_cursor(c, "/ideas/all", _auth(u))}},
+        ),
+    ),
+    (
+        "GET /ideas/export?status",
+        "lead",
+        lambda c, d, u, r: ("GET", "/ideas/export", {"params": {"status": "Approved"}}),
+    ),
+    (
+        "PATCH /ideas/{id}/status",
+        "lead",
+        lambda c, d, u, r: (
+            "PATCH",
+            f"/ideas/{r.choice(d.idea_ids)}/status",
+            {"json": {"status": r.choice(STATUSES)}},
+        ),
+    ),
+    (
+        "PATCH /ideas/status",
+        "lead",
+        lambda c, d, u, r: (
+            "PATCH",
+            "/ideas/status",
+            {
+                "json": [
+                    {"id": idea_id, "status": r.choice(STATUSES)}
+                    for idea_id in r.sample(d.idea_ids, 50)
+                ]
+            },
+        ),
+    ),
+    (
+        "POST /ideas/{id}/comments",
+        "lead",
+        lambda c, d, u, r: (
+            "POST",
+            f"/ideas/{r.choice(d.idea_ids)}/comments",
+            {"json": {"comment_text": "Reviewed"}},
+        ),
+    ),
+    (
+        "GET /ideas/metrics/summary",
+        "lead",
+        lambda c, d, u, r: ("GET", "/ideas/metrics/summary", {}),
+    ),
+    (
+        "GET /ideas/metrics/cycle-time",
+        "lead",
+        lambda c, d, u, r: ("GET", "/ideas/metrics/cycle-time", {"params": {"weeks": 26}}),
+    ),
+    (
+        "GET /ideas/metrics/cycle-time?owner_id",
+        "lead",
+        lambda c, d, u, r: (
+            "GET",
+            "/ideas/metrics/cycle-time",
+            {"params": {"owner_id": d.members[0]["id"]}},
+        ),
+    ),
+    (
+        "GET /ideas/metrics/forecast",
+        "lead",
+        lambda c, d, u, r: ("GET", "/ideas/metrics/forecast", {"params": {"horizon": 14}}),
+    ),
+    (
+        "GET /ideas/metrics/forecast?by_owner",
+        "lead",
+        lambda c, d, u, r: (
+            "GET",
+            "/ideas/metrics/forecast",
+            {"params": {"by_owner": True, "days_back": 90}},
+        ),
+    ),
+]
+
+
+def full_scans(conn, statement: str, parameters) -> tuple[list[str], list[str]]:
+    """Tables read in full by `statement`, and the plan lines."""
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        plan = [row[3] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+        scans = [m.group(1) for m in map(SQLITE_SCAN.match, plan) if m]
+    elif dialect == "mysql":
+        rows = conn.exec_driver_sql(f"EXPLAIN {statement}", parameters).mappings().all()
+        plan = [f"{r['table']}: type={r['type']} key={r['key']} rows={r['rows']}" for r in rows]
+        scans = [r["table"] for r in rows if r["type"] == "ALL"]
+    else:
+        plan = [row[0] for row in conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)]
+        scans = [m.group(1) for line in plan for m in [POSTGRES_SCAN.search(line)] if m]
+    return [t for t in scans if t not in BOUNDED_TABLES], plan
+
+
+def check(client, data, rng) -> list[str]:
+    global _captured
+    problems = []
+    for name, role, build in REQUESTS:
+        user = rng.choice(data.leads if role == "lead" else data.members)
+        method, url, kwargs = build(client, data, user, rng)
+        headers = {} if kwargs.pop("auth", True) is False else _auth(user)
+
+        _captured = []
+        try:
+            response = client.request(method, url, headers=headers, **kwargs)
+        finally:
+            statements, _captured = _captured, None
+        if response.status_code >= 400:
+            problems.append(f"{name}: HTTP {response.status_code} {response.text[:200]}")
+            continue
+
+        unique = list(dict(statements).items())
+        offenders = []
+        with engine.connect() as conn:
+            for statement, parameters in unique:
+                scans, plan = full_scans(conn, statement, parameters)
+                if scans:
+                    offenders.append((scans, statement, plan))
+        print(f"{name:40s} {len(unique):>3} statements  {'FULL SCAN' if offenders else 'ok'}")
+        for scans, statement, plan in offenders:
+            problems.append(f"{name}: full scan of {', '.join(scans)}")
+            print("    " + " ".join(statement.split())[:300])
+            for line in plan:
+                print("      " + line)
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--lead-share", type=float, default=0.25)
+    parser.add_argument("--ideas", type=int, default=20_000)
+    parser.add_argument("--comments-per-idea", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    data = seed(args, rng)
+    # No lifespan: background index rebuilds would show up among the captured statements
+    problems = check(TestClient(app), data, rng)
+    if problems:
+        print("FAILED")
+        for line in problems:
+            print("  " + line)
+        sys.exit(1)
+    print(f"no full table scans in {len(REQUESTS)} routes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Build/query latency of the BM25 search index on a synthetic corpus.
+
+    python -m benchmarks.search --ideas 100000 --queries 2000
+"""
+import argparse
+import itertools
+import random
+import statistics
+import time
+
+from app.core.search import SearchIndex
+
+WORDS = (
+    "build cache pipeline deploy review onboarding latency dashboard report export "
+    "customer invoice billing refund support ticket escalation sprint backlog roadmap "
+    "office parking lunch coffee training mentoring hiring interview laptop monitor "
+    "network vpn wifi printer badge security audit compliance budget forecast revenue "
+    "marketing campaign newsletter social webinar conference travel expense approval "
+    "automation script testing coverage flaky release hotfix rollback incident alert "
+    "database index query migration backup storage cloud cost savings energy recycling"
+).split()
+
+
+# Zipf-distributed vocabulary: a few very common words and a long tail
+VOCAB = [f"{w}{suffix}" for w in WORDS for suffix in ("", "s", "ing", "er", "ed")] + [
+    f"term{i}" for i in range(20_000)
+]
+CUM_WEIGHTS = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(VOCAB))))
+
+
+def _text(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choices(VOCAB, cum_weights=CUM_WEIGHTS, k=n))
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ideas", type=int, default=100_000)
+    parser.add_argument("--owners", type=int, default=500)
+    parser.add_argument("--comments-per-idea", type=int, default=2)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    index = SearchIndex()
+
+    corpus = []
+    for _ in range(args.ideas):
+        comments = [_text(rng, 12) for _ in range(args.comments_per_idea)]
+        corpus.append((rng.randint(1, args.owners), _text(rng, 6), _text(rng, 40), comments))
+
+    t0 = time.perf_counter()
+    comment_id = 0
+    for idea_id, (owner, title, description, comments) in enumerate(corpus, start=1):
+        index.upsert_idea(idea_id, owner, title, description)
+        for text in comments:
+            comment_id += 1
+            index.add_comment(idea_id, comment_id, text)
+    build_seconds = time.perf_counter() - t0
+
+    queries = [_text(rng, rng.randint(1, 3)) for _ in range(args.queries)]
+    results = {}
+    for label, owner in (("lead (all ideas)", None), ("member (own ideas)", 1)):
+        samples = []
+        for q in queries:
+            t = time.perf_counter()
+            index.search(q, owner_id=owner, offset=0, limit=20)
+            samples.append((time.perf_counter() - t) * 1000)
+        results[label] = samples
+
+    print(f"corpus: {args.ideas} ideas, {comment_id} comments, {index.stats()['terms']} terms")
+    print(f"build:  {build_seconds:.2f}s ({args.ideas / build_seconds:,.0f} ideas/s)")
+    for label, samples in results.items():
+        print(
+            f"{label:20s} p50 {_percentile(samples, 50):7.2f} ms"
+            f"  p95 {_percentile(samples, 95):7.2f} ms"
+            f"  p99 {_percentile(samples, 99):7.2f} ms"
+            f"  mean {statistics.fmean(samples):7.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""ORM + jsonable_encoder vs Core rows + FastJSONResponse for idea lists.
+
+Seeds an in-memory SQLite database and times loading and encoding the
+enriched idea list (owner + comments) both ways:
+
+    python -m benchmarks.serialization --sizes 1000 10000 100000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from sqlalchemy import delete, insert  # noqa: E402
+
+from app.core.responses import dumps, orjson  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.models.comment import Comment  # noqa: E402
+from app.models.idea import Idea  # noqa: E402
+from app.models.role import Role  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.routers.ideas import (  # noqa: E402
+    IDEA_COLUMNS,
+    _build_comment_map,
+    _owner_map,
+    _serialize_idea,
+)
+from benchmarks.search import _text  # noqa: E402
+
+STATUSES = ["Submitted", "In Review", "Approved", "Rejected"]
+
+
+def _seed(n: int, owners: int, comments_per_idea: int, rng: random.Random) -> None:
+    with SessionLocal() as db:
+        for model in (Comment, Idea, User, Role):
+            db.execute(delete(model))
+        db.execute(insert(Role), [{"id": 1, "role_name": "team_member"}])
+        db.execute(
+            insert(User),
+            [
+                {
+                    "id": i,
+                    "name": f"User {i}",
+                    "email": f"user{i}@example.com",
+                    "password": "x",
+                    "role_id": 1,
+                }
+                for i in range(1, owners + 1)
+            ],
+        )
+        ideas = [
+            {
+                "id": i,
+                "title": _text(rng, 6),
+                "description": _text(rng, 40),
+                "status": rng.choice(STATUSES),
+                "user_id": rng.randint(1, owners),
+            }
+            for i in range(1, n + 1)
+        ]
+        db.execute(insert(Idea), ideas)
+        db.execute(
+            insert(Comment),
+            [
+                {
+                    "idea_id": idea["id"],
+                    "comment_text": _text(rng, 12),
+                    "commented_by": rng.randint(1, owners),
+                }
+                for idea in ideas
+                for _ in range(comments_per_idea)
+            ],
+        )
+        db.commit()
+
+
+def _orm_path(db) -> bytes:
+    # The list path before Core rows: hydrated ORM objects + jsonable_encoder
+    ideas = db.query(Idea).order_by(Idea.created_at.desc(), Idea.id.desc()).all()
+    owner_ids = {i.user_id for i in ideas}
+    users = {u.id: u for u in db.query(User).filter(User.id.in_(owner_ids)).all()}
+    comment_map: dict[int, list] = {}
+    for c in db.query(Comment).order_by(Comment.created_at.asc()).all():
+        comment_map.setdefault(c.idea_id, []).append(c)
+    content = {
+        "items": [
+            _serialize_idea(i, users.get(i.user_id), comment_map.get(i.id, [])) for i in ideas
+        ],
+        "next_cursor": None,
+    }
+    return json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _core_path(db) -> bytes:
+    ideas = db.query(*IDEA_COLUMNS).order_by(Idea.created_at.desc(), Idea.id.desc()).all()
+    users = _owner_map(db, {i.user_id for i in ideas})
+    comment_map = _build_comment_map(db, [i.id for i in ideas])
+    return dumps(
+        {
+            "items": [
+                _serialize_idea(i, users.get(i.user_id), comment_map.get(i.id, []))
+                for i in ideas
+            ],
+            "next_cursor": None,
+        }
+    )
+
+
+def _time(fn, repeat: int) -> tuple[float, bytes]:
+    samples = []
+    body = b""
+    for _ in range(repeat):
+        with SessionLocal() as db:
+            t0 = time.perf_counter()
+            body = fn(db)
+            samples.append(time.perf_counter() - t0)
+    return statistics.median(samples), body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000, 100_000])
+    parser.add_argument("--owners", type=int, default=200)
+    parser.add_argument("--comments-per-idea", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(args.seed)
+    print(f"encoder: {'orjson ' + orjson.__version__ if orjson else 'json (orjson not installed)'}")
+    print(f"{'ideas':>8} {'orm+encoder':>12} {'core+fast':>10} {'speedup':>8} {'size':>9}")
+    for n in args.sizes:
+        _seed(n, args.owners, args.comments_per_idea, rng)
+        orm_seconds, orm_body = _time(_orm_path, args.repeat)
+        core_seconds, core_body = _time(_core_path, args.repeat)
+        if json.loads(orm_body) != json.loads(core_body):
+            raise SystemExit(f"payloads differ at {n} ideas")
+        print(
+            f"{n:>8} {orm_seconds * 1000:>10.0f}ms {core_seconds * 1000:>8.0f}ms"
+            f" {orm_seconds / core_seconds:>7.1f}x {len(core_body) / 1e6:>7.1f}MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
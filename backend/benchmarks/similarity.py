@@ -0,0 +1,61 @@
+"""Lookup latency and duplicate recall of the MinHash/LSH index.
+
+    python -m benchmarks.similarity --ideas 100000 --queries 1000
+"""
+import argparse
+import random
+import statistics
+import time
+
+from app.core.similarity import MinHashIndex
+from benchmarks.search import _percentile, _text
+
+
+def _perturb(rng: random.Random, text: str) -> str:
+    # A "slightly different" resubmission: drop or swap a couple of words
+    words = text.split()
+    for _ in range(2):
+        i = rng.randrange(len(words))
+        if rng.random() < 0.5 and len(words) > 3:
+            words.pop(i)
+        else:
+            words[i] = _text(rng, 1)
+    return " ".join(words)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ideas", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = [(_text(rng, 6), _text(rng, 40)) for _ in range(args.ideas)]
+
+    index = MinHashIndex()
+    t0 = time.perf_counter()
+    for idea_id, (title, description) in enumerate(corpus, start=1):
+        index.upsert_idea(idea_id, title, description)
+    build_seconds = time.perf_counter() - t0
+
+    samples, found = [], 0
+    for _ in range(args.queries):
+        target = rng.randint(1, args.ideas)
+        title, description = corpus[target - 1]
+        t = time.perf_counter()
+        hits = index.query(_perturb(rng, title), _perturb(rng, description), k=5)
+        samples.append((time.perf_counter() - t) * 1000)
+        found += any(idea_id == target for idea_id, _ in hits)
+
+    print(f"corpus: {args.ideas} ideas, {index.stats()['buckets']} LSH buckets")
+    print(f"build:  {build_seconds:.2f}s ({args.ideas / build_seconds:,.0f} ideas/s)")
+    print(
+        f"lookup p50 {_percentile(samples, 50):.2f} ms  p95 {_percentile(samples, 95):.2f} ms"
+        f"  p99 {_percentile(samples, 99):.2f} ms  mean {statistics.fmean(samples):.2f} ms"
+    )
+    print(f"recall@5 of perturbed duplicates: {found / args.queries:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Baseline: the schema previously created by Base.metadata.create_all
+
+Tables that already exist (databases created by create_all before migrations
+existed, possibly before the rollup tables were added) are left untouched, so
+such databases upgrade like empty ones.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _create(name: str, *columns, index_id: bool = False) -> None:
+    if sa.inspect(op.get_bind()).has_table(name):
+        return
+    op.create_table(name, *columns)
+    if index_id:
+        op.create_index(f"ix_{name}_id", name, ["id"])
+
+
+def upgrade() -> None:
+    _create(
+        "roles",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("role_name", sa.String(50), nullable=False, unique=True),
+        sa.Column("description", sa.String(255)),
+        sa.Column("created_at", sa.DateTime()),
+        index_id=True,
+    )
+
+    _create(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("email", sa.String(100), nullable=False, unique=True),
+        sa.Column("password", sa.String(255), nullable=False),
+        sa.Column("role_id", sa.Integer(), sa.ForeignKey("roles.id"), nullable=False),
+        sa.Column("designation", sa.String(100)),
+        sa.Column("created_at", sa.DateTime()),
+        index_id=True,
+    )
+
+    _create(
+        "ideas",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("status", sa.String(20)),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("created_at", sa.DateTime()),
+        index_id=True,
+    )
+
+    _create(
+        "comments",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("comment_text", sa.Text(), nullable=False),
+        sa.Column("idea_id", sa.Integer(), sa.ForeignKey("ideas.id"), nullable=False),
+        sa.Column("commented_by", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("created_at", sa.DateTime()),
+        index_id=True,
+    )
+
+    _create(
+        "attachments",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("idea_id", sa.Integer(), sa.ForeignKey("ideas.id"), nullable=False),
+        sa.Column("file_name", sa.String(255), nullable=False),
+        sa.Column("file_path", sa.String(255), nullable=False),
+        sa.Column("uploaded_at", sa.DateTime()),
+        index_id=True,
+    )
+
+    _create(
+        "idea_status_history",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("idea_id", sa.Integer(), sa.ForeignKey("ideas.id"), nullable=False),
+        sa.Column("old_status", sa.String(20)),
+        sa.Column("new_status", sa.String(20)),
+        sa.Column("changed_by", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("changed_at", sa.DateTime()),
+        index_id=True,
+    )
+
+    _create(
+        "idea_status_counts",
+        sa.Column("status", sa.String(20), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False),
+    )
+    _create(
+        "idea_daily_counts",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False),
+    )
+    _create(
+        "idea_owner_status_counts",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("status", sa.String(20), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False),
+    )
+    _create(
+        "cache_versions",
+        sa.Column("scope", sa.String(100), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    for table in (
+        "cache_versions",
+        "idea_owner_status_counts",
+        "idea_daily_counts",
+        "idea_status_counts",
+        "idea_status_history",
+        "attachments",
+        "comments",
+        "ideas",
+        "users",
+        "roles",
+    ):
+        op.drop_table(table)
@@ -0,0 +1,65 @@
+"""Composite indexes for the list/comment/history queries; status as an enum
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# Frozen copy of app.models.idea.IDEA_STATUSES at this revision
+STATUSES = ("Submitted", "In Review", "Approved", "Rejected")
+status_enum = sa.Enum(*STATUSES, name="idea_status")
+
+INDEXES = [
+    ("ix_ideas_created_at_id", "ideas", ["created_at", "id"]),
+    ("ix_ideas_user_id_created_at_id", "ideas", ["user_id", "created_at", "id"]),
+    ("ix_ideas_status_created_at_id", "ideas", ["status", "created_at", "id"]),
+    ("ix_comments_idea_id_created_at", "comments", ["idea_id", "created_at"]),
+    ("ix_idea_status_history_idea_id_changed_at", "idea_status_history", ["idea_id", "changed_at"]),
+]
+
+
+def upgrade() -> None:
+    ideas = sa.table("ideas", sa.column("status", sa.String(20)))
+    op.execute(ideas.update().where(ideas.c.status.is_(None)).values(status=STATUSES[0]))
+    if not op.get_context().as_sql:
+        unknown = op.get_bind().execute(
+            sa.select(sa.func.count()).select_from(ideas).where(ideas.c.status.not_in(STATUSES))
+        ).scalar()
+        if unknown:
+            raise RuntimeError(f"{unknown} ideas have a status outside {STATUSES}; fix them first")
+
+    # CREATE TYPE on PostgreSQL; MySQL declares ENUM inline and SQLite uses VARCHAR
+    status_enum.create(op.get_bind(), checkfirst=True)
+    with op.batch_alter_table("ideas") as batch:
+        batch.alter_column(
+            "status",
+            existing_type=sa.String(20),
+            type_=status_enum,
+            nullable=False,
+            postgresql_using="status::idea_status",
+        )
+
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+    with op.batch_alter_table("ideas") as batch:
+        batch.alter_column(
+            "status",
+            existing_type=status_enum,
+            type_=sa.String(20),
+            nullable=True,
+            postgresql_using="status::text",
+        )
+    status_enum.drop(op.get_bind(), checkfirst=True)
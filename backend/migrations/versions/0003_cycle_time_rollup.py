@@ -0,0 +1,34 @@
+"""Cycle-time histogram rollup behind /ideas/metrics/cycle-time
+
+The table is filled from idea_status_history by app.bootstrap (rollups
+``ensure_initialized``) or ``python -m app.core.rollups --rebuild``.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "idea_cycle_time_buckets",
+        sa.Column("week", sa.Date(), primary_key=True),
+        sa.Column("kind", sa.String(10), primary_key=True),
+        sa.Column("status", sa.String(20), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("bucket", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("seconds", sa.BigInteger(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("idea_cycle_time_buckets")
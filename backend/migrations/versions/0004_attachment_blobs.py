@@ -0,0 +1,51 @@
+"""Content-addressed attachment blobs: digest, size, type and uploader
+
+Attachment rows now point at a blob named by its SHA-256 (``file_path`` holds
+the blob key). No route wrote the table before this revision; rows without a
+blob cannot be served, so the upgrade refuses to run if any exist.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_attachments_idea_id_uploaded_at", ["idea_id", "uploaded_at"]),
+    ("ix_attachments_sha256", ["sha256"]),
+]
+
+
+def upgrade() -> None:
+    if not op.get_context().as_sql:
+        existing = op.get_bind().execute(sa.text("SELECT COUNT(*) FROM attachments")).scalar()
+        if existing:
+            raise RuntimeError(f"{existing} attachments predate blob storage; remove them first")
+
+    with op.batch_alter_table("attachments") as batch:
+        batch.add_column(sa.Column("sha256", sa.String(64), nullable=False))
+        batch.add_column(sa.Column("size", sa.BigInteger(), nullable=False))
+        batch.add_column(sa.Column("content_type", sa.String(100), nullable=False))
+        batch.add_column(sa.Column("uploaded_by", sa.Integer(), nullable=False))
+        # Batch mode (SQLite) needs a named constraint
+        batch.create_foreign_key(
+            "fk_attachments_uploaded_by_users", "users", ["uploaded_by"], ["id"]
+        )
+    for name, columns in INDEXES:
+        op.create_index(name, "attachments", columns)
+
+
+def downgrade() -> None:
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name="attachments")
+    with op.batch_alter_table("attachments") as batch:
+        batch.drop_constraint("fk_attachments_uploaded_by_users", type_="foreignkey")
+        for column in ("uploaded_by", "content_type", "size", "sha256"):
+            batch.drop_column(column)
@@ -0,0 +1,41 @@
+"""Denormalized comment count and latest comment on ideas
+
+The columns are filled from the comments table by app.bootstrap (rollups
+``ensure_initialized``) or ``python -m app.core.rollups --rebuild``.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+# Frozen copy of app.models.idea.COMMENT_PREVIEW_LENGTH at this revision
+PREVIEW_LENGTH = 200
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("ideas") as batch:
+        batch.add_column(sa.Column("comment_count", sa.Integer(), nullable=False, server_default="0"))
+        batch.add_column(sa.Column("last_comment_id", sa.Integer()))
+        batch.add_column(sa.Column("last_comment_at", sa.DateTime()))
+        batch.add_column(sa.Column("last_comment_by", sa.Integer()))
+        batch.add_column(sa.Column("last_comment_preview", sa.String(PREVIEW_LENGTH)))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("ideas") as batch:
+        for column in (
+            "last_comment_preview",
+            "last_comment_by",
+            "last_comment_at",
+            "last_comment_id",
+            "comment_count",
+        ):
+            batch.drop_column(column)
@@ -0,0 +1,39 @@
+"""Durable background job queue (app.core.jobs)
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("kind", sa.String(64), nullable=False),
+        sa.Column("payload", sa.Text(), nullable=False),
+        sa.Column("dedupe_key", sa.String(191), unique=True),
+        sa.Column("status", sa.String(10), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("max_attempts", sa.Integer(), nullable=False),
+        sa.Column("run_at", sa.DateTime(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("locked_by", sa.String(100)),
+        sa.Column("locked_until", sa.DateTime()),
+        sa.Column("finished_at", sa.DateTime()),
+        sa.Column("last_error", sa.Text()),
+    )
+    op.create_index("ix_jobs_status_run_at_id", "jobs", ["status", "run_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_status_run_at_id", table_name="jobs")
+    op.drop_table("jobs")
@@ -0,0 +1,84 @@
+"""Archive tables for finalized ideas (app.core.archive)
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+# Frozen copy of app.models.idea.COMMENT_PREVIEW_LENGTH at this revision
+PREVIEW_LENGTH = 200
+
+
+def upgrade() -> None:
+    op.create_table(
+        "archived_ideas",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column(
+            "user_id",
+            sa.Integer(),
+            sa.ForeignKey("users.id", name="fk_archived_ideas_user_id_users"),
+            nullable=False,
+        ),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("comment_count", sa.Integer(), nullable=False),
+        sa.Column("last_comment_id", sa.Integer()),
+        sa.Column("last_comment_at", sa.DateTime()),
+        sa.Column("last_comment_by", sa.Integer()),
+        sa.Column("last_comment_preview", sa.String(PREVIEW_LENGTH)),
+        sa.Column("decided_at", sa.DateTime(), nullable=False),
+        sa.Column("archived_at", sa.DateTime(), nullable=False),
+        sa.Column(
+            "comments",
+            sa.LargeBinary().with_variant(mysql.LONGBLOB(), "mysql"),
+            nullable=False,
+        ),
+    )
+    op.create_index("ix_archived_ideas_created_at_id", "archived_ideas", ["created_at", "id"])
+    op.create_index(
+        "ix_archived_ideas_user_id_created_at_id",
+        "archived_ideas",
+        ["user_id", "created_at", "id"],
+    )
+    op.create_index(
+        "ix_archived_ideas_status_created_at_id",
+        "archived_ideas",
+        ["status", "created_at", "id"],
+    )
+    op.create_table(
+        "archived_idea_status_history",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("idea_id", sa.Integer(), nullable=False),
+        sa.Column("old_status", sa.String(20)),
+        sa.Column("new_status", sa.String(20)),
+        sa.Column("changed_by", sa.Integer(), nullable=False),
+        sa.Column("changed_at", sa.DateTime()),
+    )
+    op.create_index(
+        "ix_archived_idea_status_history_idea_id_changed_at",
+        "archived_idea_status_history",
+        ["idea_id", "changed_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_archived_idea_status_history_idea_id_changed_at",
+        table_name="archived_idea_status_history",
+    )
+    op.drop_table("archived_idea_status_history")
+    op.drop_index("ix_archived_ideas_status_created_at_id", table_name="archived_ideas")
+    op.drop_index("ix_archived_ideas_user_id_created_at_id", table_name="archived_ideas")
+    op.drop_index("ix_archived_ideas_created_at_id", table_name="archived_ideas")
+    op.drop_table("archived_ideas")
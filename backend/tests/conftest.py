@@ -0,0 +1,42 @@
+"""Shared fixtures: the app against a throw-away database seeded like benchmarks.load.
+
+Set ``TEST_DATABASE_URL`` to run against MySQL or PostgreSQL; the seed
+empties the idea and user tables, so never point it at real data.
+"""
+import argparse
+import os
+import random
+import tempfile
+
+_scratch = tempfile.mkdtemp(prefix="ideaflow-test-")
+os.environ["DATABASE_URL"] = os.environ.get("TEST_DATABASE_URL", f"sqlite:///{_scratch}/test.db")
+os.environ["ATTACHMENTS_DIR"] = f"{_scratch}/attachments"
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+# No background worker, rate limits or index rebuilds competing with the tests
+os.environ["JOBS_IN_APP"] = "0"
+os.environ["ADMISSION_ENABLED"] = "0"
+os.environ["SEARCH_REBUILD_SECONDS"] = "0"
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from benchmarks.load import seed  # noqa: E402
+
+
+def seed_dataset(ideas: int = 300, users: int = 12, comments_per_idea: int = 2, seed_value: int = 5):
+    args = argparse.Namespace(
+        users=users, lead_share=0.25, ideas=ideas, comments_per_idea=comments_per_idea, seed=seed_value
+    )
+    return seed(args, random.Random(seed_value))
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    return seed_dataset()
+
+
+@pytest.fixture
+def client():
+    from app.main import app
+
+    return TestClient(app)
@@ -0,0 +1,88 @@
+from datetime import datetime
+
+import pytest
+
+from app.core.archive import archive_ideas, due_ideas
+from app.core.similarity import similarity_service
+from app.database import SessionLocal
+from app.models.idea import Idea
+from app.models.idea_archive import ArchivedIdea
+from benchmarks.load import _auth
+
+
+@pytest.fixture(scope="module")
+def archived(dataset):
+    with SessionLocal() as db:
+        idea_id = archive_ideas(db, due_ideas(db, datetime.utcnow(), 0, 1))[0]
+        db.commit()
+        owner_id = db.query(ArchivedIdea.user_id).filter(ArchivedIdea.id == idea_id).scalar()
+        hot_id = db.query(Idea.id).order_by(Idea.id).first()[0]
+    return idea_id, owner_id, hot_id
+
+
+def _member(dataset, user_id=None, other_than=None):
+    return next(
+        m for m in dataset.members
+        if (user_id is None or m["id"] == user_id) and m["id"] != other_than
+    )
+
+
+def test_unauthenticated_get_of_archived_idea_has_hot_fields_only(client, archived):
+    idea_id, _, hot_id = archived
+    hot = client.get(f"/ideas/{hot_id}")
+    response = client.get(f"/ideas/{idea_id}")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert set(body) == set(hot.json())
+    assert "comments" not in body
+    assert "status_history" not in body
+    assert client.get(f"/ideas/{idea_id}/comments").status_code == 401
+
+
+def test_archived_comments_need_owner_or_lead(client, dataset, archived):
+    idea_id, owner_id, _ = archived
+    owner = _member(dataset, user_id=owner_id)
+    stranger = _member(dataset, other_than=owner_id)
+
+    first = client.get(f"/ideas/{idea_id}/comments", params={"limit": 1}, headers=_auth(owner))
+    assert first.status_code == 200
+    page = first.json()
+    assert len(page["items"]) == 1 and page["next_cursor"]
+    rest = client.get(
+        f"/ideas/{idea_id}/comments",
+        params={"cursor": page["next_cursor"]},
+        headers=_auth(owner),
+    ).json()
+    assert len(rest["items"]) == 1 and rest["next_cursor"] is None
+    assert rest["items"][0]["id"] != page["items"][0]["id"]
+
+    lead = client.get(f"/ideas/{idea_id}/comments", headers=_auth(dataset.leads[0]))
+    assert [c["id"] for c in lead.json()["items"]] == [
+        page["items"][0]["id"],
+        rest["items"][0]["id"],
+    ]
+    assert client.get(f"/ideas/{idea_id}/comments", headers=_auth(stranger)).status_code == 403
+
+
+def test_hot_idea_comments_use_the_comments_router(client, dataset, archived):
+    _, _, hot_id = archived
+    lead = _auth(dataset.leads[0])
+    via_ideas = client.get(f"/ideas/{hot_id}/comments", headers=lead).json()
+    via_comments = client.get(f"/comments/idea/{hot_id}", headers=lead).json()
+    assert via_ideas == via_comments
+
+
+def test_similar_ideas_still_match_archived_ideas(client, dataset, archived):
+    idea_id, _, _ = archived
+    with SessionLocal() as db:
+        idea = db.query(ArchivedIdea).filter(ArchivedIdea.id == idea_id).one()
+        text = {"title": idea.title, "description": idea.description}
+    similarity_service.build(SessionLocal)
+
+    response = client.post("/ideas/similar", json=text, headers=_auth(dataset.members[0]))
+
+    assert response.status_code == 200
+    match = next(item for item in response.json()["items"] if item["id"] == idea_id)
+    assert match["title"] == text["title"]
+    assert match["status"] in ("Approved", "Rejected")
@@ -0,0 +1,35 @@
+from app.database import SessionLocal
+from app.models.idea import Idea
+from benchmarks.load import _auth
+
+CONTENT = b"0123456789" * 100
+
+
+def test_download_honours_range_requests(client, dataset):
+    owners = {member["id"]: member for member in dataset.members}
+    with SessionLocal() as db:
+        idea = (
+            db.query(Idea.id, Idea.user_id)
+            .filter(Idea.user_id.in_(owners), Idea.status == "Submitted")
+            .order_by(Idea.id)
+            .first()
+        )
+    headers = _auth(owners[idea.user_id])
+    uploaded = client.post(
+        f"/ideas/{idea.id}/attachments",
+        params={"filename": "notes.txt"},
+        content=CONTENT,
+        headers={**headers, "Content-Type": "text/plain"},
+    )
+    assert uploaded.status_code == 201
+    url = f"/ideas/{idea.id}/attachments/{uploaded.json()['id']}"
+
+    partial = client.get(url, headers={**headers, "Range": "bytes=10-19"})
+    assert partial.status_code == 206
+    assert partial.content == CONTENT[10:20]
+    assert partial.headers["content-range"] == f"bytes 10-19/{len(CONTENT)}"
+
+    # A stale If-Range validator gets the whole file
+    stale = client.get(url, headers={**headers, "Range": "bytes=10-19", "If-Range": '"other"'})
+    assert stale.status_code == 200
+    assert stale.content == CONTENT
@@ -0,0 +1,72 @@
+import asyncio
+import threading
+
+import anyio
+import httpx
+
+from app.core.hashing import HasherBusy, password_hasher
+from app.core.security import verify_and_update_password
+from app.main import app
+from app.routers import auth
+from benchmarks.load import PASSWORD, _auth
+
+
+def test_login_and_register(client, dataset):
+    member = dataset.members[0]
+    ok = client.post("/auth/login", json={"email": member["email"], "password": PASSWORD})
+    assert ok.status_code == 200
+    assert ok.json()["user"]["id"] == member["id"]
+    wrong = client.post("/auth/login", json={"email": member["email"], "password": "nope"})
+    assert wrong.status_code == 401
+
+    new_user = {"name": "New", "email": "new@test.ideaflow.io", "password": "pw-123456", "role": "team_member"}
+    assert client.post("/auth/register", json=new_user).status_code == 201
+    assert client.post("/auth/register", json=new_user).status_code == 400
+    login = client.post("/auth/login", json={"email": new_user["email"], "password": new_user["password"]})
+    assert login.status_code == 200
+
+
+def test_waiting_logins_do_not_hold_threadpool_threads(dataset, monkeypatch):
+    gate = threading.Event()
+
+    def slow_verify(password, hashed):
+        gate.wait(10)
+        return verify_and_update_password(password, hashed)
+
+    monkeypatch.setattr(auth, "verify_and_update_password", slow_verify)
+    member = dataset.members[0]
+
+    async def scenario():
+        # Fewer threadpool threads than logins in flight
+        anyio.to_thread.current_default_thread_limiter().total_tokens = 3
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            logins = [
+                asyncio.create_task(
+                    client.post("/auth/login", json={"email": member["email"], "password": PASSWORD})
+                )
+                for _ in range(4)
+            ]
+            await asyncio.sleep(0.3)
+            try:
+                listed = await asyncio.wait_for(client.get("/ideas/my", headers=_auth(member)), 3)
+            finally:
+                gate.set()
+            return listed.status_code, [r.status_code for r in await asyncio.gather(*logins)]
+
+    listed, logins = asyncio.run(scenario())
+    assert listed == 200
+    assert logins == [200] * 4
+
+
+def test_busy_hasher_answers_503(client, dataset, monkeypatch):
+    async def busy(fn, *args):
+        raise HasherBusy()
+
+    monkeypatch.setattr(password_hasher, "run_async", busy)
+    member = dataset.members[0]
+    response = client.post("/auth/login", json={"email": member["email"], "password": PASSWORD})
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
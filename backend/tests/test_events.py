@@ -0,0 +1,60 @@
+import json
+import sys
+import threading
+import types
+
+from app.core.events import EventBroker, LocalBackend, RedisBackend
+
+
+def test_local_backend_delivers_in_id_order_under_concurrent_publishers():
+    broker = EventBroker(LocalBackend(), buffer_size=10_000, queue_size=10)
+
+    def publish_many():
+        for _ in range(500):
+            broker.publish("idea.status", 1, {})
+
+    threads = [threading.Thread(target=publish_many) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    ids = [event.id for event in broker._history]
+    assert ids == list(range(1, 4001))
+
+
+class FakeRedis:
+    """The calls RedisBackend makes, with the script run as Redis would: atomically."""
+
+    def __init__(self) -> None:
+        self.last_id = 0
+        self.messages: list[bytes] = []
+        self.threads: set[str] = set()
+
+    @classmethod
+    def from_url(cls, url: str) -> "FakeRedis":
+        return cls()
+
+    def register_script(self, script: str):
+        def run(keys, args):
+            self.threads.add(threading.current_thread().name)
+            self.last_id += 1
+            channel, body = args
+            self.messages.append(b"%d:%s" % (self.last_id, body))
+            return self.last_id
+
+        return run
+
+
+def test_redis_backend_publishes_ordered_messages_off_the_caller_thread(monkeypatch):
+    monkeypatch.setitem(sys.modules, "redis", types.SimpleNamespace(Redis=FakeRedis))
+    backend = RedisBackend("redis://unused")
+    for owner_id in (1, 2, 3):
+        backend.publish("comment.created", owner_id, {"idea_id": owner_id})
+    backend._sender.shutdown(wait=True)
+
+    fake = backend._redis
+    assert threading.current_thread().name not in fake.threads
+    decoded = [message.partition(b":") for message in fake.messages]
+    assert [int(event_id) for event_id, _, _ in decoded] == [1, 2, 3]
+    assert [json.loads(body)["owner_id"] for _, _, body in decoded] == [1, 2, 3]
@@ -0,0 +1,28 @@
+import pytest
+
+from app.core.admission import EXEMPT, HEALTH_PROBES, admission
+from benchmarks.load import _auth
+
+DETAIL_ROUTES = ("db", "caches", "events", "hashing", "admission", "jobs")
+
+
+@pytest.mark.parametrize("path", ["/health", "/health/live"])
+def test_liveness_probes_are_open(client, path):
+    response = client.get(path)
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+
+
+@pytest.mark.parametrize("name", DETAIL_ROUTES)
+def test_health_details_require_a_team_lead(client, dataset, name):
+    path = f"/health/{name}"
+
+    assert client.get(path).status_code == 401
+    assert client.get(path, headers=_auth(dataset.members[0])).status_code == 403
+    assert client.get(path, headers=_auth(dataset.leads[0])).status_code == 200
+
+
+def test_only_the_probes_skip_admission_control():
+    assert all(admission.classify(path) == EXEMPT for path in HEALTH_PROBES)
+    assert all(admission.classify(f"/health/{name}") != EXEMPT for name in DETAIL_ROUTES)
@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core import jobs
+from app.database import SessionLocal
+from app.models.job import Job
+
+KIND = "tests.broken"
+
+
+def broken_handler(payload: dict) -> None:
+    raise RuntimeError("always fails")
+
+
+@pytest.fixture
+def worker(dataset):
+    jobs.register(KIND, f"{__name__}:broken_handler")
+    with SessionLocal() as db:
+        db.query(Job).delete()
+        db.commit()
+    yield jobs.JobWorker()
+    jobs.HANDLERS.pop(KIND, None)
+
+
+def _enqueue(key: str) -> None:
+    with SessionLocal() as db:
+        jobs.enqueue(db, KIND, {"key": key}, dedupe_key=key, max_attempts=1)
+        db.commit()
+
+
+def _jobs(key: str) -> list[Job]:
+    with SessionLocal() as db:
+        return db.query(Job).filter(Job.payload.contains(key)).order_by(Job.id).all()
+
+
+def test_permanent_failure_releases_dedupe_key(worker):
+    _enqueue("rerun-after-failure")
+    _enqueue("rerun-after-failure")
+    assert len(_jobs("rerun-after-failure")) == 1
+
+    for job in worker.claim(10):
+        worker.execute(job)
+    failed = _jobs("rerun-after-failure")[0]
+    assert failed.status == jobs.FAILED
+    assert failed.dedupe_key is None
+    assert failed.last_error == "RuntimeError: always fails"
+
+    _enqueue("rerun-after-failure")
+    assert [job.status for job in _jobs("rerun-after-failure")] == [jobs.FAILED, jobs.QUEUED]
+
+
+def test_expired_lease_on_last_attempt_releases_dedupe_key(worker):
+    _enqueue("rerun-after-lease")
+    assert len(worker.claim(10)) == 1
+    with SessionLocal() as db:
+        db.query(Job).update({Job.locked_until: datetime.utcnow() - timedelta(seconds=1)})
+        db.commit()
+
+    worker.maintain()
+    assert _jobs("rerun-after-lease")[0].dedupe_key is None
+
+    _enqueue("rerun-after-lease")
+    assert [job.status for job in _jobs("rerun-after-lease")] == [jobs.FAILED, jobs.QUEUED]
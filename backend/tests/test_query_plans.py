@@ -0,0 +1,7 @@
+import random
+
+from benchmarks import query_plans
+
+
+def test_router_queries_use_indexes(client, dataset):
+    assert query_plans.check(client, dataset, random.Random(7)) == []
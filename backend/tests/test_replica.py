@@ -0,0 +1,22 @@
+import time
+
+from app import database
+from benchmarks.load import _auth
+
+
+def test_reads_fall_back_to_primary_when_replica_goes_down_between_checks(
+    client, dataset, monkeypatch, tmp_path
+):
+    # A replica that was healthy at its last check but no longer accepts connections
+    down = database.make_engine(f"sqlite:///{tmp_path}/missing/replica.db")
+    monkeypatch.setattr(database, "replica_engine", down)
+    monkeypatch.setitem(database._replica_state, "healthy", True)
+    monkeypatch.setitem(database._replica_state, "checked_at", time.monotonic())
+    monkeypatch.setitem(database._replica_state, "error", None)
+
+    response = client.get("/ideas/all", headers=_auth(dataset.leads[0]))
+
+    assert response.status_code == 200
+    assert response.json()["items"]
+    assert database._replica_state["healthy"] is False
+    assert database._replica_state["error"]
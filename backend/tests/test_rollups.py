@@ -0,0 +1,43 @@
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.core import rollups
+from app.database import SessionLocal
+from app.models.idea import Idea
+from benchmarks.load import _auth
+
+
+def _statements(send):
+    count = [0]
+
+    def counter(*_):
+        count[0] += 1
+
+    event.listen(Engine, "before_cursor_execute", counter)
+    try:
+        response = send()
+    finally:
+        event.remove(Engine, "before_cursor_execute", counter)
+    return response, count[0]
+
+
+def test_status_change_stays_under_query_threshold_and_rollups_verify(client, dataset):
+    lead = _auth(dataset.leads[0])
+    with SessionLocal() as db:
+        submitted, reviewed = [
+            idea_id
+            for (idea_id,) in db.query(Idea.id).filter(Idea.status == "Submitted").order_by(Idea.id).limit(2)
+        ]
+    # Warm the principal cache so only the route's own statements are counted
+    client.patch(f"/ideas/{reviewed}/status", headers=lead, json={"status": "In Review"})
+
+    for status_value in ("In Review", "Approved"):
+        response, statements = _statements(
+            lambda: client.patch(f"/ideas/{submitted}/status", headers=lead, json={"status": status_value})
+        )
+        assert response.status_code == 200
+        assert statements <= settings.metrics_query_threshold
+
+    with SessionLocal() as db:
+        assert rollups.verify(db) == []